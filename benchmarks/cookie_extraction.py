@@ -0,0 +1,61 @@
+"""
+쿠키 추출 벤치마크
+
+Cookie 헤더 크기별로 현재 미들웨어의 추출 방식(extract_cookie)과
+기존 방식(request.cookies.get, 즉 헤더 전체를 파싱하는 cookie_parser)을 비교합니다.
+
+실행:
+    python benchmarks/cookie_extraction.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from starlette.requests import cookie_parser
+
+from swaguard.utils.cookies import extract_cookie
+
+
+COOKIE_NAME = "swaguard_auth"
+COOKIE_VALUE = "eyJzdWIiOiAiYWRtaW4iLCAiaWF0IjogMTcwMDAwMDAwMCwgImV4cCI6IDE3MDAwMDM2MDB9." + "a" * 64
+
+
+def build_headers(size: int, position: str):
+    """주어진 크기의 Cookie 헤더를 만들고 인증 쿠키를 지정 위치에 넣습니다."""
+    filler = []
+    index = 0
+    while sum(len(item) + 2 for item in filler) < size:
+        filler.append(f"tracking_{index}={'x' * 40}")
+        index += 1
+    target = f"{COOKIE_NAME}={COOKIE_VALUE}"
+    cookies = [target] + filler if position == "first" else filler + [target]
+    header = "; ".join(cookies).encode("latin-1")
+    return [(b"host", b"example.com"), (b"user-agent", b"bench"), (b"cookie", header)]
+
+
+def parse_all(headers):
+    """기존 방식: Cookie 헤더 전체를 디코딩하고 딕셔너리로 파싱"""
+    for key, value in headers:
+        if key == b"cookie":
+            return cookie_parser(value.decode("latin-1")).get(COOKIE_NAME)
+    return None
+
+
+def main():
+    name = COOKIE_NAME.encode("latin-1")
+    print(f"{'header':>8} {'position':>8} {'parse_all (us)':>15} {'extract (us)':>13} {'speedup':>8}")
+    for size in (128, 1024, 4096, 8192):
+        for position in ("first", "last"):
+            headers = build_headers(size, position)
+            assert parse_all(headers) == extract_cookie(headers, name) == COOKIE_VALUE
+
+            number = 20000
+            baseline = min(timeit.repeat(lambda: parse_all(headers), number=number, repeat=3)) / number
+            current = min(timeit.repeat(lambda: extract_cookie(headers, name), number=number, repeat=3)) / number
+            print(f"{size:>8} {position:>8} {baseline * 1e6:>15.2f} {current * 1e6:>13.2f} {baseline / current:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+세션 캐시 벤치마크
+
+여러 워커 프로세스가 같은 세션 쿠키들을 검증할 때, 프로세스별 LRU만 사용하는 경우와
+공유 메모리 계층을 함께 사용하는 경우의 서명 검증 횟수와 요청당 CPU 시간(워커 합계)을 비교합니다.
+cryptography가 설치되어 있으면 검증 비용이 큰 ES256 JWT 쿠키를, 아니면 기본 서명 쿠키를 사용합니다.
+
+실행:
+    python benchmarks/session_cache.py [--workers 8] [--sessions 2000] [--requests 40000]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from swaguard import SwagGuardRealm
+from swaguard.core.shm import get_session_cache
+
+
+def build_realm(shared_path, key_path):
+    overrides = {"session_cache_size": 4096}
+    if key_path:
+        overrides.update(token_format="jwt", jwt_algorithm="ES256", jwt_private_key_path=key_path)
+    if shared_path:
+        overrides.update(shared_cache_enabled=True, shared_cache_path=shared_path,
+                         shared_cache_slots=16384)
+    return SwagGuardRealm("bench", secret_key="bench-secret", **overrides)
+
+
+def worker(shared_path, key_path, cookies, requests, seed, results):
+    realm = build_realm(shared_path, key_path)
+    rng = random.Random(seed)
+    started = time.process_time()
+    for _ in range(requests):
+        assert realm.decode_auth_cookie(rng.choice(cookies)) is not None
+    cpu = time.process_time() - started
+    stats = get_session_cache(realm.settings).stats()
+    results.put((cpu, stats["misses"], stats["hits"], stats["shared_hits"]))
+
+
+def write_es256_key(directory):
+    try:
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import ec
+    except ImportError:
+        return None
+    path = os.path.join(directory, "bench_key.pem")
+    with open(path, "wb") as f:
+        f.write(ec.generate_private_key(ec.SECP256R1()).private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        ))
+    return path
+
+
+def run(label, shared_path, key_path, cookies, args):
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    per_worker = args.requests // args.workers
+    processes = [
+        context.Process(target=worker, args=(shared_path, key_path, cookies, per_worker, seed, results))
+        for seed in range(args.workers)
+    ]
+    started = time.perf_counter()
+    for process in processes:
+        process.start()
+    rows = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    wall = time.perf_counter() - started
+
+    verifications = sum(row[1] for row in rows)
+    cpu = sum(row[0] for row in rows)
+    total = per_worker * args.workers
+    print(f"{label:>14} {verifications:>14} {1 - verifications / total:>9.1%} "
+          f"{cpu / total * 1e6:>16.2f} {wall:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=40000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        key_path = write_es256_key(directory)
+        issuer = build_realm(None, key_path)
+        cookies = [issuer.create_auth_cookie(f"user{index}")[0] for index in range(args.sessions)]
+
+        print(f"cookie format: {'ES256 JWT' if key_path else 'signed (HMAC-SHA256)'}, "
+              f"{args.workers} workers, {args.sessions} sessions, {args.requests} requests")
+        print(f"{'setup':>14} {'verifications':>14} {'hit rate':>9} {'CPU us/request':>16} {'wall (s)':>9}")
+        run("per-process", None, key_path, cookies, args)
+        run("shared memory", os.path.join(directory, "shm"), key_path, cookies, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -30,9 +30,13 @@ setup(
         "bcrypt>=3.2.0",
     ],
     extras_require={
+        "jwt": [
+            "cryptography>=3.4",
+        ],
         "dev": [
             "pytest>=6.0.0",
             "uvicorn>=0.15.0",
+            "httpx>=0.23.0",
         ],
     },
 )
@@ -15,11 +15,16 @@ from .routes.login_route import create_login_router
 # 설정 관련 기능
 from .config import config
 
+# realm 관련 기능
+from .core.realm import SwagGuardRealm, RealmMatcher
+from .core.activity import get_activity_tracker
+
 # 유틸리티 기능
-from .utils.helper import create_user, setup_initial_users
+from .utils.helper import create_user, setup_initial_users, create_service_token, delete_service_token
 
 # 보안 관련 기능
 from .core.security import hash_password, verify_password
+from .core.credentials import get_credential_cache
+from .core.resilience import get_breaker_metrics
 
-# 기본 초기화 수행
-setup_initial_users()
\ No newline at end of file
+# 기본 사용자 초기화(setup_initial_users)는 import 시점이 아니라 기본 realm을 처음 사용할 때 수행됩니다.
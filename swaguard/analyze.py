@@ -0,0 +1,411 @@
+"""
+SwagGuard 감사 로그를 스트리밍으로 분석하는 명령행 도구
+
+사용법:
+    python -m swaguard.analyze audit.log audit.log.* --event access --path-prefix /partner --since 2026-07-01
+    python -m swaguard.analyze audit.log* --event login_failure --top 20 --json
+
+입력은 JSON Lines 파일(.gz 압축 포함) 또는 SQLite 데이터베이스입니다.
+레코드는 한 줄(한 행)씩 읽어 집계하며, 사용자/IP/경로 순위와 지연 시간 분위수는
+고정 크기 스케치로 계산하므로 파일 크기와 관계없이 메모리 사용량이 일정합니다.
+여러 파일(순환된 로그)은 --jobs 개의 프로세스가 나누어 처리한 뒤 결과를 합칩니다.
+"""
+import argparse
+import functools
+import gzip
+import json
+import multiprocessing
+import os
+import sqlite3
+import sys
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .utils.sketches import HeavyHitters, LatencySketch
+
+
+SQLITE_MAGIC = b"SQLite format 3\x00"
+GZIP_MAGIC = b"\x1f\x8b"
+
+# 레코드 필드별로 허용되는 값의 타입 (값이 없거나 null인 필드는 허용)
+FIELD_TYPES = {
+    "ts": (int, float),
+    "latency_ms": (int, float),
+    "status": (int,),
+    "event": (str,),
+    "realm": (str,),
+    "user": (str,),
+    "ip": (str,),
+    "path": (str,),
+}
+
+
+def is_valid_record(record: Dict[str, Any]) -> bool:
+    """레코드의 필드가 필터와 집계에서 사용할 수 있는 타입인지 확인합니다."""
+    for field, types in FIELD_TYPES.items():
+        value = record.get(field)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, types)):
+            return False
+    return True
+
+
+class RecordFilter:
+    """감사 레코드 필터"""
+
+    def __init__(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        events: Optional[Iterable[str]] = None,
+        path_prefix: Optional[str] = None,
+        user: Optional[str] = None,
+        realm: Optional[str] = None
+    ):
+        """
+        Args:
+            since: 이 시각(epoch 초) 이후의 레코드만 포함
+            until: 이 시각(epoch 초) 이전의 레코드만 포함
+            events: 포함할 이벤트 이름 목록
+            path_prefix: 경로 접두사
+            user: 사용자 이름
+            realm: realm 이름
+        """
+        self.since = since
+        self.until = until
+        self.events = frozenset(events) if events else None
+        self.path_prefix = path_prefix
+        self.user = user
+        self.realm = realm
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        ts = record.get("ts")
+        if self.since is not None and (ts is None or ts < self.since):
+            return False
+        if self.until is not None and (ts is None or ts >= self.until):
+            return False
+        if self.events is not None and record.get("event") not in self.events:
+            return False
+        if self.path_prefix is not None and not (record.get("path") or "").startswith(self.path_prefix):
+            return False
+        if self.user is not None and record.get("user") != self.user:
+            return False
+        if self.realm is not None and record.get("realm") != self.realm:
+            return False
+        return True
+
+
+class AuditSummary:
+    """
+    감사 레코드 집계 결과
+
+    이벤트/상태 코드별 개수는 정확하게, 사용자/IP/경로 순위는 HeavyHitters로,
+    지연 시간은 LatencySketch로 집계합니다. 파일별 결과를 merge()로 합칠 수 있습니다.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        """
+        Args:
+            capacity: 순위 스케치가 추적할 최대 항목 수
+        """
+        self.records = 0
+        self.malformed = 0
+        self.first_ts: Optional[float] = None
+        self.last_ts: Optional[float] = None
+        self.events: Counter = Counter()
+        self.statuses: Counter = Counter()
+        self.users = HeavyHitters(capacity)
+        self.ips = HeavyHitters(capacity)
+        self.paths = HeavyHitters(capacity)
+        self.latency = LatencySketch()
+
+    def add(self, record: Dict[str, Any]) -> None:
+        self.records += 1
+        ts = record.get("ts")
+        if ts is not None:
+            if self.first_ts is None or ts < self.first_ts:
+                self.first_ts = ts
+            if self.last_ts is None or ts > self.last_ts:
+                self.last_ts = ts
+        self.events[record.get("event")] += 1
+        if record.get("status") is not None:
+            self.statuses[record["status"]] += 1
+        if record.get("user") is not None:
+            self.users.add(record["user"])
+        if record.get("ip") is not None:
+            self.ips.add(record["ip"])
+        if record.get("path") is not None:
+            self.paths.add(record["path"])
+        if record.get("latency_ms") is not None:
+            self.latency.add(float(record["latency_ms"]))
+
+    def merge(self, other: "AuditSummary") -> None:
+        """다른 집계 결과를 이 결과에 합칩니다."""
+        self.records += other.records
+        self.malformed += other.malformed
+        for ts in (other.first_ts, other.last_ts):
+            if ts is not None:
+                self.first_ts = ts if self.first_ts is None else min(self.first_ts, ts)
+                self.last_ts = ts if self.last_ts is None else max(self.last_ts, ts)
+        self.events.update(other.events)
+        self.statuses.update(other.statuses)
+        self.users.merge(other.users)
+        self.ips.merge(other.ips)
+        self.paths.merge(other.paths)
+        self.latency.merge(other.latency)
+
+    def to_dict(self, top: int = 10) -> Dict[str, Any]:
+        """보고서용 딕셔너리를 반환합니다."""
+        return {
+            "records": self.records,
+            "malformed": self.malformed,
+            "first_ts": self.first_ts,
+            "last_ts": self.last_ts,
+            "events": dict(self.events.most_common()),
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "top_users": self.users.top(top),
+            "top_ips": self.ips.top(top),
+            "top_paths": self.paths.top(top),
+            "latency_ms": self.latency.summary(),
+        }
+
+
+def parse_time(value: str) -> float:
+    """
+    명령행의 시각 인자를 epoch 초로 변환합니다.
+
+    Args:
+        value: epoch 초 또는 ISO 8601 날짜/시각 (시간대가 없으면 UTC로 간주)
+
+    Returns:
+        epoch 초
+    """
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _is_sqlite(path: str) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+
+
+def iter_sqlite_records(path: str, record_filter: RecordFilter, table: str = "audit_log") -> Iterator[Dict[str, Any]]:
+    """
+    SQLite 데이터베이스의 감사 레코드를 한 행씩 읽습니다.
+
+    테이블은 감사 로그와 같은 이름의 열(ts, event, realm, user, ip, path, status, latency_ms)을 가져야 합니다.
+    시각과 이벤트 조건은 SQL로 먼저 걸러 읽는 행 수를 줄입니다.
+    """
+    conditions = []
+    params: List[Any] = []
+    if record_filter.since is not None:
+        conditions.append("ts >= ?")
+        params.append(record_filter.since)
+    if record_filter.until is not None:
+        conditions.append("ts < ?")
+        params.append(record_filter.until)
+    if record_filter.events is not None:
+        conditions.append(f"event IN ({', '.join('?' * len(record_filter.events))})")
+        params.extend(sorted(record_filter.events))
+    query = f'SELECT * FROM "{table.replace(chr(34), chr(34) * 2)}"'
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    connection.row_factory = sqlite3.Row
+    try:
+        for row in connection.execute(query, params):
+            yield dict(row)
+    finally:
+        connection.close()
+
+
+def iter_json_records(path: str, summary: Optional[AuditSummary] = None) -> Iterator[Dict[str, Any]]:
+    """
+    JSON Lines 파일(.gz 포함)의 감사 레코드를 한 줄씩 읽습니다.
+
+    Args:
+        path: 파일 경로
+        summary: 해석할 수 없는 줄의 개수를 기록할 집계 결과
+    """
+    with open(path, "rb") as f:
+        compressed = f.read(2) == GZIP_MAGIC
+    opener = gzip.open if compressed else open
+    with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            if isinstance(record, dict):
+                yield record
+            elif summary is not None:
+                summary.malformed += 1
+
+
+def iter_records(
+    path: str,
+    record_filter: Optional[RecordFilter] = None,
+    table: str = "audit_log",
+    summary: Optional[AuditSummary] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    감사 로그 파일(JSON Lines, .gz, SQLite)에서 필터에 맞는 레코드를 하나씩 읽습니다.
+
+    Args:
+        path: 파일 경로
+        record_filter: 레코드 필터
+        table: SQLite 테이블 이름
+        summary: 해석할 수 없는 줄이나 필드 타입이 잘못된 레코드의 개수를 기록할 집계 결과
+    """
+    record_filter = record_filter or RecordFilter()
+    if _is_sqlite(path):
+        records = iter_sqlite_records(path, record_filter, table)
+    else:
+        records = iter_json_records(path, summary)
+    for record in records:
+        if not is_valid_record(record):
+            if summary is not None:
+                summary.malformed += 1
+            continue
+        if record_filter.matches(record):
+            yield record
+
+
+def analyze_file(
+    path: str,
+    record_filter: Optional[RecordFilter] = None,
+    capacity: int = 1000,
+    table: str = "audit_log"
+) -> AuditSummary:
+    """
+    감사 로그 파일 하나를 집계합니다.
+
+    Args:
+        path: JSON Lines 파일 또는 SQLite 데이터베이스 경로
+        record_filter: 레코드 필터
+        capacity: 순위 스케치가 추적할 최대 항목 수
+        table: SQLite 테이블 이름
+
+    Returns:
+        AuditSummary 객체
+    """
+    summary = AuditSummary(capacity)
+    for record in iter_records(path, record_filter, table, summary):
+        summary.add(record)
+    return summary
+
+
+def analyze(
+    paths: List[str],
+    record_filter: Optional[RecordFilter] = None,
+    capacity: int = 1000,
+    jobs: int = 1,
+    table: str = "audit_log"
+) -> AuditSummary:
+    """
+    여러 감사 로그 파일을 집계합니다.
+
+    jobs가 1보다 크고 파일이 여러 개이면 프로세스 풀에서 파일별로 나누어 집계한 뒤 합칩니다.
+
+    Args:
+        paths: 파일 경로 목록
+        record_filter: 레코드 필터
+        capacity: 순위 스케치가 추적할 최대 항목 수
+        jobs: 사용할 프로세스 수
+        table: SQLite 테이블 이름
+
+    Returns:
+        합쳐진 AuditSummary 객체
+    """
+    worker = functools.partial(analyze_file, record_filter=record_filter, capacity=capacity, table=table)
+    total = AuditSummary(capacity)
+    jobs = min(jobs, len(paths))
+    if jobs > 1:
+        with multiprocessing.Pool(jobs) as pool:
+            for summary in pool.imap_unordered(worker, paths):
+                total.merge(summary)
+    else:
+        for path in paths:
+            total.merge(worker(path))
+    return total
+
+
+def _format_time(ts: Optional[float]) -> str:
+    if ts is None:
+        return "-"
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat(timespec="seconds")
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """집계 결과를 사람이 읽기 쉬운 문자열로 만듭니다."""
+    lines = [
+        f"Records:   {report['records']} (malformed: {report['malformed']})",
+        f"Period:    {_format_time(report['first_ts'])} ~ {_format_time(report['last_ts'])}",
+        "",
+        "Events:",
+    ]
+    lines += [f"  {event:<16} {count}" for event, count in report["events"].items()]
+    if report["statuses"]:
+        lines += ["", "Status codes:"]
+        lines += [f"  {status:<16} {count}" for status, count in report["statuses"].items()]
+    for title, key in (("Top users", "top_users"), ("Top IPs", "top_ips"), ("Top paths", "top_paths")):
+        if report[key]:
+            lines += ["", f"{title}:"]
+            lines += [f"  {count:>10}  {item}" for item, count in report[key]]
+
+    latency = report["latency_ms"]
+    if latency["count"]:
+        lines += [
+            "",
+            "Latency (ms):",
+            "  " + "  ".join(
+                f"{name}={latency[name]:.2f}" for name in ("mean", "p50", "p90", "p99", "max")
+            ),
+        ]
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m swaguard.analyze", description="SwagGuard 감사 로그 분석")
+    parser.add_argument("paths", nargs="+", help="감사 로그 파일 (JSON Lines, .gz, SQLite)")
+    parser.add_argument("--since", type=parse_time, help="시작 시각 (ISO 8601 또는 epoch 초, 시간대가 없으면 UTC)")
+    parser.add_argument("--until", type=parse_time, help="종료 시각 (미포함)")
+    parser.add_argument("--event", action="append", help="포함할 이벤트 (반복 지정 가능)")
+    parser.add_argument("--path-prefix", help="경로 접두사")
+    parser.add_argument("--user", help="사용자 이름")
+    parser.add_argument("--realm", help="realm 이름")
+    parser.add_argument("--top", type=int, default=10, help="순위에 표시할 항목 수")
+    parser.add_argument("--capacity", type=int, default=1000, help="순위 스케치가 추적할 최대 항목 수")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="사용할 프로세스 수")
+    parser.add_argument("--table", default="audit_log", help="SQLite 입력의 테이블 이름")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    record_filter = RecordFilter(
+        since=args.since,
+        until=args.until,
+        events=args.event,
+        path_prefix=args.path_prefix,
+        user=args.user,
+        realm=args.realm,
+    )
+    summary = analyze(args.paths, record_filter, capacity=args.capacity, jobs=args.jobs, table=args.table)
+    report = summary.to_dict(args.top)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+import weakref
+from abc import ABC, abstractmethod
+from typing import Dict, List, Mapping, Optional, Sequence, Union
+
+from ..config import config, SwagGuardSettings
+
+
+Value = Union[str, bytes, int]
+
+
+class StateBackend(ABC):
+    """
+    워커 간에 공유되는 상태(키 링, 폐기 목록, 요청 카운터, 세션 등)를 저장하는 백엔드의 기본 클래스
+
+    모든 메서드는 비동기이며, 값은 bytes로 반환됩니다.
+    ttl은 초 단위이며 None이면 만료되지 않습니다.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """키의 값을 가져옵니다."""
+
+    @abstractmethod
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        """여러 키의 값을 한 번에 가져옵니다."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Value, ttl: Optional[float] = None) -> None:
+        """키에 값을 저장합니다."""
+
+    @abstractmethod
+    async def set_many(self, mapping: Mapping[str, Value], ttl: Optional[float] = None) -> None:
+        """여러 키에 값을 한 번에 저장합니다."""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> int:
+        """키를 삭제하고 삭제된 키의 수를 반환합니다."""
+
+    @abstractmethod
+    async def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        """
+        카운터를 증가시키고 증가된 값을 반환합니다.
+
+        ttl은 카운터가 처음 생성될 때만 적용됩니다. (고정 윈도 카운터)
+        """
+
+    @abstractmethod
+    async def hget_all(self, key: str) -> Dict[str, bytes]:
+        """해시의 모든 필드를 가져옵니다."""
+
+    @abstractmethod
+    async def hset_many(self, key: str, mapping: Mapping[str, Value]) -> None:
+        """해시의 여러 필드를 한 번에 저장합니다."""
+
+    @abstractmethod
+    async def hincr(self, key: str, field: str, amount: int = 1) -> int:
+        """해시 필드의 정수 값을 증가시키고 증가된 값을 반환합니다."""
+
+    @abstractmethod
+    async def hmax(self, key: str, field: str, value: int) -> int:
+        """해시 필드의 정수 값을 현재 값과 value 중 큰 값으로 원자적으로 바꾸고 그 값을 반환합니다."""
+
+    async def close(self) -> None:
+        """백엔드가 사용하는 자원을 정리합니다."""
+
+
+def to_bytes(value: Value) -> bytes:
+    """백엔드에 저장할 값을 bytes로 변환합니다."""
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode("utf-8")
+
+
+_backends: "weakref.WeakKeyDictionary[SwagGuardSettings, StateBackend]" = weakref.WeakKeyDictionary()
+
+
+def get_state_backend(settings: Optional[SwagGuardSettings] = None) -> StateBackend:
+    """
+    설정된 공유 상태 백엔드를 반환합니다.
+
+    state_backend_url이 지정되지 않았으면 프로세스 메모리 백엔드를 사용합니다.
+    원격 백엔드는 호출 기한, 회로 차단기, 장애 정책(backend_policies)이 적용된 ResilientBackend로 감쌉니다.
+
+    Args:
+        settings: 사용할 설정 (기본값: 전역 config)
+
+    Returns:
+        StateBackend 객체
+    """
+    settings = settings or config
+    backend = _backends.get(settings)
+    if backend is None:
+        url = settings.get("state_backend_url")
+        if url:
+            from ..core.resilience import ResilientBackend
+            from .redis_backend import RedisBackend
+            backend = ResilientBackend(RedisBackend(
+                url,
+                max_connections=settings.get("state_backend_max_connections", 10),
+                timeout=settings.get("state_backend_timeout", 1.0),
+            ), settings)
+        else:
+            from .memory import MemoryBackend
+            backend = MemoryBackend()
+        _backends[settings] = backend
+    return backend
@@ -0,0 +1,333 @@
+import asyncio
+import json
+import ssl
+import weakref
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from ..config import config, SwagGuardSettings
+from ..core.credentials import CredentialCache
+from ..exceptions.AuthExceptions import AuthBackendError, ConfigurationError
+
+if TYPE_CHECKING:
+    from ..core.resilience import ResilientAuthBackend
+
+
+# LDAP 결과 코드
+RESULT_SUCCESS = 0
+RESULT_INVALID_CREDENTIALS = 49
+# 서버 장애가 아니라 해당 계정에 대한 거부 응답 (인증 실패로 처리하고 회로 차단기 실패로 세지 않음)
+# noSuchObject, inappropriateAuthentication, invalidCredentials, insufficientAccessRights, unwillingToPerform
+ACCOUNT_REJECTED_CODES = frozenset({32, 48, RESULT_INVALID_CREDENTIALS, 50, 53})
+
+# BER 태그
+TAG_INTEGER = 0x02
+TAG_OCTET_STRING = 0x04
+TAG_ENUMERATED = 0x0A
+TAG_SEQUENCE = 0x30
+TAG_BIND_REQUEST = 0x60  # [APPLICATION 0] constructed
+TAG_BIND_RESPONSE = 0x61  # [APPLICATION 1] constructed
+TAG_UNBIND_REQUEST = 0x42  # [APPLICATION 2] primitive
+TAG_SIMPLE_AUTH = 0x80  # [0] primitive
+
+
+def ber_encode(tag: int, value: bytes) -> bytes:
+    """BER TLV를 인코딩합니다."""
+    length = len(value)
+    if length < 0x80:
+        return bytes((tag, length)) + value
+    length_bytes = length.to_bytes((length.bit_length() + 7) // 8, "big")
+    return bytes((tag, 0x80 | len(length_bytes))) + length_bytes + value
+
+
+def ber_integer(tag: int, value: int) -> bytes:
+    """BER INTEGER/ENUMERATED를 인코딩합니다."""
+    return ber_encode(tag, value.to_bytes(max(1, (value.bit_length() + 8) // 8), "big", signed=True))
+
+
+def ber_decode_all(data: bytes) -> List[Tuple[int, bytes]]:
+    """
+    연속된 BER TLV 목록을 디코딩합니다.
+
+    Raises:
+        ValueError: 데이터가 잘렸거나 길이가 맞지 않는 경우
+    """
+    items = []
+    offset = 0
+    while offset < len(data):
+        if offset + 2 > len(data):
+            raise ValueError("Truncated BER header")
+        tag = data[offset]
+        length = data[offset + 1]
+        offset += 2
+        if length & 0x80:
+            count = length & 0x7F
+            if offset + count > len(data):
+                raise ValueError("Truncated BER length")
+            length = int.from_bytes(data[offset:offset + count], "big")
+            offset += count
+        if offset + length > len(data):
+            raise ValueError("Truncated BER value")
+        items.append((tag, data[offset:offset + length]))
+        offset += length
+    return items
+
+
+async def read_message(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    """스트림에서 LDAPMessage(최상위 SEQUENCE) 하나를 읽습니다."""
+    tag, length = await reader.readexactly(2)
+    if length & 0x80:
+        length = int.from_bytes(await reader.readexactly(length & 0x7F), "big")
+    return tag, await reader.readexactly(length)
+
+
+def escape_dn_value(value: str) -> str:
+    """
+    DN 속성 값에 들어갈 문자열을 RFC 4514 규칙으로 이스케이프합니다.
+
+    사용자 이름으로 DN 구조를 조작하는 것을 막습니다.
+    """
+    escaped = []
+    for index, char in enumerate(value):
+        if char in ',+"\\<>;=' or (char == "#" and index == 0) or (char == " " and index in (0, len(value) - 1)):
+            escaped.append("\\" + char)
+        elif ord(char) < 0x20:
+            escaped.append("\\%02x" % ord(char))
+        else:
+            escaped.append(char)
+    return "".join(escaped)
+
+
+class LDAPConnection:
+    """단순 바인드(simple bind)만 지원하는 LDAP 연결"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self._message_id = 0
+
+    async def bind(self, dn: str, password: str) -> bool:
+        """
+        DN과 비밀번호로 바인드를 시도합니다.
+
+        Returns:
+            바인드 성공 시 True, 자격 증명이 잘못되었거나 계정이 거부되었으면(잠김, 비활성 등) False
+
+        Raises:
+            AuthBackendError: 잘못된 형식의 응답 또는 그 밖의 오류 응답
+        """
+        self._message_id += 1
+        request = ber_encode(TAG_BIND_REQUEST, (
+            ber_integer(TAG_INTEGER, 3)
+            + ber_encode(TAG_OCTET_STRING, dn.encode("utf-8"))
+            + ber_encode(TAG_SIMPLE_AUTH, password.encode("utf-8"))
+        ))
+        self.writer.write(ber_encode(TAG_SEQUENCE, ber_integer(TAG_INTEGER, self._message_id) + request))
+        await self.writer.drain()
+
+        tag, body = await read_message(self.reader)
+        try:
+            items = ber_decode_all(body)
+            if tag != TAG_SEQUENCE or len(items) < 2 or items[1][0] != TAG_BIND_RESPONSE:
+                raise AuthBackendError("Unexpected LDAP response")
+            if int.from_bytes(items[0][1], "big") != self._message_id:
+                raise AuthBackendError("LDAP response message ID mismatch")
+            result = ber_decode_all(items[1][1])
+            if not result or result[0][0] != TAG_ENUMERATED:
+                raise AuthBackendError("Malformed LDAP bind response")
+        except ValueError as e:
+            raise AuthBackendError(f"Malformed LDAP response: {e}") from e
+
+        result_code = int.from_bytes(result[0][1], "big")
+        if result_code == RESULT_SUCCESS:
+            return True
+        if result_code in ACCOUNT_REJECTED_CODES:
+            return False
+        message = result[2][1].decode("utf-8", "replace") if len(result) > 2 else ""
+        raise AuthBackendError(f"LDAP bind failed with result code {result_code}: {message}")
+
+    def close(self):
+        try:
+            self.writer.write(ber_encode(TAG_SEQUENCE, ber_integer(TAG_INTEGER, self._message_id + 1)
+                                         + bytes((TAG_UNBIND_REQUEST, 0))))
+        except Exception:
+            pass
+        self.writer.close()
+
+
+class LDAPAuthBackend:
+    """
+    디렉터리(LDAP) 단순 바인드로 사용자를 인증하는 백엔드
+
+    연결은 pool_size 크기의 풀에서 재사용되며, 연결과 바인드에는 timeout이 적용됩니다.
+    성공한 인증은 cache_seconds 동안 키 기반 HMAC 다이제스트로 캐시되어
+    짧은 시간에 몰리는 로그인 시도가 매번 바인드를 수행하지 않도록 합니다.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        user_dn_template: str,
+        pool_size: int = 5,
+        timeout: float = 2.0,
+        cache_seconds: float = 30
+    ):
+        """
+        Args:
+            url: ldap://host[:port] 또는 ldaps://host[:port]
+            user_dn_template: 사용자 DN 템플릿 (예: "uid={username},ou=people,dc=example,dc=com")
+            pool_size: 최대 연결 수
+            timeout: 연결 및 바인드 대기 시간 (초)
+            cache_seconds: 성공한 인증 결과 캐시 유지 시간 (초)
+        """
+        parsed = urlparse(url)
+        if parsed.scheme not in ("ldap", "ldaps"):
+            raise ConfigurationError(f"지원하지 않는 LDAP URL입니다: {url}")
+        self.host = parsed.hostname or "localhost"
+        self.use_ssl = parsed.scheme == "ldaps"
+        self.port = parsed.port or (636 if self.use_ssl else 389)
+        self.user_dn_template = user_dn_template
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.cache = CredentialCache(ttl_seconds=cache_seconds)
+        self._idle: List[LDAPConnection] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        # 같은 자격 증명으로 동시에 들어온 시도는 진행 중인 바인드 하나를 함께 기다립니다.
+        self._inflight: Dict[bytes, "asyncio.Future[bool]"] = {}
+
+    async def _connect(self) -> LDAPConnection:
+        context = ssl.create_default_context() if self.use_ssl else None
+        reader, writer = await asyncio.open_connection(self.host, self.port, ssl=context)
+        return LDAPConnection(reader, writer)
+
+    async def _bind(self, dn: str, password: str) -> bool:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.pool_size)
+
+        async with self._slots:
+            connection = self._idle.pop() if self._idle else None
+            try:
+                if connection is None:
+                    connection = await asyncio.wait_for(self._connect(), self.timeout)
+                result = await asyncio.wait_for(connection.bind(dn, password), self.timeout)
+            except BaseException as e:
+                # 응답을 끝까지 읽지 못한 연결(취소 포함)은 풀에 반환하지 않습니다.
+                if connection is not None:
+                    connection.close()
+                if isinstance(e, (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError)):
+                    raise AuthBackendError(f"LDAP server unavailable: {e!r}") from e
+                raise
+            self._idle.append(connection)
+            return result
+
+    async def authenticate(self, username: str, password: str) -> bool:
+        """
+        디렉터리에서 사용자를 인증합니다.
+
+        Args:
+            username: 사용자 이름
+            password: 비밀번호
+
+        Returns:
+            인증 성공 시 True, 실패 시 False
+
+        Raises:
+            AuthBackendError: LDAP 서버에 연결할 수 없거나 오류 응답을 받은 경우
+        """
+        # 빈 비밀번호는 LDAP에서 익명(unauthenticated) 바인드로 성공할 수 있으므로 거부합니다.
+        if not username or not password:
+            return False
+        if self.cache.check(username, password):
+            return True
+
+        key = self.cache.digest(username, password)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        dn = self.user_dn_template.format(username=escape_dn_value(username))
+        pending = asyncio.ensure_future(self._bind(dn, password))
+        self._inflight[key] = pending
+        try:
+            result = await asyncio.shield(pending)
+        finally:
+            self._inflight.pop(key, None)
+        if result:
+            self.cache.store(username, password)
+        return result
+
+    async def close(self) -> None:
+        """풀의 연결을 모두 닫습니다."""
+        while self._idle:
+            self._idle.pop().close()
+
+
+# 이 설정이 바뀔 때만 LDAP 백엔드를 새로 만듭니다. (사용자 추가 등 다른 설정 변경에는 캐시와 연결 풀을 유지)
+LDAP_SETTING_KEYS = (
+    "ldap_url",
+    "ldap_user_dn_template",
+    "ldap_pool_size",
+    "ldap_timeout",
+    "ldap_cache_seconds",
+    "backend_policies",
+    "last_known_good_seconds",
+    "breaker_failure_threshold",
+    "breaker_reset_seconds",
+    "backend_deadline_seconds",
+)
+
+_backends: "weakref.WeakKeyDictionary[SwagGuardSettings, Tuple[str, ResilientAuthBackend]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_ldap_backend(settings: Optional[SwagGuardSettings] = None) -> "ResilientAuthBackend":
+    """
+    설정에 맞는 LDAP 인증 백엔드를 반환합니다.
+
+    백엔드는 호출 기한, 회로 차단기, authenticate 장애 정책이 적용된 ResilientAuthBackend로 감싸져 있습니다.
+    LDAP 관련 설정(LDAP_SETTING_KEYS)이 바뀌면 백엔드를 새로 만들고 이전 연결 풀을 닫습니다.
+
+    Args:
+        settings: 사용할 설정 (기본값: 전역 config)
+
+    Returns:
+        LDAPAuthBackend를 감싼 ResilientAuthBackend 객체
+
+    Raises:
+        ConfigurationError: ldap_url이 설정되지 않은 경우
+    """
+    from ..core.resilience import ResilientAuthBackend
+
+    settings = settings or config
+    # 값에 딕셔너리(backend_policies)가 있으므로 정렬된 JSON으로 비교합니다.
+    key = json.dumps([settings.get(name) for name in LDAP_SETTING_KEYS], sort_keys=True, default=str)
+    cached = _backends.get(settings)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    url = settings.get("ldap_url")
+    if not url:
+        raise ConfigurationError("LDAP 인증을 사용하려면 ldap_url 설정이 필요합니다.")
+    backend = ResilientAuthBackend(LDAPAuthBackend(
+        url,
+        settings.get("ldap_user_dn_template", "uid={username},ou=people,dc=example,dc=com"),
+        pool_size=settings.get("ldap_pool_size", 5),
+        timeout=settings.get("ldap_timeout", 2.0),
+        cache_seconds=settings.get("ldap_cache_seconds", 30),
+    ), settings)
+    _backends[settings] = (key, backend)
+    if cached is not None:
+        cached[1].detach(settings)
+        _close_backend(cached[1])
+    return backend
+
+
+def _close_backend(backend: "ResilientAuthBackend") -> None:
+    """교체된 백엔드의 연결 풀을 닫습니다."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(backend.close())
+    else:
+        loop.create_task(backend.close())
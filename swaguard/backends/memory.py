@@ -0,0 +1,91 @@
+import time
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .base import StateBackend, Value, to_bytes
+
+
+class MemoryBackend(StateBackend):
+    """
+    프로세스 메모리에 상태를 저장하는 백엔드
+
+    공유 상태 백엔드가 설정되지 않았을 때 사용되며, 워커 간에는 공유되지 않습니다.
+    """
+
+    def __init__(self):
+        # 키 -> (값, 만료 시각 또는 None)
+        self._data: Dict[str, Tuple[Any, Optional[float]]] = {}
+
+    def _load(self, key: str) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def _store(self, key: str, value: Any, ttl: Optional[float]):
+        self._data[key] = (value, time.monotonic() + ttl if ttl else None)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = self._load(key)
+        return value if isinstance(value, bytes) else None
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        return [await self.get(key) for key in keys]
+
+    async def set(self, key: str, value: Value, ttl: Optional[float] = None) -> None:
+        self._store(key, to_bytes(value), ttl)
+
+    async def set_many(self, mapping: Mapping[str, Value], ttl: Optional[float] = None) -> None:
+        for key, value in mapping.items():
+            self._store(key, to_bytes(value), ttl)
+
+    async def delete(self, *keys: str) -> int:
+        deleted = 0
+        for key in keys:
+            if self._load(key) is not None:
+                del self._data[key]
+                deleted += 1
+        return deleted
+
+    async def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        entry = self._data.get(key)
+        current = self._load(key)
+        if current is None:
+            value = amount
+            self._store(key, to_bytes(value), ttl)
+        else:
+            value = int(current) + amount
+            self._data[key] = (to_bytes(value), entry[1])
+        return value
+
+    async def hget_all(self, key: str) -> Dict[str, bytes]:
+        return dict(self._load(key) or {})
+
+    async def hset_many(self, key: str, mapping: Mapping[str, Value]) -> None:
+        current = self._load(key)
+        if current is None:
+            current = {}
+            self._store(key, current, None)
+        for field, value in mapping.items():
+            current[field] = to_bytes(value)
+
+    async def hincr(self, key: str, field: str, amount: int = 1) -> int:
+        current = self._load(key)
+        if current is None:
+            current = {}
+            self._store(key, current, None)
+        value = int(current.get(field, b"0")) + amount
+        current[field] = to_bytes(value)
+        return value
+
+    async def hmax(self, key: str, field: str, value: int) -> int:
+        current = self._load(key)
+        if current is None:
+            current = {}
+            self._store(key, current, None)
+        value = max(int(current.get(field, b"0")), value)
+        current[field] = to_bytes(value)
+        return value
@@ -0,0 +1,225 @@
+import asyncio
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+from urllib.parse import unquote, urlparse
+
+from ..exceptions.AuthExceptions import StateBackendError
+from .base import StateBackend, Value, to_bytes
+
+
+Command = Sequence[Value]
+
+# 해시 필드를 현재 값과 인자 중 큰 값으로 바꾸는 스크립트 (스크립트는 원자적으로 실행됨)
+HMAX_SCRIPT = """
+local current = tonumber(redis.call('HGET', KEYS[1], ARGV[1]) or '0')
+local value = tonumber(ARGV[2])
+if value > current then
+    redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+    return value
+end
+return current
+"""
+
+
+def encode_command(command: Command) -> bytes:
+    """명령을 RESP 배열 형식으로 인코딩합니다."""
+    parts = [b"*%d\r\n" % len(command)]
+    for argument in command:
+        data = to_bytes(argument)
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    """RESP 응답 하나를 읽습니다. 오류 응답은 StateBackendError 객체로 반환합니다."""
+    line = await reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise StateBackendError("Connection closed by state backend")
+    prefix, payload = line[:1], line[1:-2]
+    if prefix == b"+":
+        return payload
+    if prefix == b"-":
+        return StateBackendError(payload.decode("utf-8", "replace"))
+    if prefix == b":":
+        return int(payload)
+    if prefix == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if prefix == b"*":
+        length = int(payload)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise StateBackendError(f"Unexpected reply from state backend: {line!r}")
+
+
+class RedisConnection:
+    """Redis 프로토콜(RESP2)을 사용하는 단일 연결"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    async def execute_many(self, commands: Sequence[Command]) -> List[Any]:
+        """여러 명령을 한 번에 전송하고(파이프라이닝) 응답을 순서대로 읽습니다."""
+        self.writer.write(b"".join(encode_command(command) for command in commands))
+        await self.writer.drain()
+        return [await read_reply(self.reader) for _ in commands]
+
+    def close(self):
+        self.writer.close()
+
+
+class RedisBackend(StateBackend):
+    """
+    Redis 호환 서버를 사용하는 공유 상태 백엔드
+
+    외부 클라이언트 라이브러리 없이 asyncio 스트림으로 RESP 프로토콜을 직접 처리합니다.
+    연결은 max_connections 크기의 풀에서 재사용되며, 여러 명령이 필요한 작업은
+    파이프라이닝으로 한 번의 왕복에 처리합니다.
+
+    연결은 생성된 이벤트 루프에 묶이므로 하나의 이벤트 루프(애플리케이션 루프)에서 사용해야 합니다.
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0", max_connections: int = 10, timeout: float = 1.0):
+        """
+        Args:
+            url: redis://[:password@]host[:port][/db] 형식의 URL
+            max_connections: 최대 연결 수
+            timeout: 연결 및 응답 대기 시간 (초)
+        """
+        parsed = urlparse(url)
+        if parsed.scheme not in ("redis", ""):
+            raise StateBackendError(f"Unsupported state backend URL: {url}")
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._idle: List[RedisConnection] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def _connect(self) -> RedisConnection:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        connection = RedisConnection(reader, writer)
+        handshake: List[Command] = []
+        if self.password:
+            handshake.append(("AUTH", self.username, self.password) if self.username else ("AUTH", self.password))
+        if self.db:
+            handshake.append(("SELECT", self.db))
+        if handshake:
+            for reply in await connection.execute_many(handshake):
+                if isinstance(reply, StateBackendError):
+                    connection.close()
+                    raise reply
+        return connection
+
+    async def pipeline(self, commands: Sequence[Command]) -> List[Any]:
+        """
+        여러 명령을 하나의 연결에서 파이프라이닝으로 실행합니다.
+
+        Args:
+            commands: 실행할 명령 목록 (예: [("GET", "a"), ("INCRBY", "b", 1)])
+
+        Returns:
+            명령별 응답 목록
+
+        Raises:
+            StateBackendError: 연결 실패, 시간 초과 또는 오류 응답
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_connections)
+
+        async with self._slots:
+            connection = self._idle.pop() if self._idle else None
+            try:
+                if connection is None:
+                    connection = await asyncio.wait_for(self._connect(), self.timeout)
+                replies = await asyncio.wait_for(connection.execute_many(commands), self.timeout)
+            except BaseException as e:
+                # 응답을 끝까지 읽지 못한 연결(취소 포함)은 풀에 반환하지 않습니다.
+                if connection is not None:
+                    connection.close()
+                if isinstance(e, (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError)):
+                    raise StateBackendError(f"State backend unavailable: {e!r}") from e
+                raise
+            self._idle.append(connection)
+
+        for reply in replies:
+            if isinstance(reply, StateBackendError):
+                raise reply
+        return replies
+
+    async def execute(self, *command: Value) -> Any:
+        """명령 하나를 실행합니다."""
+        return (await self.pipeline([command]))[0]
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.execute("GET", key)
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        if not keys:
+            return []
+        return await self.execute("MGET", *keys)
+
+    async def set(self, key: str, value: Value, ttl: Optional[float] = None) -> None:
+        if ttl:
+            await self.execute("SET", key, value, "PX", int(ttl * 1000))
+        else:
+            await self.execute("SET", key, value)
+
+    async def set_many(self, mapping: Mapping[str, Value], ttl: Optional[float] = None) -> None:
+        if not mapping:
+            return
+        if ttl:
+            await self.pipeline([("SET", key, value, "PX", int(ttl * 1000)) for key, value in mapping.items()])
+        else:
+            await self.execute("MSET", *[part for item in mapping.items() for part in item])
+
+    async def delete(self, *keys: str) -> int:
+        if not keys:
+            return 0
+        return await self.execute("DEL", *keys)
+
+    async def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        if not ttl:
+            return await self.execute("INCRBY", key, amount)
+        # 카운터 생성(만료 시간 포함)과 증가를 MULTI/EXEC 트랜잭션으로 묶어 한 번의 왕복에 원자적으로 실행하므로
+        # 만료 없는 카운터가 남지 않습니다. SET NX는 카운터가 없을 때만 만료 시간과 함께 생성하므로
+        # 이미 있는 카운터의 윈도는 연장하지 않습니다. (모든 Redis 버전에서 동작)
+        replies = await self.pipeline([
+            ("MULTI",),
+            ("SET", key, 0, "PX", int(ttl * 1000), "NX"),
+            ("INCRBY", key, amount),
+            ("EXEC",),
+        ])
+        results = replies[-1]
+        if results is None:
+            raise StateBackendError("Transaction aborted by state backend")
+        for result in results:
+            if isinstance(result, StateBackendError):
+                raise result
+        return results[1]
+
+    async def hget_all(self, key: str) -> Dict[str, bytes]:
+        reply = await self.execute("HGETALL", key) or []
+        return {reply[index].decode("utf-8"): reply[index + 1] for index in range(0, len(reply), 2)}
+
+    async def hset_many(self, key: str, mapping: Mapping[str, Value]) -> None:
+        if not mapping:
+            return
+        await self.execute("HSET", key, *[part for item in mapping.items() for part in item])
+
+    async def hincr(self, key: str, field: str, amount: int = 1) -> int:
+        return await self.execute("HINCRBY", key, field, amount)
+
+    async def hmax(self, key: str, field: str, value: int) -> int:
+        return await self.execute("EVAL", HMAX_SCRIPT, 1, key, field, value)
+
+    async def close(self) -> None:
+        while self._idle:
+            self._idle.pop().close()
@@ -1,10 +1,271 @@
+import copy
 import os
 import yaml
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional
 
 
-class SwagGuardConfig:
+# 기본 설정값
+DEFAULT_CONFIG: Dict[str, Any] = {
+    "cookie_name": "swaguard_auth",
+    "cookie_expire_minutes": 60,
+    "cookie_secure": True,
+    "cookie_httponly": True,
+    "cookie_samesite": "lax",
+    "login_path": "/swaguard/login",
+    "logout_path": "/swaguard/logout",
+    "users": {},  # 빈 사용자 목록으로 시작
+    "protected_paths": ["/docs", "/redoc", "/openapi.json"],
+    "basic_auth_enabled": False,  # Authorization: Basic 헤더 인증 허용 여부
+    "basic_auth_cache_seconds": 60,  # 검증된 Basic 자격 증명 캐시 유지 시간
+    "service_tokens": {},  # 공개 접두사 -> 서비스 토큰 레코드
+    "service_token_touch_seconds": 300,  # 서비스 토큰 last_used 기록 최소 간격
+    "user_roles": {},  # 사용자 이름 -> 역할 목록
+    "user_generations": {},  # 사용자 이름 -> 세션 세대 번호 (사용자 제거, 비밀번호 변경 시 증가하여 기존 쿠키 무효화)
+    "generation_key": "swaguard:generations",  # 공유 상태 백엔드에서 세대 번호를 보관하는 해시 키
+    "generation_sync_seconds": 5,  # 세대 번호를 공유 상태 백엔드와 동기화하는 간격 (초, state_backend_url 사용 시)
+    "role_rules": {},  # 역할 -> {"allow": [...], "deny": [...]} 경로 규칙 (비어 있으면 역할 검사 안 함)
+    "state_backend_url": None,  # 공유 상태 백엔드 URL (예: redis://localhost:6379/0, 없으면 프로세스 메모리)
+    "state_backend_max_connections": 10,  # 공유 상태 백엔드 연결 풀 크기
+    "state_backend_timeout": 1.0,  # 공유 상태 백엔드 연결 및 응답 대기 시간 (초)
+    "openapi_warmup": False,  # 시작 시 백그라운드에서 OpenAPI 스키마를 미리 생성
+    "openapi_snapshot_path": None,  # 빌드 시점에 생성한 OpenAPI 스키마 스냅샷 파일 경로
+    "token_format": "signed",  # 인증 쿠키 형식: signed(기본) 또는 jwt
+    "jwt_algorithm": "HS256",  # jwt 형식의 서명 알고리즘: HS256, EdDSA, ES256
+    "jwt_kid": "swaguard-1",  # JWT 헤더의 키 ID
+    "jwt_issuer": "swaguard",  # JWT iss 클레임
+    "jwt_private_key_path": None,  # EdDSA/ES256 개인 키(PEM) 파일 경로
+    "jwt_key_check_seconds": 5,  # 개인 키 파일이 교체되었는지 확인하는 간격 (초)
+    "jwks_path": "/swaguard/.well-known/jwks.json",  # 공개 키 집합(JWKS) 경로
+    "auth_backend": "local",  # 사용자 인증 백엔드: local(설정의 users) 또는 ldap
+    "ldap_url": None,  # LDAP 서버 URL (예: ldaps://ldap.example.com)
+    "ldap_user_dn_template": "uid={username},ou=people,dc=example,dc=com",  # 바인드할 사용자 DN 템플릿
+    "ldap_pool_size": 5,  # LDAP 연결 풀 크기
+    "ldap_timeout": 2.0,  # LDAP 연결 및 바인드 대기 시간 (초)
+    "ldap_cache_seconds": 30,  # 성공한 LDAP 인증 결과 캐시 유지 시간 (초)
+    "backend_deadline_seconds": 3.0,  # 외부 백엔드(LDAP, 공유 상태) 호출 하나에 허용하는 최대 시간 (초)
+    "breaker_failure_threshold": 5,  # 회로 차단기를 여는 연속 실패 수
+    "breaker_reset_seconds": 30,  # 열린 회로 차단기가 시험 호출을 허용하기까지의 시간 (초)
+    "backend_policies": {},  # 작업(authenticate, state_read, state_write) -> fail_closed, fail_open, last_known_good (authenticate는 fail_open 불가)
+    "last_known_good_seconds": 3600,  # 백엔드 장애 시 사용할 로컬 캐시 값의 최대 수명 (초)
+    "activity_tracking": True,  # 인증된 요청의 사용자/세션별 마지막 접근 시각 기록
+    "activity_flush_seconds": 30,  # 메모리에 모은 접근 기록을 user_activity에 기록하는 간격 (초)
+    "activity_max_sessions": 20,  # 사용자별로 보관할 최근 세션 수
+    "user_activity": {},  # 사용자 이름 -> 세션 ID -> {"first_seen", "last_seen", "hits"}
+    "session_cache_size": 0,  # 검증된 인증 쿠키를 보관하는 프로세스별 LRU 크기 (0이면 사용 안 함, 예: 4096)
+    "shared_cache_enabled": False,  # 같은 호스트의 워커들이 공유하는 메모리 계층 사용 여부
+    "shared_cache_name": "default",  # 공유 메모리 파일 이름 (같은 이름의 워커들이 테이블을 공유)
+    "shared_cache_path": None,  # 공유 메모리 파일 경로 (기본값: /dev/shm 아래 이름과 크기로 생성)
+    "shared_cache_slots": 65536,  # 공유 세션 테이블 슬롯 수
+    "shared_cache_counters": 1024,  # 워커들이 공유하는 카운터 슬롯 수
+    "audit_log_path": None,  # 감사 로그(JSON Lines) 파일 경로 (없으면 swaguard.audit 로거 설정을 따름)
+}
+
+
+class SwagGuardSettings:
+    """
+    설정 딕셔너리와 사용자 저장소를 관리하는 기본 클래스
+    realm별 설정 스냅샷도 이 클래스로 표현합니다.
+    """
+
+    def __init__(self, values: Optional[Dict[str, Any]] = None):
+        self.config = copy.deepcopy(DEFAULT_CONFIG)
+        if values:
+            self.config.update(copy.deepcopy(values))
+        # 설정이 바뀔 때마다 증가하며, 파생 구조(경로 매처 등)의 재생성 여부 판단에 사용
+        self.version = 0
+        self._user_listeners: List[Callable[[str], None]] = []
+
+    def _touch(self):
+        """설정 버전을 증가시킵니다."""
+        self.version += 1
+
+    def add_user_listener(self, listener: Callable[[str], None]):
+        """
+        사용자가 추가, 변경(비밀번호 변경 포함), 제거될 때 호출될 콜백을 등록합니다.
+
+        Args:
+            listener: 변경된 사용자 이름을 인자로 받는 함수
+        """
+        self._user_listeners.append(listener)
+
+    def remove_user_listener(self, listener: Callable[[str], None]):
+        """add_user_listener로 등록한 콜백을 제거합니다."""
+        if listener in self._user_listeners:
+            self._user_listeners.remove(listener)
+
+    def _notify_user_change(self, username: str):
+        """등록된 사용자 변경 콜백을 호출합니다."""
+        for listener in self._user_listeners:
+            listener(username)
+
+    def add_user(self, username: str, password_hash: str):
+        """사용자를 추가합니다. 기존 사용자의 비밀번호가 바뀌면 이미 발급된 세션을 모두 무효화합니다."""
+        previous = self.config["users"].get(username)
+        self.config["users"][username] = password_hash
+        if previous is not None and previous != password_hash:
+            self._bump_user_generation(username)
+        self._touch()
+        self._notify_user_change(username)
+
+    def remove_user(self, username: str):
+        """사용자를 제거하고 이미 발급된 세션을 모두 무효화합니다."""
+        if username in self.config["users"]:
+            del self.config["users"][username]
+            self.config["user_roles"].pop(username, None)
+            self.config["user_activity"].pop(username, None)
+            # 세대 번호는 남겨 두어 같은 이름으로 다시 추가해도 이전 쿠키가 살아나지 않도록 합니다.
+            self._bump_user_generation(username)
+            self._touch()
+            self._notify_user_change(username)
+
+    def _bump_user_generation(self, username: str):
+        """사용자의 세션 세대 번호를 증가시킵니다."""
+        generations = self.config.setdefault("user_generations", {})
+        generations[username] = generations.get(username, 0) + 1
+
+    def get_user_generation(self, username: str) -> int:
+        """사용자의 현재 세션 세대 번호를 가져옵니다. (인증 쿠키의 gen 클레임과 비교)"""
+        return self.config.get("user_generations", {}).get(username, 0)
+
+    def revoke_user_sessions(self, username: str):
+        """
+        사용자에게 이미 발급된 인증 쿠키를 모두 무효화합니다.
+
+        토큰별 폐기 목록 없이 세대 번호만 증가시키므로 세션 수와 관계없이 O(1)입니다.
+        세대 번호는 인증 결과에만 영향을 주므로 설정 버전을 올리지 않습니다.
+
+        Args:
+            username: 사용자 이름
+        """
+        self._bump_user_generation(username)
+        self._notify_user_change(username)
+
+    def set_user_roles(self, username: str, roles: List[str]):
+        """
+        사용자의 역할 목록을 설정합니다.
+
+        역할은 인증 쿠키의 roles 클레임에 담기므로 기존 사용자의 역할이 바뀌면
+        이미 발급된 세션을 모두 무효화하여 바뀐 역할로 다시 로그인하도록 합니다.
+        """
+        previous = self.config["user_roles"].get(username, [])
+        self.config["user_roles"][username] = list(roles)
+        if username in self.config["users"] and set(previous) != set(roles):
+            self._bump_user_generation(username)
+            self._touch()
+            self._notify_user_change(username)
+        else:
+            self._touch()
+
+    def get_user_roles(self, username: str) -> List[str]:
+        """사용자의 역할 목록을 가져옵니다."""
+        return self.config.get("user_roles", {}).get(username, [])
+
+    def record_user_activity(self, activity: Dict[str, Dict[str, Dict[str, Any]]]):
+        """
+        세션별 접근 기록을 병합합니다.
+
+        접근 기록은 인증/인가 결과에 영향을 주지 않으므로 설정 버전을 올리지 않습니다.
+
+        Args:
+            activity: 사용자 이름 -> 세션 ID -> {"first_seen", "last_seen", "hits"}
+        """
+        store = self.config.setdefault("user_activity", {})
+        max_sessions = self.config.get("activity_max_sessions", 20)
+        for username, sessions in activity.items():
+            user_sessions = store.setdefault(username, {})
+            for session_id, entry in sessions.items():
+                current = user_sessions.get(session_id)
+                if current is None:
+                    user_sessions[session_id] = dict(entry)
+                else:
+                    current["last_seen"] = max(current["last_seen"], entry["last_seen"])
+                    current["hits"] += entry["hits"]
+            if len(user_sessions) > max_sessions:
+                recent = sorted(user_sessions.items(), key=lambda item: item[1]["last_seen"], reverse=True)
+                store[username] = dict(recent[:max_sessions])
+
+    def get_user_activity(self, username: str) -> Dict[str, Dict[str, Any]]:
+        """사용자의 세션별 접근 기록을 가져옵니다."""
+        return self.config.get("user_activity", {}).get(username, {})
+
+    def set_role_rules(
+        self,
+        role: str,
+        allow: Optional[List[str]] = None,
+        deny: Optional[List[str]] = None,
+        tags: Optional[List[str]] = None,
+        schema_paths: Optional[List[str]] = None
+    ):
+        """
+        역할별 경로 접근 규칙을 설정합니다.
+
+        Args:
+            role: 역할 이름
+            allow: 접근을 허용할 경로 접두사 목록
+            deny: 접근을 거부할 경로 접두사 목록
+            tags: OpenAPI 스키마에서 보여줄 오퍼레이션 태그 목록 (기본값: 제한 없음)
+            schema_paths: OpenAPI 스키마에서 보여줄 API 경로 접두사 목록 (기본값: 제한 없음)
+        """
+        rule: Dict[str, Any] = {"allow": list(allow or []), "deny": list(deny or [])}
+        if tags is not None:
+            rule["tags"] = list(tags)
+        if schema_paths is not None:
+            rule["schema_paths"] = list(schema_paths)
+        self.config["role_rules"][role] = rule
+        self._touch()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """설정값을 가져옵니다."""
+        return self.config.get(key, default)
+
+    def set(self, key: str, value: Any):
+        """설정값을 설정합니다."""
+        self.config[key] = value
+        self._touch()
+
+    def get_users(self) -> Dict[str, str]:
+        """등록된 사용자 목록을 가져옵니다."""
+        return self.config.get("users", {})
+
+    def add_service_token(self, prefix: str, record: Dict[str, Any]):
+        """서비스 토큰 레코드를 추가합니다."""
+        self.config["service_tokens"][prefix] = record
+        self._touch()
+
+    def remove_service_token(self, prefix: str):
+        """서비스 토큰 레코드를 제거합니다."""
+        if prefix in self.config["service_tokens"]:
+            del self.config["service_tokens"][prefix]
+            self._touch()
+
+    def get_service_tokens(self) -> Dict[str, Dict[str, Any]]:
+        """등록된 서비스 토큰 레코드 목록을 가져옵니다."""
+        return self.config.get("service_tokens", {})
+
+    def add_protected_path(self, path: str):
+        """보호할 경로를 추가합니다."""
+        if path not in self.config["protected_paths"]:
+            self.config["protected_paths"].append(path)
+            self._touch()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 설정의 깊은 복사본을 반환합니다."""
+        return copy.deepcopy(self.config)
+
+    def save_to_file(self, file_path: Optional[str] = None):
+        """설정을 파일에 저장합니다."""
+        if file_path is None:
+            file_path = os.environ.get("SWAGUARD_CONFIG_FILE", "swaguard_config.yaml")
+        
+        try:
+            with open(file_path, "w") as f:
+                yaml.dump(self.config, f)
+        except Exception as e:
+            print(f"설정 파일 저장 중 오류 발생: {e}")
+
+
+class SwagGuardConfig(SwagGuardSettings):
     """
     SwagGuard 라이브러리의 설정을 관리하는 클래스
     환경 변수 또는 YAML 설정 파일에서 설정을 로드합니다.
@@ -20,19 +281,8 @@ class SwagGuardConfig:
     def __init__(self):
         if self._initialized:
             return
-            
-        # 기본 설정값
-        self.config = {
-            "cookie_name": "swaguard_auth",
-            "cookie_expire_minutes": 60,
-            "cookie_secure": True,
-            "cookie_httponly": True,
-            "cookie_samesite": "lax",
-            "login_path": "/swaguard/login",
-            "logout_path": "/swaguard/logout",
-            "users": {},  # 빈 사용자 목록으로 시작
-            "protected_paths": ["/docs", "/redoc", "/openapi.json"],
-        }
+
+        super().__init__()
         
         # 환경 변수에서 설정 로드
         self._load_from_env()
@@ -54,6 +304,22 @@ class SwagGuardConfig:
             "SWAGUARD_COOKIE_SAMESITE": ("cookie_samesite", str),
             "SWAGUARD_LOGIN_PATH": ("login_path", str),
             "SWAGUARD_LOGOUT_PATH": ("logout_path", str),
+            "SWAGUARD_BASIC_AUTH": ("basic_auth_enabled", lambda x: x.lower() == "true"),
+            "SWAGUARD_BASIC_AUTH_CACHE_SECONDS": ("basic_auth_cache_seconds", int),
+            "SWAGUARD_STATE_BACKEND_URL": ("state_backend_url", str),
+            "SWAGUARD_OPENAPI_WARMUP": ("openapi_warmup", lambda x: x.lower() == "true"),
+            "SWAGUARD_OPENAPI_SNAPSHOT": ("openapi_snapshot_path", str),
+            "SWAGUARD_TOKEN_FORMAT": ("token_format", str),
+            "SWAGUARD_JWT_ALGORITHM": ("jwt_algorithm", str),
+            "SWAGUARD_JWT_KID": ("jwt_kid", str),
+            "SWAGUARD_JWT_PRIVATE_KEY_PATH": ("jwt_private_key_path", str),
+            "SWAGUARD_AUTH_BACKEND": ("auth_backend", str),
+            "SWAGUARD_LDAP_URL": ("ldap_url", str),
+            "SWAGUARD_LDAP_USER_DN_TEMPLATE": ("ldap_user_dn_template", str),
+            "SWAGUARD_AUDIT_LOG": ("audit_log_path", str),
+            "SWAGUARD_BACKEND_DEADLINE_SECONDS": ("backend_deadline_seconds", float),
+            "SWAGUARD_SHARED_CACHE": ("shared_cache_enabled", lambda x: x.lower() == "true"),
+            "SWAGUARD_SHARED_CACHE_NAME": ("shared_cache_name", str),
         }
         
         for env_var, (config_key, converter) in env_mappings.items():
@@ -67,46 +333,10 @@ class SwagGuardConfig:
                 file_config = yaml.safe_load(f)
                 if file_config and isinstance(file_config, dict):
                     self.config.update(file_config)
+                    self._touch()
         except Exception as e:
             print(f"설정 파일 로드 중 오류 발생: {e}")
 
-    def add_user(self, username: str, password_hash: str):
-        """사용자를 추가합니다."""
-        self.config["users"][username] = password_hash
-
-    def remove_user(self, username: str):
-        """사용자를 제거합니다."""
-        if username in self.config["users"]:
-            del self.config["users"][username]
-
-    def get(self, key: str, default: Any = None) -> Any:
-        """설정값을 가져옵니다."""
-        return self.config.get(key, default)
-
-    def set(self, key: str, value: Any):
-        """설정값을 설정합니다."""
-        self.config[key] = value
-
-    def get_users(self) -> Dict[str, str]:
-        """등록된 사용자 목록을 가져옵니다."""
-        return self.config.get("users", {})
-
-    def add_protected_path(self, path: str):
-        """보호할 경로를 추가합니다."""
-        if path not in self.config["protected_paths"]:
-            self.config["protected_paths"].append(path)
-
-    def save_to_file(self, file_path: Optional[str] = None):
-        """설정을 파일에 저장합니다."""
-        if file_path is None:
-            file_path = os.environ.get("SWAGUARD_CONFIG_FILE", "swaguard_config.yaml")
-        
-        try:
-            with open(file_path, "w") as f:
-                yaml.dump(self.config, f)
-        except Exception as e:
-            print(f"설정 파일 저장 중 오류 발생: {e}")
-
 
 # 싱글톤 인스턴스를 만들어서 import시 바로 사용할 수 있도록 합니다.
 config = SwagGuardConfig()
@@ -0,0 +1,185 @@
+import asyncio
+import time
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import config, SwagGuardSettings
+
+
+# 백그라운드 기록 작업의 최소 간격 (초). 0 등으로 설정해도 기록 작업이 이벤트 루프를 점유하지 않도록 합니다.
+MIN_FLUSH_INTERVAL = 1.0
+
+
+class ActivityTracker:
+    """
+    사용자/세션별 마지막 접근 시각을 메모리에서 집계하고 주기적으로 사용자 저장소에 기록하는 추적기
+
+    요청 처리 경로에서는 touch()로 메모리의 딕셔너리만 갱신하며, 같은 세션의 반복 접근은
+    하나의 항목(첫 접근, 마지막 접근, 횟수)으로 합쳐집니다. 모인 항목은 백그라운드 작업이
+    activity_flush_seconds 간격으로 저장소(user_activity)에 한 번에 기록합니다(write-behind).
+    """
+
+    def __init__(self, settings: Optional[SwagGuardSettings] = None, flush_interval: Optional[float] = None):
+        """
+        Args:
+            settings: 활동 기록을 저장할 설정(사용자 저장소) (기본값: 전역 config)
+            flush_interval: 저장소 기록 간격 (초, 기본값: activity_flush_seconds 설정, 최소 MIN_FLUSH_INTERVAL)
+        """
+        settings = settings or config
+        # 설정별 캐시에 보관되므로 설정을 약한 참조로 가리켜 설정이 해제될 수 있도록 합니다.
+        self._settings = weakref.ref(settings)
+        if flush_interval is None:
+            flush_interval = settings.get("activity_flush_seconds", 30)
+        self.flush_interval = max(MIN_FLUSH_INTERVAL, flush_interval)
+        self._pending: Dict[Tuple[str, str], List[float]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.flushes = 0
+        settings.add_user_listener(self._on_user_change)
+
+    def _on_user_change(self, username: str) -> None:
+        """제거된 사용자의 기록되지 않은 활동을 버려 다음 기록 때 접근 기록이 되살아나지 않도록 합니다."""
+        settings = self._settings()
+        if settings is None or username in settings.get_users():
+            return
+        for key in [key for key in self._pending if key[0] == username]:
+            del self._pending[key]
+
+    def touch(self, username: str, session_id: str, now: Optional[float] = None) -> None:
+        """
+        사용자 세션의 접근을 기록합니다. 저장소에는 접근하지 않습니다.
+
+        Args:
+            username: 사용자 이름
+            session_id: 세션 ID (쿠키의 sid 클레임)
+            now: 접근 시각 (기본값: 현재 시각)
+        """
+        now = time.time() if now is None else now
+        entry = self._pending.get((username, session_id))
+        if entry is None:
+            self._pending[(username, session_id)] = [now, now, 1]
+        else:
+            entry[1] = now
+            entry[2] += 1
+
+    def flush(self) -> int:
+        """
+        모인 활동을 사용자 저장소에 기록합니다.
+
+        Returns:
+            기록한 세션 항목 수
+        """
+        settings = self._settings()
+        pending, self._pending = self._pending, {}
+        if settings is None or not pending:
+            return 0
+
+        batch: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (username, session_id), (first_seen, last_seen, hits) in pending.items():
+            batch.setdefault(username, {})[session_id] = {
+                "first_seen": first_seen, "last_seen": last_seen, "hits": hits,
+            }
+        settings.record_user_activity(batch)
+        self.flushes += 1
+        return len(pending)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.flush()
+
+    def ensure_started(self) -> None:
+        """실행 중인 이벤트 루프에 백그라운드 기록 작업이 없으면 시작합니다."""
+        if self._task is None or self._task.done() or self._task.get_loop() is not asyncio.get_running_loop():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """백그라운드 기록 작업을 중지하고 남은 활동을 기록합니다."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self.flush()
+
+    def get_sessions(self, username: str) -> Dict[str, Dict[str, Any]]:
+        """
+        사용자의 세션별 활동을 반환합니다. 아직 기록되지 않은 활동도 포함합니다.
+
+        Args:
+            username: 사용자 이름
+
+        Returns:
+            세션 ID -> {"first_seen", "last_seen", "hits"}
+        """
+        settings = self._settings()
+        stored = settings.get_user_activity(username) if settings is not None else {}
+        sessions = {session_id: dict(entry) for session_id, entry in stored.items()}
+        for (user, session_id), (first_seen, last_seen, hits) in list(self._pending.items()):
+            if user != username:
+                continue
+            entry = sessions.get(session_id)
+            if entry is None:
+                sessions[session_id] = {"first_seen": first_seen, "last_seen": last_seen, "hits": hits}
+            else:
+                entry["last_seen"] = max(entry["last_seen"], last_seen)
+                entry["hits"] += hits
+        return sessions
+
+    def get_last_seen(self, username: str) -> Optional[float]:
+        """
+        사용자가 마지막으로 접근한 시각을 반환합니다.
+
+        Args:
+            username: 사용자 이름
+
+        Returns:
+            epoch 초 (접근 기록이 없으면 None)
+        """
+        sessions = self.get_sessions(username)
+        return max((entry["last_seen"] for entry in sessions.values()), default=None)
+
+    def active_users(self, within_seconds: float = 86400, now: Optional[float] = None) -> Dict[str, float]:
+        """
+        최근에 접근한 사용자와 마지막 접근 시각을 반환합니다.
+
+        Args:
+            within_seconds: 이 시간(초) 안에 접근한 사용자만 포함
+            now: 기준 시각 (기본값: 현재 시각)
+
+        Returns:
+            사용자 이름 -> 마지막 접근 시각 (최근 순)
+        """
+        cutoff = (time.time() if now is None else now) - within_seconds
+        last_seen: Dict[str, float] = {}
+        settings = self._settings()
+        if settings is not None:
+            for username, sessions in settings.get("user_activity", {}).items():
+                for entry in sessions.values():
+                    last_seen[username] = max(last_seen.get(username, 0.0), entry["last_seen"])
+        for (username, _), (_, seen, _) in list(self._pending.items()):
+            last_seen[username] = max(last_seen.get(username, 0.0), seen)
+        active = {username: seen for username, seen in last_seen.items() if seen >= cutoff}
+        return dict(sorted(active.items(), key=lambda item: item[1], reverse=True))
+
+
+_trackers: "weakref.WeakKeyDictionary[SwagGuardSettings, ActivityTracker]" = weakref.WeakKeyDictionary()
+
+
+def get_activity_tracker(settings: Optional[SwagGuardSettings] = None) -> ActivityTracker:
+    """
+    설정(사용자 저장소)별 활동 추적기를 반환합니다.
+
+    Args:
+        settings: 사용할 설정 (기본값: 전역 config)
+
+    Returns:
+        ActivityTracker 객체
+    """
+    settings = settings or config
+    tracker = _trackers.get(settings)
+    if tracker is None:
+        tracker = ActivityTracker(settings)
+        _trackers[settings] = tracker
+    return tracker
@@ -0,0 +1,73 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import time
+from typing import Any, Optional
+
+
+# 감사 로그는 JSON 한 줄 형식으로 "swaguard.audit" 로거에 기록됩니다.
+audit_logger = logging.getLogger("swaguard.audit")
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_configured_path: Optional[str] = None
+
+
+def audit_event(event: str, **fields: Any) -> None:
+    """
+    인증 관련 이벤트를 감사 로그에 기록합니다.
+
+    로거가 비활성화되어 있으면 레코드를 만들지 않으므로 비용이 거의 들지 않습니다.
+
+    Args:
+        event: 이벤트 이름 (access, login_success, login_failure, logout)
+        **fields: realm, user, ip, path, status, latency_ms 등 추가 필드
+    """
+    if not audit_logger.isEnabledFor(logging.INFO):
+        return
+    record = {"ts": round(time.time(), 3), "event": event}
+    record.update(fields)
+    audit_logger.info(json.dumps(record, separators=(",", ":"), ensure_ascii=False))
+
+
+def configure_audit_log(path: str, max_bytes: int = 100 * 1024 * 1024, backup_count: int = 10) -> None:
+    """
+    감사 로그를 순환(rotating) JSON Lines 파일로 기록하도록 설정합니다.
+
+    파일 쓰기는 별도 스레드(QueueListener)에서 수행되므로 요청 처리 경로는 큐에 넣는 비용만 부담합니다.
+    같은 경로로 다시 호출하면 아무 것도 하지 않고, 다른 경로로 호출하면 이전 설정을 대체합니다.
+
+    Args:
+        path: 로그 파일 경로 (순환된 파일은 path.1, path.2 ...)
+        max_bytes: 파일 하나의 최대 크기
+        backup_count: 보관할 순환 파일 수
+    """
+    global _listener, _configured_path
+    if _listener is not None and _configured_path == path:
+        return
+    if _listener is not None:
+        _listener.stop()
+    for handler in list(audit_logger.handlers):
+        audit_logger.removeHandler(handler)
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+    )
+    file_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(records, file_handler)
+    _listener.start()
+    _configured_path = path
+
+    audit_logger.addHandler(logging.handlers.QueueHandler(records))
+    audit_logger.setLevel(logging.INFO)
+    audit_logger.propagate = False
+
+
+@atexit.register
+def _stop_listener() -> None:
+    """종료 시 큐에 남은 감사 로그를 모두 기록합니다."""
+    if _listener is not None:
+        _listener.stop()
@@ -1,9 +1,19 @@
+import base64
+import binascii
+import json
+import secrets
 import time
 import os
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 
-from ..config import config
+from starlette.concurrency import run_in_threadpool
+
+from ..config import config, SwagGuardSettings
+from .credentials import get_credential_cache
+from .jwt import decode_jwt, encode_jwt, get_signing_key
+from .jwt import b64url_decode
 from .security import verify_password, create_signed_value, verify_signed_value
+from .shm import get_session_cache
 
 
 # 기본적으로 환경 변수나 설정 파일에서 가져오지 않았다면 랜덤 시크릿 키 생성
@@ -13,18 +23,24 @@ if not SECRET_KEY:
     SECRET_KEY = generate_secret_key()
 
 
-def authenticate_user(username: str, password: str) -> bool:
+def authenticate_user(
+    username: str,
+    password: str,
+    settings: Optional[SwagGuardSettings] = None
+) -> bool:
     """
     사용자를 인증합니다.
     
     Args:
         username: 사용자 이름
         password: 비밀번호
+        settings: 사용할 설정 (기본값: 전역 config)
         
     Returns:
         인증 성공 시 True, 실패 시 False
     """
-    users = config.get_users()
+    settings = settings or config
+    users = settings.get_users()
     if username not in users:
         return False
         
@@ -32,56 +48,255 @@ def authenticate_user(username: str, password: str) -> bool:
     return verify_password(password, stored_password_hash)
 
 
-def create_auth_cookie(username: str) -> Tuple[str, Dict[str, str]]:
+async def authenticate_user_async(
+    username: str,
+    password: str,
+    settings: Optional[SwagGuardSettings] = None
+) -> bool:
+    """
+    설정된 인증 백엔드(local 또는 ldap)로 사용자를 인증합니다.
+    
+    local 백엔드의 bcrypt 검증은 이벤트 루프를 막지 않도록 스레드 풀에서 실행합니다.
+    
+    Args:
+        username: 사용자 이름
+        password: 비밀번호
+        settings: 사용할 설정 (기본값: 전역 config)
+        
+    Returns:
+        인증 성공 시 True, 실패 시 False
+    """
+    settings = settings or config
+    if settings.get("auth_backend", "local") == "ldap":
+        from ..backends.ldap import get_ldap_backend
+        return await get_ldap_backend(settings).authenticate(username, password)
+        
+    return await run_in_threadpool(authenticate_user, username, password, settings)
+
+
+def _parse_basic_credentials(authorization: Optional[str]) -> Optional[Tuple[str, str]]:
+    """Authorization 헤더에서 HTTP Basic 사용자 이름과 비밀번호를 꺼냅니다. 형식이 잘못되면 None"""
+    if not authorization:
+        return None
+        
+    scheme, _, credentials = authorization.partition(" ")
+    if scheme.lower() != "basic" or not credentials:
+        return None
+        
+    try:
+        decoded = base64.b64decode(credentials.strip(), validate=True).decode("utf-8")
+    except (binascii.Error, UnicodeDecodeError):
+        return None
+        
+    username, separator, password = decoded.partition(":")
+    if not separator or not username:
+        return None
+    return username, password
+
+
+def authenticate_basic(
+    authorization: Optional[str],
+    settings: Optional[SwagGuardSettings] = None
+) -> Optional[str]:
+    """
+    Authorization 헤더의 HTTP Basic 자격 증명을 사용자 저장소로 인증합니다.
+    
+    최근에 검증된 자격 증명은 캐시에서 확인하므로 반복 요청은 bcrypt 검증을 건너뜁니다.
+    auth_backend 설정과 관계없이 로컬 사용자 저장소만 사용하며,
+    설정된 인증 백엔드(ldap 포함)를 사용하려면 authenticate_basic_async를 사용합니다.
+    
+    Args:
+        authorization: Authorization 헤더 값 (예: "Basic dXNlcjpwYXNz")
+        settings: 사용할 설정 (기본값: 전역 config)
+        
+    Returns:
+        인증 성공 시 사용자 이름, 실패 시 None
+    """
+    credentials = _parse_basic_credentials(authorization)
+    if credentials is None:
+        return None
+        
+    username, password = credentials
+    settings = settings or config
+    cache = get_credential_cache(settings)
+    if cache.check(username, password):
+        return username
+        
+    if not authenticate_user(username, password, settings=settings):
+        return None
+        
+    cache.store(username, password, ttl_seconds=settings.get("basic_auth_cache_seconds", 60))
+    return username
+
+
+async def authenticate_basic_async(
+    authorization: Optional[str],
+    settings: Optional[SwagGuardSettings] = None
+) -> Optional[str]:
+    """
+    Authorization 헤더의 HTTP Basic 자격 증명을 설정된 인증 백엔드(local 또는 ldap)로 인증합니다.
+    
+    캐시에 없는 자격 증명은 authenticate_user_async로 확인하므로 이벤트 루프를 막지 않습니다.
+    
+    Args:
+        authorization: Authorization 헤더 값 (예: "Basic dXNlcjpwYXNz")
+        settings: 사용할 설정 (기본값: 전역 config)
+        
+    Returns:
+        인증 성공 시 사용자 이름, 실패 시 None
+    """
+    credentials = _parse_basic_credentials(authorization)
+    if credentials is None:
+        return None
+        
+    username, password = credentials
+    settings = settings or config
+    cache = get_credential_cache(settings)
+    if cache.check(username, password):
+        return username
+        
+    if not await authenticate_user_async(username, password, settings=settings):
+        return None
+        
+    cache.store(username, password, ttl_seconds=settings.get("basic_auth_cache_seconds", 60))
+    return username
+
+
+def create_auth_cookie(
+    username: str,
+    settings: Optional[SwagGuardSettings] = None,
+    secret_key: Optional[str] = None
+) -> Tuple[str, Dict[str, str]]:
     """
     인증 쿠키를 생성합니다.
     
     Args:
         username: 인증된 사용자 이름
+        settings: 사용할 설정 (기본값: 전역 config)
+        secret_key: 서명 키 (기본값: SECRET_KEY)
         
     Returns:
         (쿠키 값, 쿠키 설정 옵션) 튜플
     """
+    settings = settings or config
+
     # 현재 시간과 만료 시간 계산
     now = int(time.time())
-    expires = now + (config.get("cookie_expire_minutes", 60) * 60)
+    expires = now + (settings.get("cookie_expire_minutes", 60) * 60)
     
     # 쿠키 데이터 생성
     cookie_data = {
         "sub": username,  # subject (사용자)
         "iat": now,       # issued at (발급 시간)
         "exp": expires,   # expiration (만료 시간)
+        "sid": secrets.token_urlsafe(9),  # session id (접근 기록용 세션 식별자)
+        "gen": settings.get_user_generation(username),  # 세션 세대 (사용자 제거/비밀번호 변경 시 무효화)
     }
     
-    # 서명된 쿠키 값 생성
-    cookie_value = create_signed_value(SECRET_KEY, cookie_data)
+    # 역할은 쿠키에 담아 요청마다 사용자 저장소를 조회하지 않도록 합니다.
+    roles = settings.get_user_roles(username)
+    if roles:
+        cookie_data["roles"] = roles
+    
+    # 서명된 쿠키 값 생성 (jwt 형식이면 엣지 게이트웨이에서도 검증 가능한 JWT)
+    if settings.get("token_format", "signed") == "jwt":
+        cookie_data["iss"] = settings.get("jwt_issuer", "swaguard")
+        cookie_value = encode_jwt(cookie_data, get_signing_key(settings, secret_key or SECRET_KEY))
+    else:
+        cookie_value = create_signed_value(secret_key or SECRET_KEY, cookie_data)
     
     # 쿠키 설정 옵션
     cookie_options = {
-        "httponly": str(config.get("cookie_httponly", True)).lower(),
-        "secure": str(config.get("cookie_secure", True)).lower(),
-        "samesite": config.get("cookie_samesite", "lax"),
+        "httponly": str(settings.get("cookie_httponly", True)).lower(),
+        "secure": str(settings.get("cookie_secure", True)).lower(),
+        "samesite": settings.get("cookie_samesite", "lax"),
         "path": "/",
-        "max-age": str(config.get("cookie_expire_minutes", 60) * 60),
+        "max-age": str(settings.get("cookie_expire_minutes", 60) * 60),
     }
     
     return cookie_value, cookie_options
 
 
-def verify_auth_cookie(cookie_value: Optional[str]) -> Optional[str]:
+def _parse_verified_cookie(cookie_value: str) -> Optional[Dict[str, Any]]:
     """
-    인증 쿠키를 확인합니다.
+    이미 검증된 것으로 확인된 쿠키(세션 캐시의 공유 계층 적중)의 클레임을 서명 검증 없이 해석합니다.
+    """
+    try:
+        parts = cookie_value.split(".")
+        if len(parts) == 3:
+            data = json.loads(b64url_decode(parts[1]))
+        else:
+            data = json.loads(base64.b64decode(parts[0]))
+    except (ValueError, TypeError, UnicodeError):
+        return None
+    return data if isinstance(data, dict) and data.get("sub") else None
+
+
+def decode_auth_cookie(
+    cookie_value: Optional[str],
+    secret_key: Optional[str] = None,
+    settings: Optional[SwagGuardSettings] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    인증 쿠키를 검증하고 쿠키에 담긴 클레임을 반환합니다.
+    
+    jwt 형식을 사용하는 경우에도 전환 기간 동안 기존 형식의 쿠키를 함께 허용합니다.
+    검증된 쿠키는 세션 캐시(프로세스별 LRU와 선택적인 워커 간 공유 메모리 계층)에 만료 시각까지 보관됩니다.
+    쿠키의 gen 클레임이 사용자의 현재 세대 번호와 다르면 서명이 유효하더라도 거부합니다.
     
     Args:
         cookie_value: 쿠키 값 문자열
+        secret_key: 서명 키 (기본값: SECRET_KEY)
+        settings: 사용할 설정 (기본값: 전역 config)
         
     Returns:
-        쿠키가 유효하면 사용자 이름, 그렇지 않으면 None
+        쿠키가 유효하면 클레임 딕셔너리(sub, iat, exp, roles 등), 그렇지 않으면 None
     """
     if not cookie_value:
         return None
         
-    data = verify_signed_value(SECRET_KEY, cookie_value)
+    settings = settings or config
+    secret_key = secret_key or SECRET_KEY
+    jwt_key = get_signing_key(settings, secret_key) if settings.get("token_format", "signed") == "jwt" else None
+    cache = get_session_cache(settings)
+    # JWT 서명 키를 교체하면 이전 키로 검증된 캐시 항목(공유 계층 포함)이 적중하지 않도록 캐시 키에 키 지문을 섞습니다.
+    cache_key = secret_key if jwt_key is None else f"{secret_key}\x00{jwt_key.thumbprint}"
+    data = cache.get(cache_key, cookie_value, _parse_verified_cookie) if cache is not None else None
+    if data is None:
+        if jwt_key is not None and cookie_value.count(".") == 2:
+            data = decode_jwt(cookie_value, jwt_key, issuer=settings.get("jwt_issuer", "swaguard"))
+        else:
+            data = verify_signed_value(secret_key, cookie_value)
+        if not data or not data.get("sub"):
+            return None
+        if cache is not None:
+            cache.put(cache_key, cookie_value, data)
+        
+    # 세대 번호가 바뀐 사용자(제거, 비밀번호 변경, 세션 폐기)의 쿠키는 캐시 적중 여부와 관계없이 거부합니다.
+    # 다른 워커가 더 새로운 세대로 발급한 쿠키는 아직 동기화되지 않았을 수 있으므로 받아들입니다.
+    # gen 클레임이 없는 이전 쿠키는 세대 0으로 취급합니다.
+    if data.get("gen", 0) < settings.get_user_generation(data["sub"]):
+        return None
+    return data
+
+
+def verify_auth_cookie(
+    cookie_value: Optional[str],
+    secret_key: Optional[str] = None,
+    settings: Optional[SwagGuardSettings] = None
+) -> Optional[str]:
+    """
+    인증 쿠키를 확인합니다.
+    
+    Args:
+        cookie_value: 쿠키 값 문자열
+        secret_key: 서명 키 (기본값: SECRET_KEY)
+        settings: 사용할 설정 (기본값: 전역 config)
+        
+    Returns:
+        쿠키가 유효하면 사용자 이름, 그렇지 않으면 None
+    """
+    data = decode_auth_cookie(cookie_value, secret_key, settings)
     if not data:
         return None
         
@@ -89,15 +304,16 @@ def verify_auth_cookie(cookie_value: Optional[str]) -> Optional[str]:
     return data.get("sub")
 
 
-def is_path_protected(path: str) -> bool:
+def is_path_protected(path: str, settings: Optional[SwagGuardSettings] = None) -> bool:
     """
     주어진 경로가 보호되어야 하는지 확인합니다.
     
     Args:
         path: 확인할 경로
+        settings: 사용할 설정 (기본값: 전역 config)
         
     Returns:
         경로가 보호되어야 하면 True, 그렇지 않으면 False
     """
-    protected_paths = config.get("protected_paths", [])
+    protected_paths = (settings or config).get("protected_paths", [])
     return any(path.startswith(protected) for protected in protected_paths)
@@ -0,0 +1,140 @@
+import re
+import weakref
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+from ..config import config, SwagGuardSettings
+
+
+class RoleTable:
+    """
+    역할별 허용/거부 경로 규칙을 미리 컴파일한 접근 결정 테이블
+
+    모든 규칙 경로를 하나의 정규식(긴 접두사 우선)으로 묶고, 각 경로마다
+    역할별 최종 결정을 비트마스크로 계산해 둡니다. 요청 시에는 정규식 매칭 한 번과
+    비트 연산만으로 접근 여부를 판단하며 규칙 목록을 순회하지 않습니다.
+
+    결정 규칙:
+        - 역할마다 요청 경로와 일치하는 가장 긴 규칙 경로의 결정을 따릅니다.
+        - 같은 경로에 allow와 deny가 모두 있으면 deny가 우선합니다.
+        - 사용자의 역할 중 하나라도 deny이면 거부, 그렇지 않고 하나라도 allow이면 허용합니다.
+        - 어떤 규칙에도 해당하지 않는 경로와 역할이 없는 사용자는 거부합니다.
+    """
+
+    def __init__(self, rules: Dict[str, Dict[str, List[str]]]):
+        """
+        Args:
+            rules: 역할 -> {"allow": [...], "deny": [...]} 딕셔너리
+        """
+        self._bits = {role: 1 << index for index, role in enumerate(sorted(rules))}
+        self._role_masks: Dict[Tuple[str, ...], int] = {}
+
+        # 역할별 규칙 경로 -> 결정 (True: allow, False: deny)
+        decisions: Dict[str, Dict[str, bool]] = {}
+        for role, rule in rules.items():
+            role_decisions: Dict[str, bool] = {}
+            for prefix in rule.get("allow", []):
+                role_decisions[prefix] = True
+            for prefix in rule.get("deny", []):
+                role_decisions[prefix] = False
+            decisions[role] = role_decisions
+
+        prefixes = sorted({prefix for role_decisions in decisions.values() for prefix in role_decisions},
+                          key=len, reverse=True)
+
+        # 그룹 번호(lastindex)로 조회하므로 0번은 비워 둡니다.
+        self._entries: List[Tuple[int, int]] = [(0, 0)]
+        for prefix in prefixes:
+            allow_mask = deny_mask = 0
+            for role, role_decisions in decisions.items():
+                decision = self._resolve(role_decisions, prefix)
+                if decision is True:
+                    allow_mask |= self._bits[role]
+                elif decision is False:
+                    deny_mask |= self._bits[role]
+            self._entries.append((allow_mask, deny_mask))
+
+        self._pattern: Optional[Pattern[str]] = None
+        if prefixes:
+            self._pattern = re.compile("|".join(f"({re.escape(prefix)})" for prefix in prefixes))
+
+    @staticmethod
+    def _resolve(role_decisions: Dict[str, bool], path: str) -> Optional[bool]:
+        """컴파일 시점에 한 역할의 경로 결정을 가장 긴 일치 규칙으로 계산합니다."""
+        best: Optional[str] = None
+        for prefix in role_decisions:
+            if path.startswith(prefix) and (best is None or len(prefix) > len(best)):
+                best = prefix
+        return None if best is None else role_decisions[best]
+
+    def role_mask(self, roles: Iterable[str]) -> int:
+        """역할 목록을 비트마스크로 변환합니다. (역할 조합별로 캐시)"""
+        key = tuple(roles)
+        mask = self._role_masks.get(key)
+        if mask is None:
+            mask = 0
+            for role in key:
+                mask |= self._bits.get(role, 0)
+            self._role_masks[key] = mask
+        return mask
+
+    def is_allowed(self, roles: Iterable[str], path: str) -> bool:
+        """
+        주어진 역할이 경로에 접근할 수 있는지 확인합니다.
+
+        Args:
+            roles: 사용자 역할 목록
+            path: 요청 경로
+
+        Returns:
+            접근 가능하면 True, 그렇지 않으면 False
+        """
+        if self._pattern is None:
+            return False
+        matched = self._pattern.match(path)
+        if matched is None:
+            return False
+        allow_mask, deny_mask = self._entries[matched.lastindex]
+        mask = self.role_mask(roles)
+        return bool(mask & allow_mask) and not mask & deny_mask
+
+
+_tables: "weakref.WeakKeyDictionary[SwagGuardSettings, Tuple[int, Optional[RoleTable]]]" = weakref.WeakKeyDictionary()
+
+
+def get_role_table(settings: Optional[SwagGuardSettings] = None) -> Optional[RoleTable]:
+    """
+    설정 스냅샷의 역할 규칙으로 컴파일된 결정 테이블을 반환합니다.
+
+    테이블은 설정 버전별로 한 번만 컴파일됩니다.
+
+    Args:
+        settings: 사용할 설정 (기본값: 전역 config)
+
+    Returns:
+        RoleTable 객체, 역할 규칙이 없으면 None (역할 검사 비활성화)
+    """
+    settings = settings or config
+    cached = _tables.get(settings)
+    if cached is not None and cached[0] == settings.version:
+        return cached[1]
+
+    rules = settings.get("role_rules", {})
+    table = RoleTable(rules) if rules else None
+    _tables[settings] = (settings.version, table)
+    return table
+
+
+def is_path_allowed(roles: Iterable[str], path: str, settings: Optional[SwagGuardSettings] = None) -> bool:
+    """
+    역할 규칙에 따라 경로 접근이 허용되는지 확인합니다.
+
+    Args:
+        roles: 사용자 역할 목록
+        path: 요청 경로
+        settings: 사용할 설정 (기본값: 전역 config)
+
+    Returns:
+        접근 가능하면 True (역할 규칙이 없으면 항상 True)
+    """
+    table = get_role_table(settings)
+    return table is None or table.is_allowed(roles, path)
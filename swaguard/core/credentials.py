@@ -0,0 +1,132 @@
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+from ..config import config, SwagGuardSettings
+
+
+class CredentialCache:
+    """
+    검증에 성공한 자격 증명의 키 기반 HMAC 다이제스트를 짧은 시간 동안 보관하는 캐시
+
+    같은 자격 증명으로 반복되는 요청이 매번 bcrypt 검증을 거치지 않도록 합니다.
+    평문 비밀번호는 저장하지 않으며, 다이제스트 키는 프로세스마다 랜덤으로 생성됩니다.
+    """
+
+    def __init__(self, ttl_seconds: float = 60, max_entries: int = 1024):
+        """
+        Args:
+            ttl_seconds: 캐시 항목 유지 시간 (초)
+            max_entries: 최대 캐시 항목 수 (초과 시 가장 오래된 항목 제거)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._key = secrets.token_bytes(32)
+        self._entries: Dict[str, Tuple[bytes, float]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def digest(self, username: str, password: str) -> bytes:
+        """자격 증명의 키 기반 HMAC 다이제스트를 계산합니다."""
+        message = username.encode("utf-8") + b"\x00" + password.encode("utf-8")
+        return hmac.new(self._key, message, hashlib.sha256).digest()
+
+    def check(self, username: str, password: str) -> bool:
+        """
+        자격 증명이 최근에 검증되었는지 확인합니다.
+
+        Args:
+            username: 사용자 이름
+            password: 비밀번호
+
+        Returns:
+            유효한 캐시 항목과 일치하면 True, 그렇지 않으면 False
+        """
+        entry = self._entries.get(username)
+        if entry is not None:
+            digest, expires_at = entry
+            if expires_at > time.monotonic() and hmac.compare_digest(digest, self.digest(username, password)):
+                self.hits += 1
+                return True
+        self.misses += 1
+        return False
+
+    def store(self, username: str, password: str, ttl_seconds: Optional[float] = None):
+        """
+        검증에 성공한 자격 증명을 캐시에 저장합니다.
+
+        Args:
+            username: 사용자 이름
+            password: 비밀번호
+            ttl_seconds: 이 항목의 유지 시간 (기본값: 캐시의 ttl_seconds)
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl <= 0:
+            return
+        digest = self.digest(username, password)
+        with self._lock:
+            self._entries.pop(username, None)
+            while len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[username] = (digest, time.monotonic() + ttl)
+
+    def invalidate(self, username: Optional[str] = None):
+        """
+        캐시 항목을 무효화합니다.
+
+        Args:
+            username: 무효화할 사용자 이름 (None이면 전체 무효화)
+        """
+        with self._lock:
+            if username is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(username, None)
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        캐시 지표를 반환합니다.
+
+        Returns:
+            hits, misses, hit_rate, invalidations, size를 담은 딕셔너리
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "invalidations": self.invalidations,
+            "size": len(self._entries),
+        }
+
+
+_caches: "weakref.WeakKeyDictionary[SwagGuardSettings, CredentialCache]" = weakref.WeakKeyDictionary()
+
+
+def get_credential_cache(settings: Optional[SwagGuardSettings] = None) -> CredentialCache:
+    """
+    설정(사용자 저장소)별 자격 증명 캐시를 반환합니다.
+
+    캐시는 처음 요청될 때 생성되며, 해당 저장소에서 사용자가 변경되거나
+    제거되면 그 사용자의 항목이 자동으로 무효화됩니다.
+
+    Args:
+        settings: 사용자 저장소를 가진 설정 (기본값: 전역 config)
+
+    Returns:
+        CredentialCache 객체
+    """
+    settings = settings or config
+    cache = _caches.get(settings)
+    if cache is None:
+        cache = CredentialCache(ttl_seconds=settings.get("basic_auth_cache_seconds", 60))
+        settings.add_user_listener(cache.invalidate)
+        _caches[settings] = cache
+    return cache
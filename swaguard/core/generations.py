@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import weakref
+from typing import Any, Dict, Optional
+
+from ..backends.base import StateBackend, get_state_backend
+from ..config import config, SwagGuardSettings
+from ..exceptions.AuthExceptions import BackendUnavailableError, StateBackendError
+from .resilience import ResilientBackend
+
+
+# 백그라운드 동기화 작업의 최소 간격 (초)
+MIN_SYNC_INTERVAL = 1.0
+
+logger = logging.getLogger("swaguard")
+
+
+class GenerationSync:
+    """
+    사용자 세션 세대 번호(user_generations)를 공유 상태 백엔드와 동기화하는 작업
+
+    요청 처리 경로는 계속 메모리의 세대 번호만 조회합니다. 백그라운드 작업이
+    generation_sync_seconds 간격으로 이 프로세스에서 올린 세대 번호를 백엔드 해시에
+    원자적으로 더하고(hincr), 다른 워커가 올린 세대 번호를 읽어 메모리에 반영합니다.
+    따라서 한 워커에서 revoke_sessions를 호출하거나 비밀번호를 바꾸면 동기화 간격 안에
+    모든 워커에서 해당 사용자의 기존 쿠키가 거부됩니다.
+
+    시작 시점의 세대 번호(파일이나 설정에서 불러온 값)는 증가분이 아니므로 더하지 않고
+    백엔드 값과 큰 값으로 합칩니다(hmax). 워커 수나 재시작 횟수만큼 세대 번호가 커지지 않습니다.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[SwagGuardSettings] = None,
+        backend: Optional[StateBackend] = None,
+        sync_interval: Optional[float] = None
+    ):
+        """
+        Args:
+            settings: 세대 번호를 가진 설정(사용자 저장소) (기본값: 전역 config)
+            backend: 공유 상태 백엔드 (기본값: get_state_backend(settings))
+            sync_interval: 동기화 간격 (초, 기본값: generation_sync_seconds 설정, 최소 MIN_SYNC_INTERVAL)
+        """
+        settings = settings or config
+        # 설정별 캐시에 보관되므로 설정을 약한 참조로 가리켜 설정이 해제될 수 있도록 합니다.
+        self._settings = weakref.ref(settings)
+        self.backend = backend or get_state_backend(settings)
+        self.key = settings.get("generation_key", "swaguard:generations")
+        if sync_interval is None:
+            sync_interval = settings.get("generation_sync_seconds", 5)
+        self.sync_interval = max(MIN_SYNC_INTERVAL, sync_interval)
+        # 사용자별로 마지막으로 확인한 백엔드의 세대 번호 (메모리 값과의 차이가 아직 보내지 않은 증가분)
+        # 시작 시점의 값으로 채워 두어 이후에 올린 세대 번호만 증가분으로 보냅니다.
+        self._synced: Dict[str, int] = dict(settings.config.get("user_generations", {}))
+        # 아직 백엔드와 합치지 못한 시작 시점의 세대 번호
+        self._initial: Dict[str, int] = dict(self._synced)
+        self._task: Optional[asyncio.Task] = None
+        self.syncs = 0
+
+    async def _call(self, method: str, *args) -> Any:
+        # 장애 정책의 로컬 대체 응답(last_known_good 등)을 받으면 보내지 못한 증가분을 보낸 것으로
+        # 착각하므로 차단기만 거치고 실패는 그대로 받아 다음 동기화 때 다시 보냅니다.
+        if isinstance(self.backend, ResilientBackend):
+            return await self.backend.call_strict(method, *args)
+        return await getattr(self.backend, method)(*args)
+
+    async def sync(self) -> None:
+        """
+        세대 번호를 한 번 동기화합니다.
+
+        Raises:
+            StateBackendError: 백엔드를 사용할 수 없는 경우 (보내지 못한 증가분은 다음 동기화 때 다시 보냄)
+            BackendUnavailableError: 공유 상태 백엔드의 회로 차단기가 열려 있거나 기한을 넘긴 경우
+        """
+        settings = self._settings()
+        if settings is None:
+            return
+        generations = settings.config.setdefault("user_generations", {})
+        snapshot = dict(generations)
+
+        for username, generation in list(self._initial.items()):
+            await self._call("hmax", self.key, username, generation)
+            del self._initial[username]
+
+        for username, generation in snapshot.items():
+            delta = generation - self._synced.get(username, 0)
+            if delta > 0:
+                self._synced[username] = await self._call("hincr", self.key, username, delta)
+
+        changed = []
+        for username, raw in (await self._call("hget_all", self.key)).items():
+            remote = int(raw)
+            self._synced[username] = remote
+            # 동기화하는 동안 이 프로세스에서 올린 증가분은 다음 동기화 때 보냅니다.
+            target = remote + generations.get(username, 0) - snapshot.get(username, 0)
+            if target > generations.get(username, 0):
+                generations[username] = target
+                changed.append(username)
+
+        for username in changed:
+            # 다른 워커에서 무효화된 사용자의 캐시된 자격 증명 등도 정리
+            settings._notify_user_change(username)
+        self.syncs += 1
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sync()
+            except BackendUnavailableError as e:
+                # 회로가 열려 있는 동안은 로컬 세대 번호를 그대로 사용하고 복구 후에 동기화
+                logger.debug("Session generation sync skipped: %s", e)
+            except StateBackendError as e:
+                logger.warning("Session generation sync failed: %s", e)
+            await asyncio.sleep(self.sync_interval)
+
+    def ensure_started(self) -> None:
+        """실행 중인 이벤트 루프에 백그라운드 동기화 작업이 없으면 시작합니다."""
+        if self._task is None or self._task.done() or self._task.get_loop() is not asyncio.get_running_loop():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """백그라운드 동기화 작업을 중지하고 남은 증가분을 보냅니다."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        try:
+            await self.sync()
+        except (BackendUnavailableError, StateBackendError) as e:
+            logger.warning("Session generation sync failed: %s", e)
+
+
+_syncs: "weakref.WeakKeyDictionary[SwagGuardSettings, GenerationSync]" = weakref.WeakKeyDictionary()
+
+
+def get_generation_sync(settings: Optional[SwagGuardSettings] = None) -> Optional[GenerationSync]:
+    """
+    설정별 세대 번호 동기화 작업을 반환합니다.
+
+    Args:
+        settings: 사용할 설정 (기본값: 전역 config)
+
+    Returns:
+        GenerationSync 객체 (state_backend_url이 없어 워커 간에 공유할 백엔드가 없으면 None)
+    """
+    settings = settings or config
+    if not settings.get("state_backend_url"):
+        return None
+    sync = _syncs.get(settings)
+    if sync is None:
+        sync = GenerationSync(settings)
+        _syncs[settings] = sync
+    return sync
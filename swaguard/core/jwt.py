@@ -0,0 +1,254 @@
+import base64
+import functools
+import hashlib
+import hmac
+import json
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from ..config import config, SwagGuardSettings
+from ..exceptions.AuthExceptions import ConfigurationError
+
+
+SUPPORTED_ALGORITHMS = ("HS256", "EdDSA", "ES256")
+
+
+def b64url_encode(data: bytes) -> str:
+    """패딩 없는 base64url 인코딩"""
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def b64url_decode(data: str) -> bytes:
+    """패딩 없는 base64url 디코딩"""
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _load_cryptography():
+    try:
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import ec, ed25519, utils
+    except ImportError:
+        raise ConfigurationError(
+            "EdDSA/ES256 JWT를 사용하려면 cryptography 패키지가 필요합니다. (pip install swaguard[jwt])"
+        )
+    return hashes, serialization, ec, ed25519, utils
+
+
+class JWTKey:
+    """JWT 서명 및 검증에 사용하는 파싱된 키"""
+
+    def __init__(
+        self,
+        kid: str,
+        alg: str,
+        secret: Optional[bytes] = None,
+        private_key: Any = None,
+        thumbprint: str = ""
+    ):
+        self.kid = kid
+        self.alg = alg
+        # 키 재료의 다이제스트 (키 교체 후 이전 키로 검증된 세션 캐시 항목을 구분하는 데 사용)
+        self.thumbprint = thumbprint
+        self._secret = secret
+        self._private_key = private_key
+        self._public_key = private_key.public_key() if private_key is not None else None
+
+    def sign(self, message: bytes) -> bytes:
+        """메시지에 서명합니다."""
+        if self.alg == "HS256":
+            return hmac.new(self._secret, message, hashlib.sha256).digest()
+        hashes, _, ec, _, utils = _load_cryptography()
+        if self.alg == "EdDSA":
+            return self._private_key.sign(message)
+        # ES256: DER 서명을 JWS 형식(r || s)으로 변환
+        r, s = utils.decode_dss_signature(self._private_key.sign(message, ec.ECDSA(hashes.SHA256())))
+        return r.to_bytes(32, "big") + s.to_bytes(32, "big")
+
+    def verify(self, message: bytes, signature: bytes) -> bool:
+        """서명을 검증합니다."""
+        if self.alg == "HS256":
+            return hmac.compare_digest(self.sign(message), signature)
+        hashes, _, ec, _, utils = _load_cryptography()
+        from cryptography.exceptions import InvalidSignature
+        try:
+            if self.alg == "EdDSA":
+                self._public_key.verify(signature, message)
+            else:
+                if len(signature) != 64:
+                    return False
+                der = utils.encode_dss_signature(
+                    int.from_bytes(signature[:32], "big"), int.from_bytes(signature[32:], "big")
+                )
+                self._public_key.verify(der, message, ec.ECDSA(hashes.SHA256()))
+        except InvalidSignature:
+            return False
+        return True
+
+    def public_jwk(self) -> Optional[Dict[str, str]]:
+        """
+        공개 키를 JWK 형식으로 반환합니다.
+
+        Returns:
+            JWK 딕셔너리, 대칭 키(HS256)는 공개할 수 없으므로 None
+        """
+        if self.alg == "HS256":
+            return None
+        _, serialization, _, _, _ = _load_cryptography()
+        if self.alg == "EdDSA":
+            raw = self._public_key.public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+            return {"kty": "OKP", "crv": "Ed25519", "x": b64url_encode(raw), "kid": self.kid, "alg": self.alg, "use": "sig"}
+        numbers = self._public_key.public_numbers()
+        return {
+            "kty": "EC",
+            "crv": "P-256",
+            "x": b64url_encode(numbers.x.to_bytes(32, "big")),
+            "y": b64url_encode(numbers.y.to_bytes(32, "big")),
+            "kid": self.kid,
+            "alg": self.alg,
+            "use": "sig",
+        }
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_key(alg: str, kid: str, material: bytes) -> JWTKey:
+    """키 재료를 파싱합니다. 같은 키는 한 번만 파싱하도록 캐시됩니다."""
+    thumbprint = hashlib.sha256(f"{alg}\x00{kid}\x00".encode("utf-8") + material).hexdigest()
+    if alg == "HS256":
+        return JWTKey(kid, alg, secret=material, thumbprint=thumbprint)
+
+    _, serialization, ec, ed25519, _ = _load_cryptography()
+    private_key = serialization.load_pem_private_key(material, password=None)
+    if alg == "EdDSA" and not isinstance(private_key, ed25519.Ed25519PrivateKey):
+        raise ConfigurationError("EdDSA 알고리즘에는 Ed25519 개인 키가 필요합니다.")
+    if alg == "ES256" and not (
+        isinstance(private_key, ec.EllipticCurvePrivateKey) and private_key.curve.name == "secp256r1"
+    ):
+        raise ConfigurationError("ES256 알고리즘에는 P-256 EC 개인 키가 필요합니다.")
+    return JWTKey(kid, alg, private_key=private_key, thumbprint=thumbprint)
+
+
+def get_signing_key(settings: Optional[SwagGuardSettings] = None, secret_key: Optional[str] = None) -> JWTKey:
+    """
+    설정에 맞는 JWT 서명 키를 반환합니다.
+
+    Args:
+        settings: 사용할 설정 (기본값: 전역 config)
+        secret_key: HS256 서명에 사용할 비밀 키
+
+    Returns:
+        JWTKey 객체
+
+    Raises:
+        ConfigurationError: 지원하지 않는 알고리즘이거나 키가 없는 경우
+    """
+    settings = settings or config
+    alg = settings.get("jwt_algorithm", "HS256")
+    kid = settings.get("jwt_kid", "swaguard-1")
+    if alg not in SUPPORTED_ALGORITHMS:
+        raise ConfigurationError(f"지원하지 않는 JWT 알고리즘입니다: {alg}")
+
+    if alg == "HS256":
+        if not secret_key:
+            raise ConfigurationError("HS256 JWT에는 비밀 키가 필요합니다.")
+        return _parse_key(alg, kid, secret_key.encode("utf-8"))
+
+    key_path = settings.get("jwt_private_key_path")
+    if not key_path:
+        raise ConfigurationError(f"{alg} JWT에는 jwt_private_key_path 설정이 필요합니다.")
+    # 서명과 검증마다 파일 시스템을 조회하지 않도록 키 파일의 수정 시각은 jwt_key_check_seconds마다 확인
+    now = time.monotonic()
+    checked = _key_checks.get(key_path)
+    if checked is None or now - checked[0] >= settings.get("jwt_key_check_seconds", 5):
+        try:
+            modified = os.stat(key_path).st_mtime_ns
+        except OSError as e:
+            raise ConfigurationError(f"JWT 개인 키 파일을 읽을 수 없습니다: {key_path}") from e
+        checked = (now, modified)
+        _key_checks[key_path] = checked
+    return _parse_key(alg, kid, _read_key_file(key_path, checked[1]))
+
+
+# 키 파일 경로 -> (마지막 확인 시각, 수정 시각)
+_key_checks: Dict[str, Tuple[float, int]] = {}
+
+
+@functools.lru_cache(maxsize=8)
+def _read_key_file(path: str, modified: int) -> bytes:
+    """키 파일을 읽습니다. 수정 시각(modified)이 캐시 키에 포함되므로 파일을 교체하면 다시 읽습니다."""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def encode_jwt(claims: Dict[str, Any], key: JWTKey) -> str:
+    """
+    클레임을 JWT(JWS Compact Serialization)로 서명합니다.
+
+    Args:
+        claims: JWT 클레임
+        key: 서명 키
+
+    Returns:
+        JWT 문자열
+    """
+    header = {"alg": key.alg, "typ": "JWT", "kid": key.kid}
+    signing_input = (
+        b64url_encode(json.dumps(header, separators=(",", ":")).encode("utf-8"))
+        + "."
+        + b64url_encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    )
+    return signing_input + "." + b64url_encode(key.sign(signing_input.encode("ascii")))
+
+
+def decode_jwt(token: str, key: JWTKey, issuer: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    JWT를 검증하고 클레임을 반환합니다.
+
+    헤더의 alg와 kid가 키와 일치해야 하며(알고리즘 혼동 방지), exp와 iss를 확인합니다.
+
+    Args:
+        token: JWT 문자열
+        key: 검증 키
+        issuer: 기대하는 iss 값 (None이면 확인하지 않음)
+
+    Returns:
+        검증에 성공하면 클레임 딕셔너리, 그렇지 않으면 None
+    """
+    try:
+        encoded_header, encoded_claims, encoded_signature = token.split(".")
+        header = json.loads(b64url_decode(encoded_header))
+        if not isinstance(header, dict):
+            return None
+        if header.get("alg") != key.alg or header.get("kid", key.kid) != key.kid:
+            return None
+
+        signing_input = f"{encoded_header}.{encoded_claims}".encode("ascii")
+        if not key.verify(signing_input, b64url_decode(encoded_signature)):
+            return None
+
+        claims = json.loads(b64url_decode(encoded_claims))
+    except (ValueError, TypeError, UnicodeError):
+        return None
+
+    if not isinstance(claims, dict):
+        return None
+    if "exp" in claims and claims["exp"] < time.time():
+        return None
+    if issuer is not None and claims.get("iss") != issuer:
+        return None
+    return claims
+
+
+def get_jwks(settings: Optional[SwagGuardSettings] = None, secret_key: Optional[str] = None) -> Dict[str, Any]:
+    """
+    엣지 게이트웨이가 토큰을 검증할 수 있도록 공개 키 집합(JWKS)을 반환합니다.
+
+    Args:
+        settings: 사용할 설정 (기본값: 전역 config)
+        secret_key: HS256 비밀 키
+
+    Returns:
+        {"keys": [...]} 딕셔너리 (HS256이면 빈 목록)
+    """
+    jwk = get_signing_key(settings, secret_key).public_jwk()
+    return {"keys": [jwk] if jwk else []}
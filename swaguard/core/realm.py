@@ -0,0 +1,276 @@
+import contextlib
+import hashlib
+import hmac
+import os
+import re
+from typing import Any, Dict, Iterator, List, Optional, Pattern, Sequence, Tuple
+
+from ..config import config, SwagGuardSettings
+from ..exceptions.AuthExceptions import ConfigurationError
+from ..utils.helper import setup_initial_users
+from . import auth
+from .activity import get_activity_tracker
+from .authz import is_path_allowed
+from .jwt import get_jwks
+from .security import hash_password
+from .tokens import issue_service_token, verify_service_token
+
+
+def realm_secret_key(name: str, settings: Optional[SwagGuardSettings] = None) -> str:
+    """
+    realm의 서명 키를 결정합니다.
+
+    다음 순서로 찾습니다.
+    1. realm 설정의 `secret_key`
+    2. 환경 변수 `SWAGUARD_REALM_<NAME>_SECRET_KEY` (이름은 대문자, 영숫자 외 문자는 `_`)
+    3. 전역 `SECRET_KEY`(`SWAGUARD_SECRET_KEY`)에서 realm 이름으로 파생한 키
+
+    여러 워커가 같은 쿠키를 검증하려면 1~2를 지정하거나 `SWAGUARD_SECRET_KEY`를 설정해야 합니다.
+    둘 다 없으면 전역 키가 프로세스마다 랜덤이므로 realm 키도 프로세스마다 달라집니다.
+
+    Args:
+        name: realm 이름
+        settings: realm 설정 객체
+
+    Returns:
+        서명 키 문자열
+    """
+    if settings is not None and settings.get("secret_key"):
+        return settings.get("secret_key")
+    env_var = "SWAGUARD_REALM_" + re.sub(r"[^A-Z0-9]", "_", name.upper()) + "_SECRET_KEY"
+    if os.environ.get(env_var):
+        return os.environ[env_var]
+    # realm마다 다른 키가 되도록 이름으로 파생하여 realm 간 쿠키 재사용을 막습니다.
+    return hmac.new(auth.SECRET_KEY.encode(), f"realm:{name}".encode(), hashlib.sha256).hexdigest()
+
+
+class SwagGuardRealm:
+    """
+    독립된 설정 스냅샷, 서명 키, 사용자 저장소를 가지는 보호 영역
+
+    하나의 프로세스에 마운트된 여러 서브 앱(공개 API, 파트너 API, 내부 관리자 등)이
+    서로 다른 보호 경로, 쿠키, 사용자 집합을 사용할 수 있도록 합니다.
+
+    Example:
+        partner = SwagGuardRealm(
+            "partner",
+            cookie_name="partner_auth",
+            login_path="/partner/swaguard/login",
+            protected_paths=["/partner/docs", "/partner/openapi.json"],
+        )
+        partner.create_user("acme", "password")
+    """
+
+    def __init__(
+        self,
+        name: str,
+        settings: Optional[SwagGuardSettings] = None,
+        secret_key: Optional[str] = None,
+        **overrides: Any
+    ):
+        """
+        Args:
+            name: realm 이름
+            settings: 공유할 설정 객체. 지정하지 않으면 전역 config의 스냅샷을 사용합니다.
+            secret_key: realm 전용 서명 키 (기본값: realm_secret_key 참고)
+            **overrides: 스냅샷에 덮어쓸 설정값
+        """
+        self.name = name
+        if settings is None:
+            values = config.snapshot()
+            # realm은 자신만의 사용자 저장소로 시작합니다.
+            values["users"] = {}
+            values["user_activity"] = {}
+            values["user_generations"] = {}
+            values["generation_key"] = f"swaguard:generations:{name}"
+            values.pop("secret_key", None)
+            values.update(overrides)
+            settings = SwagGuardSettings(values)
+        elif overrides:
+            raise ConfigurationError("settings와 overrides는 함께 지정할 수 없습니다.")
+        self.settings = settings
+        self.secret_key = secret_key or realm_secret_key(name, settings)
+
+    def __repr__(self) -> str:
+        return f"SwagGuardRealm(name={self.name!r})"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """realm 설정값을 가져옵니다."""
+        return self.settings.get(key, default)
+
+    def create_user(self, username: str, password: str, roles: Optional[List[str]] = None) -> None:
+        """
+        realm 사용자 저장소에 새 사용자를 생성합니다.
+
+        Args:
+            username: 사용자 이름
+            password: 비밀번호
+            roles: 사용자 역할 목록
+        """
+        if roles is not None:
+            self.settings.set_user_roles(username, roles)
+        self.settings.add_user(username, hash_password(password))
+
+    def remove_user(self, username: str) -> None:
+        """realm 사용자 저장소에서 사용자를 제거합니다."""
+        self.settings.remove_user(username)
+
+    def revoke_sessions(self, username: str) -> None:
+        """realm 사용자에게 이미 발급된 인증 쿠키를 모두 무효화합니다."""
+        self.settings.revoke_user_sessions(username)
+
+    def authenticate_user(self, username: str, password: str) -> bool:
+        """realm 사용자 저장소로 사용자를 인증합니다."""
+        return auth.authenticate_user(username, password, settings=self.settings)
+
+    async def authenticate_user_async(self, username: str, password: str) -> bool:
+        """realm에 설정된 인증 백엔드로 사용자를 인증합니다."""
+        return await auth.authenticate_user_async(username, password, settings=self.settings)
+
+    def authenticate_basic(self, authorization: Optional[str]) -> Optional[str]:
+        """realm 사용자 저장소로 HTTP Basic 자격 증명을 인증합니다."""
+        return auth.authenticate_basic(authorization, settings=self.settings)
+
+    async def authenticate_basic_async(self, authorization: Optional[str]) -> Optional[str]:
+        """realm에 설정된 인증 백엔드로 HTTP Basic 자격 증명을 인증합니다."""
+        return await auth.authenticate_basic_async(authorization, settings=self.settings)
+
+    def verify_service_token(self, token: Optional[str], path: str) -> Optional[str]:
+        """realm에 등록된 서비스 토큰을 검증합니다."""
+        return verify_service_token(token, path, settings=self.settings)
+
+    def issue_service_token(self, name: str, paths: Optional[List[str]] = None) -> str:
+        """realm에 서비스 토큰을 발급합니다."""
+        return issue_service_token(name, paths, settings=self.settings)
+
+    def create_auth_cookie(self, username: str) -> Tuple[str, Dict[str, str]]:
+        """realm 키로 서명된 인증 쿠키를 생성합니다."""
+        return auth.create_auth_cookie(username, settings=self.settings, secret_key=self.secret_key)
+
+    def decode_auth_cookie(self, cookie_value: Optional[str]) -> Optional[Dict[str, Any]]:
+        """realm 키로 인증 쿠키를 검증하고 클레임을 반환합니다."""
+        return auth.decode_auth_cookie(cookie_value, secret_key=self.secret_key, settings=self.settings)
+
+    def verify_auth_cookie(self, cookie_value: Optional[str]) -> Optional[str]:
+        """realm 키로 인증 쿠키를 확인합니다."""
+        return auth.verify_auth_cookie(cookie_value, secret_key=self.secret_key, settings=self.settings)
+
+    def get_jwks(self) -> Dict[str, Any]:
+        """realm의 JWT 공개 키 집합(JWKS)을 반환합니다."""
+        return get_jwks(self.settings, self.secret_key)
+
+    def is_path_allowed(self, roles: List[str], path: str) -> bool:
+        """realm의 역할 규칙에 따라 경로 접근이 허용되는지 확인합니다."""
+        return is_path_allowed(roles, path, settings=self.settings)
+
+    def is_path_protected(self, path: str) -> bool:
+        """주어진 경로가 이 realm의 보호 대상인지 확인합니다."""
+        return auth.is_path_protected(path, settings=self.settings)
+
+    def get_last_seen(self, username: str) -> Optional[float]:
+        """realm 사용자가 마지막으로 접근한 시각(epoch 초)을 반환합니다."""
+        return get_activity_tracker(self.settings).get_last_seen(username)
+
+    def active_users(self, within_seconds: float = 86400) -> Dict[str, float]:
+        """최근 within_seconds 안에 접근한 realm 사용자와 마지막 접근 시각을 반환합니다."""
+        return get_activity_tracker(self.settings).active_users(within_seconds)
+
+
+class RealmMatcher:
+    """
+    여러 realm의 보호 경로를 하나의 정규식으로 컴파일하여
+    요청 경로를 한 번의 매칭으로 해당 realm에 배정합니다.
+
+    더 긴 접두사가 먼저 매칭되므로 `/docs`와 `/docs/partner`처럼 겹치는 경로는
+    더 구체적인 쪽의 realm이 선택됩니다.
+
+    같은 쿠키 이름을 쓰는 realm은 서로의 인증 쿠키를 덮어쓰므로 함께 등록할 수 없습니다.
+    """
+
+    def __init__(self, realms: Sequence[SwagGuardRealm]):
+        self.realms = list(realms)
+        self._versions: Tuple[int, ...] = ()
+        self._pattern: Optional[Pattern[str]] = None
+        self._targets: List[Optional[SwagGuardRealm]] = []
+        self._compile()
+
+    def _compile(self):
+        """realm별 보호 경로를 정규식 하나로 컴파일합니다."""
+        cookies: Dict[str, SwagGuardRealm] = {}
+        owners: Dict[str, SwagGuardRealm] = {}
+        for realm in self.realms:
+            cookie_name = realm.get("cookie_name")
+            holder = cookies.get(cookie_name)
+            if holder is not None and holder is not realm:
+                raise ConfigurationError(
+                    f"쿠키 이름 {cookie_name!r}가 realm {holder.name!r}와 {realm.name!r}에 중복 사용되었습니다."
+                )
+            cookies[cookie_name] = realm
+            for prefix in realm.get("protected_paths", []):
+                owner = owners.get(prefix)
+                if owner is not None and owner is not realm:
+                    raise ConfigurationError(
+                        f"보호 경로 {prefix!r}가 realm {owner.name!r}와 {realm.name!r}에 중복 등록되었습니다."
+                    )
+                owners[prefix] = realm
+
+        prefixes = sorted(owners, key=len, reverse=True)
+        # 그룹 번호(lastindex)가 곧 대상 realm의 인덱스가 됩니다. (0번은 사용하지 않음)
+        self._targets = [None] + [owners[prefix] for prefix in prefixes]
+        if prefixes:
+            self._pattern = re.compile("|".join(f"({re.escape(prefix)})" for prefix in prefixes))
+        else:
+            self._pattern = None
+        self._versions = tuple(realm.settings.version for realm in self.realms)
+
+    def match(self, path: str) -> Optional[SwagGuardRealm]:
+        """
+        요청 경로를 담당하는 realm을 찾습니다.
+
+        Args:
+            path: 요청 경로
+
+        Returns:
+            경로를 보호하는 realm, 보호 대상이 아니면 None
+        """
+        if tuple(realm.settings.version for realm in self.realms) != self._versions:
+            self._compile()
+        if self._pattern is None:
+            return None
+        matched = self._pattern.match(path)
+        if matched is None:
+            return None
+        return self._targets[matched.lastindex]
+
+
+_default_realm: Optional[SwagGuardRealm] = None
+
+
+def default_realm() -> SwagGuardRealm:
+    """
+    전역 config와 SECRET_KEY를 그대로 사용하는 기본 realm을 반환합니다.
+
+    처음 호출될 때 전역 config의 초기 사용자 설정(setup_initial_users)을 수행합니다.
+    """
+    global _default_realm
+    if _default_realm is None:
+        setup_initial_users()
+        _default_realm = SwagGuardRealm("default", settings=config, secret_key=auth.SECRET_KEY)
+    return _default_realm
+
+
+@contextlib.contextmanager
+def override_default_realm(realm: SwagGuardRealm) -> Iterator[SwagGuardRealm]:
+    """
+    블록 안에서 default_realm()이 주어진 realm을 반환하도록 합니다.
+
+    realms 없이 등록된 미들웨어와 로그인 라우터를 전역 config 대신 별도의 realm으로 실행할 때 사용합니다.
+    미들웨어는 첫 요청에서 생성되므로 요청을 처리하는 동안에도 블록 안에 있어야 합니다.
+    """
+    global _default_realm
+    previous = _default_realm
+    _default_realm = realm
+    try:
+        yield realm
+    finally:
+        _default_realm = previous
@@ -0,0 +1,436 @@
+import asyncio
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from ..backends.base import StateBackend, Value, to_bytes
+from ..config import config, SwagGuardSettings
+from ..exceptions.AuthExceptions import AuthBackendError, BackendUnavailableError, StateBackendError
+from .credentials import CredentialCache
+
+
+# 백엔드 장애 시 정책
+FAIL_CLOSED = "fail_closed"  # 요청을 거부(인증 실패 또는 예외 전파)
+FAIL_OPEN = "fail_open"  # 백엔드 결과가 없는 것으로 간주하고 계속 진행
+LAST_KNOWN_GOOD = "last_known_good"  # 마지막으로 확인된 로컬 값을 사용
+
+POLICIES = (FAIL_CLOSED, FAIL_OPEN, LAST_KNOWN_GOOD)
+
+# 작업별로 허용되는 정책 (인증에 fail_open을 허용하면 장애 중 모든 자격 증명이 통과됨)
+ALLOWED_POLICIES: Dict[str, Tuple[str, ...]] = {
+    "authenticate": (FAIL_CLOSED, LAST_KNOWN_GOOD),
+}
+
+DEFAULT_POLICIES: Dict[str, str] = {
+    "authenticate": LAST_KNOWN_GOOD,
+    "state_read": LAST_KNOWN_GOOD,
+    "state_write": LAST_KNOWN_GOOD,
+}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    외부 백엔드 호출에 기한(deadline)과 회로 차단을 적용하는 차단기
+
+    연속 실패가 failure_threshold에 도달하면 회로가 열리고(open), reset_timeout 동안
+    호출을 보내지 않고 즉시 BackendUnavailableError를 발생시킵니다.
+    이후 호출 하나만 시험(half-open)으로 보내 성공하면 닫히고, 실패하면 다시 열립니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        deadline: Optional[float] = 3.0
+    ):
+        """
+        Args:
+            name: 차단기 이름 (지표에 사용)
+            failure_threshold: 회로를 여는 연속 실패 수
+            reset_timeout: 열린 회로를 시험 호출로 전환하기까지의 시간 (초)
+            deadline: 호출 하나에 허용하는 최대 시간 (초, None이면 제한 없음)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.deadline = deadline
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.trips = 0
+        self.fallbacks = 0
+
+    def _allow(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def _record_success(self) -> None:
+        self.consecutive_failures = 0
+        if self.state != CLOSED:
+            self.state = CLOSED
+            self.opened_at = None
+
+    def _record_failure(self) -> None:
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.trips += 1
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    async def call(self, func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """
+        차단기를 거쳐 백엔드를 호출합니다.
+
+        Raises:
+            BackendUnavailableError: 회로가 열려 있거나 기한을 넘긴 경우
+            Exception: 백엔드가 발생시킨 예외 (실패로 기록된 뒤 그대로 전파)
+        """
+        if not self._allow():
+            self.rejected += 1
+            raise BackendUnavailableError(f"Circuit breaker '{self.name}' is open", breaker=self.name)
+
+        probe = self.state == HALF_OPEN
+        self.calls += 1
+        try:
+            result = await asyncio.wait_for(func(*args), self.deadline)
+        except asyncio.TimeoutError as e:
+            self.timeouts += 1
+            self._record_failure()
+            raise BackendUnavailableError(
+                f"Backend call through '{self.name}' exceeded {self.deadline}s deadline", breaker=self.name
+            ) from e
+        except Exception:
+            self._record_failure()
+            raise
+        finally:
+            if probe:
+                self._probing = False
+        self._record_success()
+        return result
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        차단기 지표를 반환합니다.
+
+        Returns:
+            state, trips, calls, failures, timeouts, rejected, fallbacks, consecutive_failures를 담은 딕셔너리
+        """
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            state = HALF_OPEN
+        else:
+            state = self.state
+        return {
+            "state": state,
+            "trips": self.trips,
+            "calls": self.calls,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "fallbacks": self.fallbacks,
+            "consecutive_failures": self.consecutive_failures,
+        }
+
+
+_breakers: "weakref.WeakKeyDictionary[SwagGuardSettings, Dict[str, CircuitBreaker]]" = weakref.WeakKeyDictionary()
+
+
+def get_breaker(name: str, settings: Optional[SwagGuardSettings] = None) -> CircuitBreaker:
+    """
+    설정별 이름이 같은 차단기를 반환합니다. 처음 요청될 때 설정값으로 생성됩니다.
+
+    Args:
+        name: 차단기 이름 (예: auth_backend, state_backend)
+        settings: 사용할 설정 (기본값: 전역 config)
+
+    Returns:
+        CircuitBreaker 객체
+    """
+    settings = settings or config
+    breakers = _breakers.setdefault(settings, {})
+    failure_threshold = settings.get("breaker_failure_threshold", 5)
+    reset_timeout = settings.get("breaker_reset_seconds", 30)
+    deadline = settings.get("backend_deadline_seconds", 3.0)
+    breaker = breakers.get(name)
+    if breaker is None:
+        breaker = CircuitBreaker(name, failure_threshold=failure_threshold, reset_timeout=reset_timeout, deadline=deadline)
+        breakers[name] = breaker
+    else:
+        # 설정이 바뀌었으면 상태와 지표는 유지하고 기준값만 갱신
+        breaker.failure_threshold = failure_threshold
+        breaker.reset_timeout = reset_timeout
+        breaker.deadline = deadline
+    return breaker
+
+
+def get_breaker_metrics(settings: Optional[SwagGuardSettings] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    설정에 속한 모든 차단기의 지표를 반환합니다.
+
+    Args:
+        settings: 사용할 설정 (기본값: 전역 config)
+
+    Returns:
+        차단기 이름 -> 지표 딕셔너리
+    """
+    return {name: breaker.metrics() for name, breaker in _breakers.get(settings or config, {}).items()}
+
+
+def get_policies(settings: Optional[SwagGuardSettings] = None) -> Dict[str, str]:
+    """
+    작업(authenticate, state_read, state_write)별 장애 정책을 반환합니다.
+
+    backend_policies에 지정하지 않은 작업은 기본 정책을, 알 수 없는 값이나 작업에 허용되지 않는 값
+    (authenticate의 fail_open)은 fail_closed를 사용합니다.
+
+    Args:
+        settings: 사용할 설정 (기본값: 전역 config)
+
+    Returns:
+        작업 이름 -> fail_closed, fail_open, last_known_good 중 하나
+    """
+    settings = settings or config
+    policies = dict(DEFAULT_POLICIES)
+    policies.update(settings.get("backend_policies") or {})
+    return {
+        operation: policy if policy in ALLOWED_POLICIES.get(operation, POLICIES) else FAIL_CLOSED
+        for operation, policy in policies.items()
+    }
+
+
+class ResilientAuthBackend:
+    """
+    외부 인증 백엔드에 차단기와 장애 정책을 적용하는 래퍼
+
+    인증에 성공한 자격 증명은 last_known_good_seconds 동안 키 기반 HMAC 다이제스트로 보관되며,
+    백엔드를 사용할 수 없을 때 authenticate 정책이 last_known_good이면 이 기록으로 인증합니다.
+    """
+
+    def __init__(self, backend: Any, settings: Optional[SwagGuardSettings] = None):
+        """
+        Args:
+            backend: authenticate(username, password) 코루틴과 close()를 가진 백엔드
+            settings: 차단기와 정책을 읽을 설정 (기본값: 전역 config)
+        """
+        settings = settings or config
+        self.backend = backend
+        self.breaker = get_breaker("auth_backend", settings)
+        self.policy = get_policies(settings)["authenticate"]
+        self.last_known_good = CredentialCache(
+            ttl_seconds=settings.get("last_known_good_seconds", 3600), max_entries=10000
+        )
+        settings.add_user_listener(self.last_known_good.invalidate)
+
+    def detach(self, settings: SwagGuardSettings) -> None:
+        """교체된 백엔드가 설정의 사용자 변경 콜백으로 남아 있지 않도록 등록을 해제합니다."""
+        settings.remove_user_listener(self.last_known_good.invalidate)
+
+    async def authenticate(self, username: str, password: str) -> bool:
+        """
+        사용자를 인증합니다.
+
+        Returns:
+            인증 성공 시 True, 실패 시 False (fail_closed 정책에서 백엔드 장애 시에도 False)
+        """
+        try:
+            result = await self.breaker.call(self.backend.authenticate, username, password)
+        except (BackendUnavailableError, AuthBackendError):
+            if self.policy != LAST_KNOWN_GOOD:
+                return False
+            self.breaker.fallbacks += 1
+            return self.last_known_good.check(username, password)
+        if result:
+            self.last_known_good.store(username, password)
+        elif self.last_known_good.check(username, password):
+            # 보관된 자격 증명을 디렉터리가 거부했으면(비밀번호 변경, 계정 비활성화) 장애 중에도 받지 않음
+            # (다른 비밀번호의 실패로는 지우지 않아 잘못된 시도만으로 기록을 없앨 수 없도록 함)
+            self.last_known_good.invalidate(username)
+        return result
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+
+class ResilientBackend(StateBackend):
+    """
+    공유 상태 백엔드에 차단기와 장애 정책을 적용하는 래퍼
+
+    읽고 쓴 값은 로컬의 크기 제한 캐시에 마지막으로 확인된 값(last-known-good)으로 보관됩니다.
+    백엔드를 사용할 수 없으면 읽기(state_read)와 쓰기(state_write) 정책에 따라
+
+    - fail_closed: StateBackendError를 발생시킵니다.
+    - fail_open: 읽기는 값이 없는 것으로, 쓰기는 성공한 것으로 처리합니다.
+    - last_known_good: 로컬 캐시의 값으로 응답하고, 쓰기는 로컬 캐시에만 반영합니다.
+    """
+
+    def __init__(self, backend: StateBackend, settings: Optional[SwagGuardSettings] = None, max_entries: int = 10000):
+        """
+        Args:
+            backend: 감쌀 상태 백엔드
+            settings: 차단기와 정책을 읽을 설정 (기본값: 전역 config)
+            max_entries: 로컬 캐시의 최대 항목 수
+        """
+        settings = settings or config
+        self.backend = backend
+        self.breaker = get_breaker("state_backend", settings)
+        self.policies = get_policies(settings)
+        self.max_entries = max_entries
+        self.max_age = settings.get("last_known_good_seconds", 3600)
+        self._values: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._values[key] = (value, time.monotonic())
+        self._values.move_to_end(key)
+        while len(self._values) > self.max_entries:
+            self._values.popitem(last=False)
+
+    def _recall(self, key: str, default: Any = None) -> Any:
+        entry = self._values.get(key)
+        if entry is None or time.monotonic() - entry[1] > self.max_age:
+            return default
+        return entry[0]
+
+    async def call_strict(self, method: str, *args: Any) -> Any:
+        """
+        차단기를 거쳐 원본 백엔드의 메서드를 호출하되 장애 정책(로컬 대체 응답)을 적용하지 않습니다.
+
+        대체 응답을 성공으로 착각하면 안 되는 호출자(예: 세대 번호 동기화)가 사용합니다.
+
+        Raises:
+            BackendUnavailableError: 회로가 열려 있거나 기한을 넘긴 경우
+            StateBackendError: 백엔드를 사용할 수 없는 경우
+        """
+        return await self.breaker.call(getattr(self.backend, method), *args)
+
+    def _fallback(self, operation: str, error: Exception, last_known_good: Callable[[], Any], default: Any) -> Any:
+        policy = self.policies[operation]
+        if policy == FAIL_CLOSED:
+            if isinstance(error, StateBackendError):
+                raise error
+            raise StateBackendError(str(error)) from error
+        self.breaker.fallbacks += 1
+        if policy == LAST_KNOWN_GOOD:
+            return last_known_good()
+        return default
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            value = await self.breaker.call(self.backend.get, key)
+        except (BackendUnavailableError, StateBackendError) as e:
+            return self._fallback("state_read", e, lambda: self._recall(key), None)
+        self._remember(key, value)
+        return value
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        try:
+            values = await self.breaker.call(self.backend.get_many, keys)
+        except (BackendUnavailableError, StateBackendError) as e:
+            return self._fallback("state_read", e, lambda: [self._recall(key) for key in keys], [None] * len(keys))
+        for key, value in zip(keys, values):
+            self._remember(key, value)
+        return values
+
+    async def set(self, key: str, value: Value, ttl: Optional[float] = None) -> None:
+        self._remember(key, to_bytes(value))
+        try:
+            await self.breaker.call(self.backend.set, key, value, ttl)
+        except (BackendUnavailableError, StateBackendError) as e:
+            self._fallback("state_write", e, lambda: None, None)
+
+    async def set_many(self, mapping: Mapping[str, Value], ttl: Optional[float] = None) -> None:
+        for key, value in mapping.items():
+            self._remember(key, to_bytes(value))
+        try:
+            await self.breaker.call(self.backend.set_many, mapping, ttl)
+        except (BackendUnavailableError, StateBackendError) as e:
+            self._fallback("state_write", e, lambda: None, None)
+
+    async def delete(self, *keys: str) -> int:
+        for key in keys:
+            self._values.pop(key, None)
+        try:
+            return await self.breaker.call(self.backend.delete, *keys)
+        except (BackendUnavailableError, StateBackendError) as e:
+            return self._fallback("state_write", e, lambda: 0, 0)
+
+    async def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        try:
+            value = await self.breaker.call(self.backend.incr, key, amount, ttl)
+        except (BackendUnavailableError, StateBackendError) as e:
+            def local_incr() -> int:
+                value = int(self._recall(key, b"0")) + amount
+                self._remember(key, to_bytes(value))
+                return value
+            return self._fallback("state_write", e, local_incr, amount)
+        self._remember(key, to_bytes(value))
+        return value
+
+    async def hget_all(self, key: str) -> Dict[str, bytes]:
+        try:
+            value = await self.breaker.call(self.backend.hget_all, key)
+        except (BackendUnavailableError, StateBackendError) as e:
+            return self._fallback("state_read", e, lambda: dict(self._recall(key, {})), {})
+        self._remember(key, value)
+        return value
+
+    async def hset_many(self, key: str, mapping: Mapping[str, Value]) -> None:
+        cached = dict(self._recall(key, {}))
+        cached.update((field, to_bytes(value)) for field, value in mapping.items())
+        self._remember(key, cached)
+        try:
+            await self.breaker.call(self.backend.hset_many, key, mapping)
+        except (BackendUnavailableError, StateBackendError) as e:
+            self._fallback("state_write", e, lambda: None, None)
+
+    async def hincr(self, key: str, field: str, amount: int = 1) -> int:
+        try:
+            value = await self.breaker.call(self.backend.hincr, key, field, amount)
+        except (BackendUnavailableError, StateBackendError) as e:
+            def local_hincr() -> int:
+                cached = dict(self._recall(key, {}))
+                value = int(cached.get(field, b"0")) + amount
+                cached[field] = to_bytes(value)
+                self._remember(key, cached)
+                return value
+            return self._fallback("state_write", e, local_hincr, amount)
+        cached = dict(self._recall(key, {}))
+        cached[field] = to_bytes(value)
+        self._remember(key, cached)
+        return value
+
+    async def hmax(self, key: str, field: str, value: int) -> int:
+        try:
+            result = await self.breaker.call(self.backend.hmax, key, field, value)
+        except (BackendUnavailableError, StateBackendError) as e:
+            def local_hmax() -> int:
+                cached = dict(self._recall(key, {}))
+                result = max(int(cached.get(field, b"0")), value)
+                cached[field] = to_bytes(result)
+                self._remember(key, cached)
+                return result
+            return self._fallback("state_write", e, local_hmax, value)
+        cached = dict(self._recall(key, {}))
+        cached[field] = to_bytes(result)
+        self._remember(key, cached)
+        return result
+
+    async def close(self) -> None:
+        await self.backend.close()
@@ -0,0 +1,334 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from ..config import config, SwagGuardSettings
+
+
+HTTP_METHODS = {"get", "put", "post", "delete", "options", "head", "patch", "trace"}
+
+
+class SchemaVariant:
+    """직렬화 및 압축이 끝난 OpenAPI 스키마 변형"""
+
+    __slots__ = ("body", "gzip_body", "etag")
+
+    def __init__(self, schema: Dict[str, Any]):
+        self.body = json.dumps(schema, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        self.gzip_body = gzip.compress(self.body, compresslevel=6, mtime=0)
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:32] + '"'
+
+
+def _iter_refs(node: Any) -> Iterator[str]:
+    """스키마 노드에 포함된 모든 $ref 값을 순회합니다."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            ref = current.get("$ref")
+            if isinstance(ref, str):
+                yield ref
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            stack.extend(current)
+
+
+def _view_rules(roles: Iterable[str], rules: Dict[str, Dict[str, Any]]) -> Optional[Tuple[Set[str], List[str]]]:
+    """
+    역할 목록에 대한 스키마 필터 조건(허용 태그, 허용 API 경로 접두사)을 계산합니다.
+
+    Returns:
+        (허용 태그 집합, 허용 경로 접두사 목록), 제한이 없는 역할이 하나라도 있으면 None
+    """
+    tags: Set[str] = set()
+    prefixes: List[str] = []
+    for role in roles:
+        rule = rules.get(role)
+        if rule is None:
+            continue
+        if "tags" not in rule and "schema_paths" not in rule:
+            return None
+        tags.update(rule.get("tags", []))
+        prefixes.extend(rule.get("schema_paths", []))
+    return tags, prefixes
+
+
+def filter_schema(schema: Dict[str, Any], tags: Set[str], prefixes: List[str]) -> Dict[str, Any]:
+    """
+    태그 또는 API 경로 접두사에 해당하는 오퍼레이션만 남긴 스키마를 생성합니다.
+
+    남은 오퍼레이션에서 참조하지 않는 components.schemas 항목도 함께 제거합니다.
+
+    Args:
+        schema: 원본 OpenAPI 스키마
+        tags: 허용할 태그 집합
+        prefixes: 허용할 API 경로 접두사 목록
+
+    Returns:
+        필터링된 스키마 (원본은 변경하지 않음)
+    """
+    paths: Dict[str, Any] = {}
+    used_tags: Set[str] = set()
+    for path, item in schema.get("paths", {}).items():
+        path_visible = any(path.startswith(prefix) for prefix in prefixes)
+        operations = {}
+        for method, operation in item.items():
+            if method not in HTTP_METHODS:
+                continue
+            operation_tags = set(operation.get("tags", []))
+            if path_visible or operation_tags & tags:
+                operations[method] = operation
+                used_tags.update(operation_tags)
+        if operations:
+            shared = {key: value for key, value in item.items() if key not in HTTP_METHODS}
+            paths[path] = {**shared, **operations}
+
+    filtered = {key: value for key, value in schema.items() if key not in ("paths", "components", "tags")}
+    filtered["paths"] = paths
+    if "tags" in schema:
+        filtered["tags"] = [tag for tag in schema["tags"] if tag.get("name") in used_tags]
+
+    components = schema.get("components")
+    if components:
+        component_schemas = components.get("schemas", {})
+        reachable: Set[str] = set()
+        pending = list(_iter_refs(paths))
+        while pending:
+            ref = pending.pop()
+            name = ref.rsplit("/", 1)[-1]
+            if ref.startswith("#/components/schemas/") and name not in reachable and name in component_schemas:
+                reachable.add(name)
+                pending.extend(_iter_refs(component_schemas[name]))
+        filtered["components"] = dict(components)
+        if "schemas" in components:
+            filtered["components"]["schemas"] = {
+                name: value for name, value in component_schemas.items() if name in reachable
+            }
+
+    return filtered
+
+
+class SchemaViews:
+    """
+    역할별 OpenAPI 스키마 변형을 한 번만 생성하여 캐시합니다.
+
+    변형은 원본 스키마 객체별로 나누어 보관하므로 같은 설정을 공유하는 여러 앱이 서로의
+    변형을 폐기하지 않습니다. 설정 버전이 바뀌면 모든 변형이 폐기되고 다시 생성되며,
+    원본 스키마는 최근에 사용된 MAX_BASES개까지만 유지합니다.
+    """
+
+    MAX_BASES = 8
+
+    def __init__(self, settings: SwagGuardSettings):
+        self.settings = settings
+        self._version = -1
+        # id(원본 스키마) -> (원본 스키마, 역할 키 -> 변형)
+        self._bases: "OrderedDict[int, Tuple[Dict[str, Any], Dict[Any, SchemaVariant]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _lookup_key(self, base_schema: Dict[str, Any], roles: Optional[Iterable[str]]):
+        """원본 스키마에 대한 변형 딕셔너리, 그 시점의 설정 버전, 역할에 대한 필터 조건과 캐시 키를 반환합니다."""
+        with self._lock:
+            version = self.settings.version
+            if version != self._version:
+                self._bases.clear()
+                self._version = version
+            entry = self._bases.get(id(base_schema))
+            # 해제된 원본 스키마의 id가 재사용되었을 수 있으므로 같은 객체인지 확인
+            if entry is None or entry[0] is not base_schema:
+                entry = (base_schema, {})
+                self._bases[id(base_schema)] = entry
+                while len(self._bases) > self.MAX_BASES:
+                    self._bases.popitem(last=False)
+            else:
+                self._bases.move_to_end(id(base_schema))
+            variants = entry[1]
+
+        rules = None if roles is None else _view_rules(roles, self.settings.get("role_rules", {}))
+        key = None if rules is None else (frozenset(rules[0]), tuple(sorted(rules[1])))
+        return variants, version, rules, key
+
+    def lookup(self, base_schema: Dict[str, Any], roles: Optional[Iterable[str]] = None) -> Optional[SchemaVariant]:
+        """이미 생성된 변형이 있으면 반환합니다. 없으면 생성하지 않고 None을 반환합니다."""
+        variants, _, _, key = self._lookup_key(base_schema, roles)
+        return variants.get(key)
+
+    def get(self, base_schema: Dict[str, Any], roles: Optional[Iterable[str]] = None) -> SchemaVariant:
+        """
+        역할에 맞는 스키마 변형을 반환합니다.
+
+        Args:
+            base_schema: 원본 OpenAPI 스키마 (FastAPI.openapi()의 결과)
+            roles: 사용자 역할 목록 (None이면 전체 스키마)
+
+        Returns:
+            SchemaVariant 객체
+        """
+        variants, version, rules, key = self._lookup_key(base_schema, roles)
+        variant = variants.get(key)
+        if variant is None:
+            schema = base_schema if rules is None else filter_schema(base_schema, *rules)
+            variant = SchemaVariant(schema)
+            with self._lock:
+                # 생성하는 동안 설정이 바뀌었거나 원본 스키마가 밀려났으면 오래된 변형을 저장하지 않음
+                entry = self._bases.get(id(base_schema))
+                if (
+                    version == self._version == self.settings.version
+                    and entry is not None and entry[1] is variants
+                ):
+                    variants[key] = variant
+        return variant
+
+
+_views: "weakref.WeakKeyDictionary[SwagGuardSettings, SchemaViews]" = weakref.WeakKeyDictionary()
+
+
+def get_schema_views(settings: Optional[SwagGuardSettings] = None) -> SchemaViews:
+    """
+    설정별 스키마 변형 캐시를 반환합니다.
+
+    Args:
+        settings: 사용할 설정 (기본값: 전역 config)
+
+    Returns:
+        SchemaViews 객체
+    """
+    settings = settings or config
+    views = _views.get(settings)
+    if views is None:
+        views = SchemaViews(settings)
+        _views[settings] = views
+    return views
+
+
+class SchemaSnapshot:
+    """
+    빌드 시점에 미리 생성한 OpenAPI 스키마 스냅샷 파일
+
+    파일은 읽기 전용으로 메모리 매핑되므로 fork된 워커들이 같은 페이지 캐시를 공유하며,
+    응답 본문은 복사 없이 매핑된 메모리를 그대로 사용합니다.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: write_schema_snapshot으로 생성한 스냅샷 파일 경로
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.body = memoryview(self._mmap)
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:32] + '"'
+        self._schema: Optional[Dict[str, Any]] = None
+
+    def schema(self) -> Dict[str, Any]:
+        """스냅샷을 딕셔너리로 파싱합니다. (처음 호출 시 한 번만 파싱)"""
+        if self._schema is None:
+            self._schema = json.loads(self.body.tobytes())
+        return self._schema
+
+
+def write_schema_snapshot(app: Any, path: str) -> None:
+    """
+    애플리케이션의 OpenAPI 스키마를 스냅샷 파일로 저장합니다. (빌드 시점에 사용)
+
+    Args:
+        app: FastAPI 애플리케이션
+        path: 저장할 파일 경로
+    """
+    body = json.dumps(app.openapi(), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(body)
+    os.replace(temp_path, path)
+
+
+class OpenAPISchemaCache:
+    """
+    FastAPI의 지연 스키마 생성을 대신하는 단일 실행(single-flight) 스키마 캐시
+
+    app.openapi를 감싸서 동시에 여러 요청이 들어와도 스키마는 한 번만 생성되며,
+    warm()으로 스레드에서 미리 생성해 첫 요청의 지연을 없앨 수 있습니다.
+    스냅샷이 지정되면 스키마를 생성하지 않고 스냅샷을 사용합니다.
+
+    생성한 스키마는 FastAPI와 같이 app.openapi_schema에 보관하므로
+    app.openapi_schema = None(또는 invalidate())으로 초기화하면 다음 요청에서 다시 생성합니다.
+    """
+
+    def __init__(self, app: Any, snapshot_path: Optional[str] = None):
+        """
+        Args:
+            app: FastAPI 애플리케이션
+            snapshot_path: 빌드 시점에 생성한 스냅샷 파일 경로
+        """
+        self.app = app
+        self.snapshot = SchemaSnapshot(snapshot_path) if snapshot_path else None
+        self._build: Callable[[], Dict[str, Any]] = self.snapshot.schema if self.snapshot else app.openapi
+        self._lock = threading.Lock()
+        self._task: Optional["asyncio.Task[Dict[str, Any]]"] = None
+        app.openapi = self.openapi
+
+    @property
+    def ready(self) -> bool:
+        """스키마가 이미 생성되었는지 여부"""
+        return getattr(self.app, "openapi_schema", None) is not None
+
+    def openapi(self) -> Dict[str, Any]:
+        """스키마를 반환합니다. 아직 없으면 한 번만 생성합니다."""
+        schema = getattr(self.app, "openapi_schema", None)
+        if schema is None:
+            with self._lock:
+                schema = getattr(self.app, "openapi_schema", None)
+                if schema is None:
+                    schema = self._build()
+                    self.app.openapi_schema = schema
+        return schema
+
+    def invalidate(self) -> None:
+        """생성된 스키마를 폐기하여 다음 요청에서 다시 생성하도록 합니다. (런타임에 경로를 추가한 경우)"""
+        self.app.openapi_schema = None
+
+    async def warm(self) -> Dict[str, Any]:
+        """
+        이벤트 루프를 막지 않도록 스레드에서 스키마를 생성합니다.
+
+        동시에 여러 번 호출되어도 진행 중인 생성 작업 하나를 함께 기다립니다.
+        생성이 실패하면 기다리던 호출에 예외가 전달되고, 다음 호출은 생성을 다시 시도합니다.
+        """
+        schema = getattr(self.app, "openapi_schema", None)
+        if schema is not None:
+            return schema
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(asyncio.get_running_loop().run_in_executor(None, self.openapi))
+            self._task.add_done_callback(self._discard_failed)
+        return await asyncio.shield(self._task)
+
+    def _discard_failed(self, task: "asyncio.Future[Dict[str, Any]]") -> None:
+        """실패한 생성 작업을 버려서 다음 warm() 호출이 다시 생성하도록 합니다."""
+        if self._task is task and (task.cancelled() or task.exception() is not None):
+            self._task = None
+
+
+def get_schema_cache(app: Any, snapshot_path: Optional[str] = None) -> OpenAPISchemaCache:
+    """
+    애플리케이션의 스키마 캐시를 반환합니다. 없으면 생성하여 app.state에 보관합니다.
+
+    Args:
+        app: FastAPI 애플리케이션
+        snapshot_path: 빌드 시점에 생성한 스냅샷 파일 경로
+
+    Returns:
+        OpenAPISchemaCache 객체
+    """
+    cache = getattr(app.state, "swaguard_schema_cache", None)
+    if cache is None:
+        cache = OpenAPISchemaCache(app, snapshot_path)
+        app.state.swaguard_schema_cache = cache
+    return cache
@@ -0,0 +1,414 @@
+import contextlib
+import functools
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import weakref
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from ..config import config, SwagGuardSettings
+from ..exceptions.AuthExceptions import ConfigurationError
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+MAGIC = b"SWGSHM03"
+HEADER = struct.Struct("<8sIII")  # magic, version, slots, counters
+HEADER_SIZE = 64
+SLOT = struct.Struct("<16sdI4x")  # fingerprint, expires_at, checksum
+EMPTY_SLOT = bytes(SLOT.size)
+COUNTER = struct.Struct("<16sq")  # key digest, value
+EMPTY_KEY = bytes(16)
+MAX_PROBES = 8
+
+
+def _checksum(fingerprint: bytes, expires_at: float) -> int:
+    # 0은 빈 슬롯을 나타내므로 유효한 체크섬은 항상 0이 아닙니다.
+    return zlib.crc32(fingerprint + struct.pack("<d", expires_at)) or 1
+
+
+@functools.lru_cache(maxsize=64)
+def _fingerprint_key(secret_key: str) -> bytes:
+    return hashlib.sha256(b"swaguard-session-fingerprint\x00" + secret_key.encode("utf-8")).digest()
+
+
+def session_fingerprint(secret_key: str, cookie_value: str) -> bytes:
+    """
+    쿠키 값의 키 기반 지문(blake2b, 16바이트)을 계산합니다.
+
+    지문에는 서명 키가 섞이므로 다른 키(realm)로 검증된 쿠키와 겹치지 않습니다.
+    """
+    return hashlib.blake2b(
+        cookie_value.encode("utf-8"), key=_fingerprint_key(secret_key), digest_size=16
+    ).digest()
+
+
+class SharedMemoryTier:
+    """
+    같은 호스트의 워커 프로세스들이 공유하는 메모리 매핑 세션 테이블
+
+    검증된 쿠키 지문과 만료 시각을 담는 고정 크기 오픈 어드레싱 해시 테이블입니다.
+    읽기와 쓰기 모두 잠금 없이 수행하며, 슬롯마다 체크섬을 두어 동시 쓰기나 쓰는 도중
+    종료된 워커 때문에 찢어진(torn) 슬롯은 빈 것으로 취급하고 덮어씁니다.
+
+    세션 테이블 뒤에는 워커들이 함께 증가시키는 카운터 슬롯이 있습니다. 카운터는 파일 잠금을
+    잡은 상태에서 읽고 쓰므로 여러 워커가 동시에 증가시켜도 값이 유실되지 않습니다.
+
+    테이블은 /dev/shm(없으면 임시 디렉터리)의 파일을 MAP_SHARED로 매핑하므로
+    워커가 비정상 종료되어도 다른 워커는 영향을 받지 않습니다.
+    """
+
+    def __init__(self, path: str, slots: int = 65536, counters: int = 1024):
+        """
+        Args:
+            path: 공유 메모리 파일 경로
+            slots: 세션 테이블 슬롯 수
+            counters: 카운터 슬롯 수 (서로 다른 카운터 이름의 최대 개수)
+        """
+        if fcntl is None:
+            raise ConfigurationError("공유 메모리 계층은 POSIX 시스템에서만 사용할 수 있습니다.")
+        self.path = path
+        self.slots = slots
+        self.counters = counters
+        self._slots_offset = HEADER_SIZE
+        self._counters_offset = HEADER_SIZE + slots * SLOT.size
+        self.size = self._counters_offset + counters * COUNTER.size
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._fd_pid = os.getpid()
+        with self._locked():
+            if os.fstat(self._fd).st_size < self.size:
+                os.ftruncate(self._fd, self.size)
+            self._map = mmap.mmap(self._fd, self.size, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+            if self._map[:len(MAGIC)] != MAGIC:
+                self._map[:self.size] = bytes(self.size)
+                HEADER.pack_into(self._map, 0, MAGIC, 1, slots, counters)
+            elif HEADER.unpack_from(self._map, 0)[2:] != (slots, counters):
+                raise ConfigurationError(f"공유 메모리 파일의 크기 설정이 다릅니다: {path}")
+
+        # flock은 같은 프로세스의 스레드끼리는 배제하지 않으므로 스레드 잠금을 함께 사용합니다.
+        self._thread_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.torn = 0
+        self.evictions = 0
+
+    @classmethod
+    def default_path(cls, name: str, slots: int, counters: int = 1024) -> str:
+        """이름과 크기 설정으로 공유 메모리 파일 경로를 만듭니다."""
+        directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+        uid = os.getuid() if hasattr(os, "getuid") else 0
+        return os.path.join(directory, f"swaguard-{uid}-{name}-{slots}x{counters}")
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        """다른 프로세스와 공유하는 파일 잠금을 잡습니다. (파일 초기화와 카운터 갱신에 사용)"""
+        if self._fd_pid != os.getpid():
+            # flock은 열린 파일 단위이므로 fork된 자식은 파일을 다시 열어야 부모와 서로 배제됩니다.
+            self._fd = os.open(self.path, os.O_RDWR)
+            self._fd_pid = os.getpid()
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _read_slot(self, index: int) -> Optional[Tuple[bytes, float]]:
+        raw = self._map[self._slots_offset + index * SLOT.size:self._slots_offset + (index + 1) * SLOT.size]
+        if raw == EMPTY_SLOT:
+            return None
+        fingerprint, expires_at, checksum = SLOT.unpack(raw)
+        if checksum != _checksum(fingerprint, expires_at):
+            self.torn += 1
+            return b"", 0.0
+        return fingerprint, expires_at
+
+    def contains(self, fingerprint: bytes, now: Optional[float] = None) -> bool:
+        """
+        만료되지 않은 지문이 테이블에 있는지 확인합니다.
+
+        Args:
+            fingerprint: session_fingerprint()로 계산한 지문
+            now: 기준 시각 (기본값: 현재 시각)
+        """
+        now = time.time() if now is None else now
+        start = int.from_bytes(fingerprint[:8], "little") % self.slots
+        for probe in range(MAX_PROBES):
+            slot = self._read_slot((start + probe) % self.slots)
+            if slot is None:
+                break
+            if slot[0] == fingerprint:
+                if slot[1] > now:
+                    self.hits += 1
+                    return True
+                break
+        self.misses += 1
+        return False
+
+    def add(self, fingerprint: bytes, expires_at: float, now: Optional[float] = None) -> None:
+        """
+        검증된 쿠키의 지문을 기록합니다.
+
+        탐색 구간에 같은 지문, 빈 슬롯, 만료되었거나 찢어진 슬롯이 없으면 가장 먼저 만료되는 슬롯을 덮어씁니다.
+
+        Args:
+            fingerprint: session_fingerprint()로 계산한 지문
+            expires_at: 만료 시각 (epoch 초)
+            now: 기준 시각 (기본값: 현재 시각)
+        """
+        now = time.time() if now is None else now
+        start = int.from_bytes(fingerprint[:8], "little") % self.slots
+        target = None
+        earliest = None
+        for probe in range(MAX_PROBES):
+            index = (start + probe) % self.slots
+            slot = self._read_slot(index)
+            if slot is None or slot[0] == fingerprint or slot[1] <= now:
+                target = index
+                break
+            if earliest is None or slot[1] < earliest[1]:
+                earliest = (index, slot[1])
+        if target is None:
+            target = earliest[0]
+            self.evictions += 1
+        offset = self._slots_offset + target * SLOT.size
+        self._map[offset:offset + SLOT.size] = SLOT.pack(fingerprint, expires_at, _checksum(fingerprint, expires_at))
+
+    def _counter_offset(self, key: str, create: bool) -> Optional[int]:
+        """카운터 이름의 슬롯 위치를 찾습니다. 잠금을 잡은 상태에서 호출해야 합니다."""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        start = int.from_bytes(digest[:8], "little") % self.counters
+        for probe in range(self.counters):
+            offset = self._counters_offset + (start + probe) % self.counters * COUNTER.size
+            stored = self._map[offset:offset + 16]
+            if stored == digest:
+                return offset
+            if stored == EMPTY_KEY:
+                if not create:
+                    return None
+                COUNTER.pack_into(self._map, offset, digest, 0)
+                return offset
+        if create:
+            raise ConfigurationError(f"공유 카운터 슬롯({self.counters}개)이 모두 사용 중입니다.")
+        return None
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        """
+        모든 워커가 공유하는 카운터를 원자적으로 증가시키고 증가된 값을 반환합니다.
+
+        Args:
+            key: 카운터 이름
+            amount: 증가량
+
+        Returns:
+            증가 후 값
+
+        Raises:
+            ConfigurationError: 새 카운터를 만들 빈 슬롯이 없는 경우
+        """
+        with self._thread_lock, self._locked():
+            offset = self._counter_offset(key, create=True)
+            value = COUNTER.unpack_from(self._map, offset)[1] + amount
+            struct.pack_into("<q", self._map, offset + 16, value)
+        return value
+
+    def count(self, key: str) -> int:
+        """카운터의 현재 값을 반환합니다. 없는 카운터는 0입니다."""
+        with self._thread_lock, self._locked():
+            offset = self._counter_offset(key, create=False)
+            return 0 if offset is None else COUNTER.unpack_from(self._map, offset)[1]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        현재 프로세스의 세션 테이블 지표를 반환합니다.
+
+        Returns:
+            hits, misses, hit_rate, torn, evictions를 담은 딕셔너리
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "torn": self.torn,
+            "evictions": self.evictions,
+        }
+
+    def close(self) -> None:
+        """매핑과 파일을 닫습니다. 공유 메모리 파일은 다른 워커를 위해 남겨 둡니다."""
+        self._map.close()
+        os.close(self._fd)
+
+
+class SessionCache:
+    """
+    검증된 인증 쿠키의 클레임을 보관하는 프로세스별 LRU 캐시
+
+    공유 메모리 계층이 설정되면 LRU에서 찾지 못한 쿠키를 공유 테이블에서 확인하므로,
+    다른 워커가 이미 검증한 쿠키는 서명 검증 없이 클레임만 해석합니다.
+    """
+
+    def __init__(self, max_entries: int = 4096, shared: Optional[SharedMemoryTier] = None):
+        """
+        Args:
+            max_entries: 프로세스별 LRU 최대 항목 수
+            shared: 공유 메모리 계층 (None이면 프로세스별 캐시만 사용)
+        """
+        self.max_entries = max_entries
+        self.shared = shared
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        secret_key: str,
+        cookie_value: str,
+        parse: Callable[[str], Optional[Dict[str, Any]]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        캐시에서 쿠키의 클레임을 찾습니다.
+
+        Args:
+            secret_key: 쿠키를 검증한 서명 키
+            cookie_value: 쿠키 값
+            parse: 공유 테이블에서 찾은 쿠키의 클레임을 서명 검증 없이 해석하는 함수
+
+        Returns:
+            클레임 딕셔너리 (없거나 만료되었으면 None)
+        """
+        now = time.time()
+        key = (secret_key, cookie_value)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[1] > now:
+                self.hits += 1
+                with self._lock:
+                    if key in self._entries:
+                        self._entries.move_to_end(key)
+                return entry[0]
+            with self._lock:
+                self._entries.pop(key, None)
+
+        if self.shared is not None and self.shared.contains(session_fingerprint(secret_key, cookie_value), now):
+            claims = parse(cookie_value)
+            if claims is not None:
+                self.shared_hits += 1
+                self._store_local(key, claims, now)
+                return claims
+
+        self.misses += 1
+        return None
+
+    def put(self, secret_key: str, cookie_value: str, claims: Dict[str, Any]) -> None:
+        """
+        검증된 쿠키의 클레임을 캐시에 저장합니다. 만료 시각(exp)이 없는 쿠키는 저장하지 않습니다.
+
+        Args:
+            secret_key: 쿠키를 검증한 서명 키
+            cookie_value: 쿠키 값
+            claims: 검증된 클레임
+        """
+        if not isinstance(claims.get("exp"), (int, float)):
+            return
+        now = time.time()
+        self._store_local((secret_key, cookie_value), claims, now)
+        if self.shared is not None:
+            self.shared.add(session_fingerprint(secret_key, cookie_value), float(claims["exp"]), now)
+
+    def _store_local(self, key: Tuple[str, str], claims: Dict[str, Any], now: float) -> None:
+        expires_at = claims.get("exp", now)
+        if expires_at <= now or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (claims, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        캐시 지표를 반환합니다.
+
+        Returns:
+            hits, shared_hits, misses, hit_rate, size (공유 계층이 있으면 shared 지표 포함)
+        """
+        total = self.hits + self.shared_hits + self.misses
+        stats = {
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.shared_hits) / total if total else 0.0,
+            "size": len(self._entries),
+        }
+        if self.shared is not None:
+            stats["shared"] = self.shared.stats()
+        return stats
+
+
+_tiers: Dict[str, SharedMemoryTier] = {}
+_caches: "weakref.WeakKeyDictionary[SwagGuardSettings, Tuple[int, Optional[SessionCache]]]" = weakref.WeakKeyDictionary()
+
+
+def get_shared_tier(settings: Optional[SwagGuardSettings] = None) -> Optional[SharedMemoryTier]:
+    """
+    설정된 공유 메모리 계층을 반환합니다. 같은 파일을 사용하는 설정은 하나의 매핑을 공유합니다.
+
+    Args:
+        settings: 사용할 설정 (기본값: 전역 config)
+
+    Returns:
+        SharedMemoryTier 객체 (shared_cache_enabled가 꺼져 있으면 None)
+    """
+    settings = settings or config
+    if not settings.get("shared_cache_enabled", False):
+        return None
+    slots = settings.get("shared_cache_slots", 65536)
+    counters = settings.get("shared_cache_counters", 1024)
+    path = settings.get("shared_cache_path") or SharedMemoryTier.default_path(
+        settings.get("shared_cache_name", "default"), slots, counters
+    )
+    tier = _tiers.get(path)
+    if tier is None:
+        tier = SharedMemoryTier(path, slots=slots, counters=counters)
+        _tiers[path] = tier
+    return tier
+
+
+def get_session_cache(settings: Optional[SwagGuardSettings] = None) -> Optional[SessionCache]:
+    """
+    설정별 세션 캐시(프로세스별 LRU + 선택적 공유 메모리 계층)를 반환합니다.
+
+    설정이 바뀌면(캐시 크기, 공유 계층 사용 여부, 서명 키 경로 등) 프로세스별 캐시를 새로 만듭니다.
+
+    공유 계층의 지문에는 서명 키가 섞이므로, 다른 워커가 검증한 쿠키가 적중하려면 모든 워커가
+    같은 키로 서명해야 합니다. realm 키는 기본적으로 SWAGUARD_SECRET_KEY에서 파생되며, 이 값이나
+    realm의 secret_key를 지정하지 않으면 키가 프로세스마다 랜덤이므로 공유 계층은 적중하지 않습니다.
+
+    Args:
+        settings: 사용할 설정 (기본값: 전역 config)
+
+    Returns:
+        SessionCache 객체 (session_cache_size가 0이고 공유 계층도 꺼져 있으면 None)
+    """
+    settings = settings or config
+    cached = _caches.get(settings)
+    if cached is not None and cached[0] == settings.version:
+        return cached[1]
+
+    shared = get_shared_tier(settings)
+    size = settings.get("session_cache_size", 0)
+    cache = SessionCache(size, shared) if size > 0 or shared is not None else None
+    _caches[settings] = (settings.version, cache)
+    return cache
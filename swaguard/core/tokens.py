@@ -0,0 +1,158 @@
+import hashlib
+import hmac
+import secrets
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import config, SwagGuardSettings
+from ..exceptions.AuthExceptions import ConfigurationError
+
+
+# 서비스 토큰 형식: swg_<공개 접두사>_<비밀 값>
+TOKEN_SCHEME = "swg"
+
+
+def hash_service_token(token: str) -> str:
+    """
+    서비스 토큰의 SHA-256 다이제스트를 계산합니다.
+
+    서비스 토큰은 충분한 엔트로피를 가진 랜덤 값이므로 bcrypt 대신 SHA-256으로 저장합니다.
+
+    Args:
+        token: 서비스 토큰 문자열
+
+    Returns:
+        16진수 다이제스트 문자열
+    """
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def generate_service_token() -> Tuple[str, str]:
+    """
+    새 서비스 토큰을 생성합니다.
+
+    Returns:
+        (공개 접두사, 토큰 문자열) 튜플
+    """
+    prefix = secrets.token_hex(6)
+    return prefix, f"{TOKEN_SCHEME}_{prefix}_{secrets.token_urlsafe(32)}"
+
+
+def parse_token_prefix(token: str) -> Optional[str]:
+    """
+    서비스 토큰에서 공개 접두사를 추출합니다.
+
+    Args:
+        token: 서비스 토큰 문자열
+
+    Returns:
+        공개 접두사, 형식이 맞지 않으면 None
+    """
+    parts = token.split("_", 2)
+    if len(parts) != 3 or parts[0] != TOKEN_SCHEME:
+        return None
+    return parts[1]
+
+
+def issue_service_token(
+    name: str,
+    paths: Optional[List[str]] = None,
+    expires_in_seconds: Optional[int] = None,
+    settings: Optional[SwagGuardSettings] = None
+) -> str:
+    """
+    서비스 토큰을 발급하고 설정에 다이제스트를 등록합니다.
+
+    Args:
+        name: 토큰을 사용하는 서비스 이름
+        paths: 접근을 허용할 경로 목록 (protected_paths의 부분 집합, 기본값: 전체)
+        expires_in_seconds: 만료 시간 (초, 기본값: 만료 없음)
+        settings: 사용할 설정 (기본값: 전역 config)
+
+    Returns:
+        발급된 토큰 문자열 (다시 조회할 수 없으므로 호출자가 보관해야 합니다)
+
+    Raises:
+        ConfigurationError: 허용 경로가 보호 경로에 속하지 않는 경우
+    """
+    settings = settings or config
+    protected_paths = settings.get("protected_paths", [])
+    scope = list(paths) if paths else list(protected_paths)
+    for path in scope:
+        if not any(path.startswith(protected) for protected in protected_paths):
+            raise ConfigurationError(f"서비스 토큰 경로 {path!r}는 보호 경로가 아닙니다.")
+
+    prefix, token = generate_service_token()
+    now = int(time.time())
+    record: Dict[str, Any] = {
+        "name": name,
+        "digest": hash_service_token(token),
+        "paths": scope,
+        "created_at": now,
+        "expires_at": now + expires_in_seconds if expires_in_seconds else None,
+        "last_used": None,
+    }
+    settings.add_service_token(prefix, record)
+    return token
+
+
+def revoke_service_token(token_or_prefix: str, settings: Optional[SwagGuardSettings] = None) -> None:
+    """
+    서비스 토큰을 폐기합니다.
+
+    Args:
+        token_or_prefix: 토큰 문자열 또는 공개 접두사
+        settings: 사용할 설정 (기본값: 전역 config)
+    """
+    prefix = parse_token_prefix(token_or_prefix) or token_or_prefix
+    (settings or config).remove_service_token(prefix)
+
+
+def verify_service_token(
+    token: Optional[str],
+    path: str,
+    settings: Optional[SwagGuardSettings] = None
+) -> Optional[str]:
+    """
+    서비스 토큰을 검증하고 요청 경로가 토큰 범위에 속하는지 확인합니다.
+
+    공개 접두사로 레코드를 한 번에 찾고 다이제스트를 상수 시간 비교하므로
+    bcrypt나 전체 목록 탐색이 필요하지 않습니다.
+
+    Args:
+        token: 서비스 토큰 문자열
+        path: 요청 경로
+        settings: 사용할 설정 (기본값: 전역 config)
+
+    Returns:
+        검증에 성공하면 서비스 이름, 그렇지 않으면 None
+    """
+    if not token:
+        return None
+
+    prefix = parse_token_prefix(token)
+    if prefix is None:
+        return None
+
+    settings = settings or config
+    record = settings.get_service_tokens().get(prefix)
+    if record is None:
+        return None
+
+    if not hmac.compare_digest(hash_service_token(token), record["digest"]):
+        return None
+
+    now = int(time.time())
+    expires_at = record.get("expires_at")
+    if expires_at and expires_at < now:
+        return None
+
+    if not any(path.startswith(allowed) for allowed in record.get("paths", [])):
+        return None
+
+    # last_used는 일정 간격 이상 지났을 때만 기록하여 매 요청마다 쓰지 않도록 합니다.
+    last_used = record.get("last_used")
+    if last_used is None or now - last_used >= settings.get("service_token_touch_seconds", 300):
+        record["last_used"] = now
+
+    return record["name"]
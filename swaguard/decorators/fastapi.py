@@ -6,6 +6,7 @@ from fastapi.security import APIKeyCookie
 
 from ..config import config
 from ..core.auth import verify_auth_cookie, is_path_protected
+from ..utils.cookies import extract_cookie
 
 
 def get_cookie_name() -> str:
@@ -88,7 +89,7 @@ def swagger_protect(paths: Optional[List[str]] = None):
             
             # 쿠키 검증
             cookie_name = get_cookie_name()
-            cookie = request.cookies.get(cookie_name)
+            cookie = extract_cookie(request.scope["headers"], cookie_name.encode("latin-1"))
             
             if not cookie:
                 raise HTTPException(status_code=401, detail="Unauthorized: Authentication required")
@@ -35,3 +35,25 @@ class UnauthorizedAccessError(AuthenticationError):
     """인증되지 않은 접근 시 사용하는 예외 클래스"""
     def __init__(self):
         super().__init__(message="Unauthorized access", status_code=401)
+
+
+class StateBackendError(SwagGuardException):
+    """공유 상태 백엔드 호출 실패 시 사용하는 예외 클래스"""
+    def __init__(self, message="State backend error"):
+        self.message = message
+        super().__init__(self.message)
+
+
+class AuthBackendError(SwagGuardException):
+    """외부 인증 백엔드(LDAP 등) 호출 실패 시 사용하는 예외 클래스"""
+    def __init__(self, message="Authentication backend error"):
+        self.message = message
+        super().__init__(self.message)
+
+
+class BackendUnavailableError(SwagGuardException):
+    """회로 차단기가 열려 있거나 백엔드 호출이 기한을 넘겼을 때 사용하는 예외 클래스"""
+    def __init__(self, message="Backend unavailable", breaker=""):
+        self.message = message
+        self.breaker = breaker
+        super().__init__(self.message)
@@ -1,51 +1,271 @@
-from typing import Callable
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.routing import Mount
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from ..config import config
-from ..core.auth import verify_auth_cookie, is_path_protected
+from ..core.activity import get_activity_tracker
+from ..core.audit import audit_event, configure_audit_log
+from ..core.authz import get_role_table
+from ..core.generations import get_generation_sync
+from ..core.realm import SwagGuardRealm, RealmMatcher, default_realm
+from ..core.schema import OpenAPISchemaCache, SchemaVariant, get_schema_cache, get_schema_views
+from ..utils.cookies import extract_cookie
+
+
+logger = logging.getLogger("swaguard")
+
+
+def _log_warm_failure(task: asyncio.Future) -> None:
+    """백그라운드 스키마 생성이 실패하면 예외를 기록합니다. (다음 요청에서 다시 생성)"""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("OpenAPI schema warmup failed", exc_info=task.exception())
+
+
+def _resolve_schema_app(scope: Scope, path: str) -> Tuple[Any, str]:
+    """
+    요청 경로가 가리키는 OpenAPI 스키마의 애플리케이션을 찾습니다.
+
+    경로가 마운트된 서브 앱의 openapi_url이면 그 서브 앱을 반환합니다.
+
+    Returns:
+        (애플리케이션, 마운트 접두사), 스키마 경로가 아니면 (None, "")
+    """
+    app = scope.get("app")
+    root_path = scope.get("root_path", "")
+    prefix = root_path if root_path and path.startswith(root_path + "/") else ""
+    while app is not None:
+        openapi_url = getattr(app, "openapi_url", None)
+        if openapi_url and path == prefix + openapi_url:
+            return app, prefix
+        for route in getattr(app, "routes", ()):
+            if isinstance(route, Mount) and path.startswith(prefix + route.path + "/"):
+                app = route.app
+                prefix += route.path
+                break
+        else:
+            app = None
+    return None, ""
 
 
 class SwagGuardMiddleware(BaseHTTPMiddleware):
     """
     Swagger 문서 및 관련 경로에 대한 접근을 제한하는 FastAPI 미들웨어
+
+    realms를 지정하면 하나의 미들웨어가 여러 realm의 보호 경로를 함께 처리하며,
+    각 요청은 경로에 해당하는 realm의 쿠키, 로그인 경로, 사용자 저장소로 인증됩니다.
     """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        realms: Optional[Sequence[SwagGuardRealm]] = None,
+        warm_schema: Optional[bool] = None,
+        schema_snapshot: Optional[str] = None
+    ):
+        """
+        Args:
+            app: 다음 ASGI 애플리케이션
+            realms: 보호할 realm 목록 (기본값: 전역 config를 사용하는 기본 realm)
+            warm_schema: 시작 시 OpenAPI 스키마를 미리 생성할지 여부 (기본값: openapi_warmup 설정)
+            schema_snapshot: 빌드 시점에 생성한 스키마 스냅샷 경로 (기본값: openapi_snapshot_path 설정)
+        """
+        super().__init__(app)
+        self.matcher = RealmMatcher(realms or [default_realm()])
+        self.warm_schema = config.get("openapi_warmup", False) if warm_schema is None else warm_schema
+        self.schema_snapshot = schema_snapshot or config.get("openapi_snapshot_path")
+        self._warm_task: Optional[asyncio.Future] = None
+        if config.get("audit_log_path"):
+            configure_audit_log(config.get("audit_log_path"))
+
+    def _schema_cache(self, app: Any) -> Optional[OpenAPISchemaCache]:
+        """스키마 미리 생성 또는 스냅샷이 설정된 경우 애플리케이션의 스키마 캐시를 반환합니다."""
+        if not (self.warm_schema or self.schema_snapshot) or not getattr(app, "openapi_url", None):
+            return None
+        return get_schema_cache(app, self.schema_snapshot)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "lifespan":
+            await super().__call__(scope, receive, send)
+            return
+
+        # 시작(startup)이 끝나면 백그라운드에서 스키마를 미리 생성
+        cache = self._schema_cache(scope.get("app"))
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "lifespan.startup.complete" and cache is not None and self.warm_schema:
+                self._warm_task = asyncio.ensure_future(cache.warm())
+                self._warm_task.add_done_callback(_log_warm_failure)
+            elif message["type"] == "lifespan.shutdown.complete":
+                # 종료 전에 메모리에 남은 접근 기록을 저장소에 기록
+                for realm in self.matcher.realms:
+                    await get_activity_tracker(realm.settings).stop()
+                    generation_sync = get_generation_sync(realm.settings)
+                    if generation_sync is not None:
+                        await generation_sync.stop()
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _authenticate(self, request: Request, realm: SwagGuardRealm, path: str) -> Optional[Dict[str, Any]]:
+        """
+        요청의 인증 정보를 확인하고 클레임을 반환합니다.
+
+        쿠키, 서비스 토큰(Authorization: Bearer), HTTP Basic 순서로 확인합니다.
+        """
+        # 쿠키 가져오기
+        cookie_name = realm.get("cookie_name", "swaguard_auth")
+        cookie = extract_cookie(request.scope["headers"], cookie_name.encode("latin-1"))
+        if cookie:
+            claims = realm.decode_auth_cookie(cookie)
+            if claims:
+                return claims
+
+        # 쿠키가 없으면 Authorization 헤더(서비스 토큰 또는 HTTP Basic) 확인
+        authorization = request.headers.get("authorization")
+        if not authorization:
+            return None
+
+        scheme, _, credentials = authorization.partition(" ")
+        if scheme.lower() == "bearer":
+            # 서비스 토큰은 발급 시 지정한 경로 범위로 이미 제한되어 있음
+            service_name = realm.verify_service_token(credentials.strip(), path)
+            return {"sub": service_name, "service": True} if service_name else None
+
+        if realm.get("basic_auth_enabled", False):
+            username = await realm.authenticate_basic_async(authorization)
+            if username:
+                return {"sub": username, "roles": realm.settings.get_user_roles(username), "sid": "basic"}
+
+        return None
+    
+    def _schema_response(self, request: Request, variant: SchemaVariant) -> Response:
+        """캐시된 스키마 변형으로 응답을 생성합니다."""
+        # 변형은 쿠키나 Authorization 헤더(서비스 토큰, HTTP Basic)의 역할에 따라 달라짐
+        headers = {"ETag": variant.etag, "Vary": "Accept-Encoding, Cookie, Authorization"}
+        if request.headers.get("if-none-match") == variant.etag:
+            return Response(status_code=304, headers=headers)
+        
+        if "gzip" in request.headers.get("accept-encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            return Response(content=variant.gzip_body, media_type="application/json", headers=headers)
+        return Response(content=variant.body, media_type="application/json", headers=headers)
     
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         path = request.url.path
         
-        # 경로가 보호 대상인지 확인
-        if is_path_protected(path):
-            # 쿠키 이름 가져오기
-            cookie_name = config.get("cookie_name", "swaguard_auth")
-            
-            # 로그인 페이지는 예외 처리
-            login_path = config.get("login_path", "/swaguard/login")
-            if path == login_path:
-                return await call_next(request)
+        # 경로가 보호 대상인지 확인하고 담당 realm 선택
+        realm = self.matcher.match(path)
+        if realm is None or path == realm.get("login_path", "/swaguard/login"):
+            # 보호 대상이 아닌 경로와 로그인 페이지는 그대로 진행
+            return await call_next(request)
+        
+        # 공유 상태 백엔드가 있으면 다른 워커의 세션 무효화(세대 번호)를 주기적으로 반영
+        generation_sync = get_generation_sync(realm.settings)
+        if generation_sync is not None:
+            generation_sync.ensure_started()
+        
+        started = time.perf_counter()
+        response, claims = await self._guard(request, realm, path, call_next)
+        audit_event(
+            "access",
+            realm=realm.name,
+            user=claims.get("sub") if claims else None,
+            ip=request.client.host if request.client else None,
+            path=path,
+            status=response.status_code,
+            latency_ms=round((time.perf_counter() - started) * 1000, 3),
+        )
+        return response
+    
+    async def _guard(
+        self, request: Request, realm: SwagGuardRealm, path: str, call_next: Callable
+    ) -> Tuple[Response, Optional[Dict[str, Any]]]:
+        """보호 경로 요청을 인증/인가하고 응답과 클레임을 반환합니다."""
+        claims = await self._authenticate(request, realm, path)
+        
+        # 인증되지 않았으면 로그인 페이지로 리다이렉트
+        if not claims:
+            # API 응답이면 401 상태 코드 반환
+            if path.endswith(".json") or request.headers.get("accept") == "application/json":
+                headers = {}
+                if realm.get("basic_auth_enabled", False):
+                    headers["WWW-Authenticate"] = f'Basic realm="{realm.name}"'
+                return Response(
+                    content='{"detail":"Unauthorized: Authentication required"}',
+                    status_code=401,
+                    media_type="application/json",
+                    headers=headers
+                ), None
             
-            # 쿠키 가져오기
-            cookie = request.cookies.get(cookie_name)
+            # HTML 응답이면 로그인 페이지로 리다이렉트
+            redirect_url = realm.get("login_path", "/swaguard/login")
+            if "?" not in redirect_url:
+                redirect_url += f"?next={path}"
             
-            # 쿠키가 없거나 유효하지 않으면 로그인 페이지로 리다이렉트
-            if not cookie or not verify_auth_cookie(cookie):
-                # API 응답이면 401 상태 코드 반환
-                if path.endswith(".json") or request.headers.get("accept") == "application/json":
-                    return Response(
-                        content='{"detail":"Unauthorized: Authentication required"}',
-                        status_code=401,
-                        media_type="application/json"
-                    )
-                
-                # HTML 응답이면 로그인 페이지로 리다이렉트
-                redirect_url = login_path
-                if "?" not in redirect_url:
-                    redirect_url += f"?next={path}"
-                
-                return Response(
-                    status_code=307,  # Temporary Redirect
-                    headers={"Location": redirect_url}
-                )
+            return Response(
+                status_code=307,  # Temporary Redirect
+                headers={"Location": redirect_url}
+            ), None
+        
+        # 역할 규칙에 따라 접근 권한 확인
+        if not claims.get("service") and not realm.is_path_allowed(claims.get("roles", ()), path):
+            return Response(
+                content='{"detail":"Forbidden: Insufficient role"}',
+                status_code=403,
+                media_type="application/json"
+            ), claims
+        
+        # 접근 기록은 메모리에만 남기고 저장소 기록은 백그라운드 작업이 모아서 수행
+        if not claims.get("service") and realm.get("activity_tracking", True):
+            tracker = get_activity_tracker(realm.settings)
+            tracker.ensure_started()
+            tracker.touch(claims["sub"], claims.get("sid", "legacy"))
         
-        # 인증 성공 또는 보호 대상이 아닌 경로인 경우 요청 진행
-        return await call_next(request)
+        # 마운트된 서브 앱의 스키마 경로도 해당 서브 앱의 스키마로 처리
+        app, prefix = _resolve_schema_app(request.scope, path)
+        if app is not None:
+            if prefix and getattr(app, "root_path_in_servers", False):
+                # FastAPI의 openapi 엔드포인트와 같이 마운트 경로를 servers에 추가
+                if prefix not in {server.get("url") for server in app.servers}:
+                    app.servers.insert(0, {"url": prefix})
+
+            # 스키마 미리 생성이나 스냅샷을 사용하면 스키마 캐시로 생성하며, 진행 중인 생성이 있으면 함께 기다림
+            cache = None
+            if self.warm_schema or self.schema_snapshot:
+                snapshot = self.schema_snapshot if app is request.scope.get("app") else None
+                cache = get_schema_cache(app, snapshot)
+                if not cache.ready:
+                    await cache.warm()
+
+            # 역할 규칙이 있으면 OpenAPI 스키마는 역할별로 필터링된 변형을 제공
+            if get_role_table(realm.settings) is not None:
+                roles = None if claims.get("service") else claims.get("roles", ())
+                views = get_schema_views(realm.settings)
+                if cache is not None:
+                    base_schema = cache.openapi()
+                else:
+                    # FastAPI의 app.openapi_schema를 그대로 사용하므로 초기화하면 다시 생성되며, 생성은 스레드에서 수행
+                    base_schema = getattr(app, "openapi_schema", None)
+                    if base_schema is None:
+                        base_schema = await asyncio.get_running_loop().run_in_executor(None, app.openapi)
+                variant = views.lookup(base_schema, roles)
+                if variant is None:
+                    # 처음 요청된 변형의 필터링과 직렬화, 압축도 이벤트 루프 밖에서 수행
+                    variant = await asyncio.get_running_loop().run_in_executor(None, views.get, base_schema, roles)
+                return self._schema_response(request, variant), claims
+
+            # 스냅샷이 있으면 매핑된 파일을 그대로 응답
+            if cache is not None and cache.snapshot is not None:
+                snapshot = cache.snapshot
+                if request.headers.get("if-none-match") == snapshot.etag:
+                    return Response(status_code=304, headers={"ETag": snapshot.etag}), claims
+                return Response(content=snapshot.body, media_type="application/json",
+                                headers={"ETag": snapshot.etag}), claims
+
+        # 인증 성공 시 요청 진행
+        return await call_next(request), claims
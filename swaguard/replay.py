@@ -0,0 +1,513 @@
+"""
+기록된 접근 로그를 SwagGuard 미들웨어와 로그인 라우터에 재생하는 용량 산정 도구
+
+사용법:
+    python -m swaguard.replay audit.log --speed 1 --speed 5 --speed 20
+    python -m swaguard.replay audit.log --app myproject.main:create_app --speed 10 --json
+
+입력은 감사 로그 형식(JSON Lines, .gz, SQLite)입니다. 레코드는 다음과 같이 요청으로 바뀝니다.
+
+- login_success / login_failure: 올바른 / 잘못된 비밀번호로 로그인 POST
+- access: 기록된 경로로 GET (user가 있으면 그 사용자의 인증 쿠키 포함)
+
+레코드 대신 {"ts", "path", "cookie": true/false, "user"} 형식의 줄도 사용할 수 있습니다.
+각 배속(stage)마다 원래의 시간 간격을 배속으로 나눈 일정대로 요청을 보내며(open-loop),
+요청은 네트워크 없이 in-process ASGI 전송으로 처리됩니다. 단계별로 처리량, 요청 종류별 지연 시간 분위수,
+이벤트 루프 지연, CPU 사용량을 보고합니다.
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import math
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .analyze import RecordFilter, iter_records
+from .core.activity import get_activity_tracker
+from .core.realm import SwagGuardRealm
+from .core.security import hash_password
+from .exceptions.AuthExceptions import ConfigurationError
+from .utils.sketches import LatencySketch
+
+
+REPLAY_PASSWORD = "swaguard-replay"
+# 배속으로 나눈 요청 간격보다 이 값 이상 늦게 시작한 요청은 지연(late)으로 셉니다.
+LATE_THRESHOLD_MS = 10.0
+
+
+def _load_httpx():
+    try:
+        import httpx
+    except ImportError as e:
+        raise ConfigurationError("재생 도구를 사용하려면 httpx가 필요합니다: pip install swaguard[dev]") from e
+    return httpx
+
+
+class TraceEvent:
+    """재생할 요청 하나"""
+
+    __slots__ = ("offset", "kind", "path", "user", "valid")
+
+    def __init__(self, offset: float, kind: str, path: str, user: Optional[str], valid: bool = True):
+        """
+        Args:
+            offset: 첫 요청으로부터의 시간 (초)
+            kind: login 또는 access
+            path: 요청 경로
+            user: 사용자 이름 (쿠키 없는 요청이면 None)
+            valid: 로그인 요청의 비밀번호가 올바른지 여부
+        """
+        self.offset = offset
+        self.kind = kind
+        self.path = path
+        self.user = user
+        self.valid = valid
+
+
+def load_trace(
+    paths: Iterable[str],
+    login_path: str = "/swaguard/login",
+    record_filter: Optional[RecordFilter] = None,
+    limit: Optional[int] = None
+) -> List[TraceEvent]:
+    """
+    접근 로그를 재생할 요청 목록으로 읽습니다.
+
+    Args:
+        paths: 감사 로그 파일 경로 목록
+        login_path: 로그인 요청을 보낼 경로
+        record_filter: 레코드 필터
+        limit: 읽을 최대 요청 수
+
+    Returns:
+        시간순으로 정렬된 TraceEvent 목록
+    """
+    rows: List[Tuple[float, str, str, Optional[str], bool]] = []
+    for path in paths:
+        if limit is not None and len(rows) >= limit:
+            break
+        for record in iter_records(path, record_filter):
+            ts = record.get("ts")
+            if ts is None:
+                continue
+            event = record.get("event", "access")
+            if event in ("login_success", "login_failure"):
+                rows.append((ts, "login", login_path, record.get("user") or "anonymous", event == "login_success"))
+            elif record.get("path"):
+                user = record.get("user")
+                if "cookie" in record and not record["cookie"]:
+                    user = None
+                elif record.get("cookie") and not user:
+                    user = "replay-user"
+                rows.append((ts, "access", record["path"], user, True))
+            if limit is not None and len(rows) >= limit:
+                break
+    rows.sort(key=lambda row: row[0])
+    if not rows:
+        return []
+    start = rows[0][0]
+    return [TraceEvent(ts - start, kind, path, user, valid) for ts, kind, path, user, valid in rows]
+
+
+def _guarded_realm(app: Any) -> Optional[SwagGuardRealm]:
+    """
+    애플리케이션에 이미 등록된 SwagGuardMiddleware의 realm을 찾습니다.
+
+    미들웨어가 realms 없이 등록되어 있으면 default_realm()을 반환합니다. ReplayHarness는 단계마다
+    전역 config의 스냅샷으로 만든 재생 전용 realm을 기본 realm으로 지정하므로(replay_default_realm)
+    재생용 사용자와 캐시가 전역 설정에 남지 않습니다.
+
+    Returns:
+        미들웨어의 realm, 미들웨어가 없으면 None
+
+    Raises:
+        ConfigurationError: 미들웨어가 여러 realm을 보호하는 경우
+    """
+    from .core.realm import default_realm
+    from .middlewares.fastapi_mw import SwagGuardMiddleware
+
+    for middleware in getattr(app, "user_middleware", ()):
+        if not (isinstance(middleware.cls, type) and issubclass(middleware.cls, SwagGuardMiddleware)):
+            continue
+        realms = middleware.kwargs.get("realms") or (middleware.args[0] if middleware.args else None)
+        if not realms:
+            return default_realm()
+        if len(realms) != 1:
+            names = ", ".join(realm.name for realm in realms)
+            raise ConfigurationError(
+                f"SwagGuardMiddleware가 여러 realm({names})을 보호하는 애플리케이션은 재생할 수 없습니다."
+            )
+        return realms[0]
+    return None
+
+
+def replay_default_realm():
+    """
+    전역 config의 스냅샷으로 만든 재생 전용 realm을 기본 realm으로 지정하는 컨텍스트 관리자를 반환합니다.
+
+    블록 안에서 realms 없이 등록된 미들웨어와 create_login_router()는 전역 config 대신 이 realm을 사용합니다.
+    """
+    from .config import config, SwagGuardSettings
+    from .core import auth
+    from .core.realm import override_default_realm
+
+    realm = SwagGuardRealm("default", settings=SwagGuardSettings(config.snapshot()), secret_key=auth.SECRET_KEY)
+    return override_default_realm(realm)
+
+
+def build_replay_app(app: Any = None, routes: int = 100) -> Tuple[Any, SwagGuardRealm]:
+    """
+    재생 대상 애플리케이션을 만듭니다.
+
+    app에 SwagGuardMiddleware가 이미 등록되어 있으면 미들웨어를 다시 붙이지 않고 그 realm으로 재생합니다.
+    이때 로그인 라우터도 애플리케이션에 이미 있어야 합니다. 그렇지 않으면 애플리케이션이 시작되기 전에
+    재생용 realm의 로그인 라우터와 미들웨어를 include_router()와 add_middleware()로 붙입니다.
+
+    Args:
+        app: SwagGuard를 붙일 애플리케이션 (None이면 routes개의 API가 있는 FastAPI 앱을 생성)
+        routes: 생성할 API 수 (OpenAPI 스키마 크기에 영향)
+
+    Returns:
+        (애플리케이션, 재생용 realm) 튜플
+
+    Raises:
+        ConfigurationError: 기존 미들웨어가 여러 realm을 보호하는 경우
+    """
+    from fastapi import FastAPI
+
+    from .middlewares.fastapi_mw import SwagGuardMiddleware
+    from .routes.login_route import create_login_router
+
+    if app is None:
+        app = FastAPI(title="SwagGuard replay")
+        for index in range(routes):
+            async def endpoint(item_id: int, q: Optional[str] = None) -> Dict[str, Any]:
+                return {"item_id": item_id, "q": q}
+            app.add_api_route(f"/api/resource{index}/{{item_id}}", endpoint, methods=["GET"], tags=[f"group{index % 10}"])
+    else:
+        realm = _guarded_realm(app)
+        if realm is not None:
+            return app, realm
+
+    realm = SwagGuardRealm("replay", cookie_secure=False)
+    app.include_router(create_login_router(realm))
+    app.add_middleware(SwagGuardMiddleware, realms=[realm])
+    return app, realm
+
+
+def load_app_factory(target: str) -> Callable[[], Any]:
+    """
+    "모듈:함수" 형식의 애플리케이션 팩토리를 불러옵니다.
+
+    단계마다 팩토리를 호출하여 이전 단계의 미들웨어와 스키마 캐시가 없는 애플리케이션을 만듭니다.
+    모듈은 한 번만 import하므로 모듈을 불러올 때의 부수 효과도 한 번만 일어납니다.
+
+    Raises:
+        ConfigurationError: 모듈이나 함수를 찾을 수 없거나, 팩토리 대신 애플리케이션 객체를 지정한 경우
+    """
+    module_name, _, attribute = target.partition(":")
+    attribute = attribute or "create_app"
+    try:
+        factory = getattr(importlib.import_module(module_name), attribute)
+    except (ImportError, AttributeError) as e:
+        raise ConfigurationError(f"애플리케이션 팩토리를 불러올 수 없습니다: {target} ({e})") from e
+    if not callable(factory) or hasattr(factory, "user_middleware"):
+        raise ConfigurationError(
+            f"--app에는 애플리케이션 객체가 아니라 애플리케이션을 만드는 함수를 지정해야 합니다: {target}"
+        )
+    return factory
+
+
+class StageResult:
+    """배속 단계 하나의 재생 결과"""
+
+    def __init__(self, speed: float):
+        self.speed = speed
+        self.requests = 0
+        self.errors = 0
+        self.late = 0
+        self.statuses: Dict[int, int] = {}
+        self.latency: Dict[str, LatencySketch] = {}
+        self.loop_lag = LatencySketch()
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.offered_seconds = 0.0
+
+    def record(self, kind: str, status: Optional[int], latency_ms: float) -> None:
+        self.requests += 1
+        if status is None:
+            self.errors += 1
+        else:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.latency.setdefault(kind, LatencySketch()).add(latency_ms)
+        self.latency.setdefault("all", LatencySketch()).add(latency_ms)
+
+    def to_dict(self, target_utilization: float = 0.7) -> Dict[str, Any]:
+        """
+        보고서용 딕셔너리를 반환합니다.
+
+        estimated_workers는 이 배속에서 기록된 부하(offered_rps)를 CPU 사용률 target_utilization 이하로
+        처리하는 데 필요한 단일 스레드 워커 수의 추정치입니다.
+        """
+        cpu_per_request = self.cpu_seconds / self.requests if self.requests else 0.0
+        offered_rps = self.requests / self.offered_seconds if self.offered_seconds else None
+        return {
+            "speed": self.speed,
+            "requests": self.requests,
+            "errors": self.errors,
+            "late_requests": self.late,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "throughput_rps": round(self.requests / self.wall_seconds, 1) if self.wall_seconds else None,
+            "offered_rps": round(offered_rps, 1) if offered_rps else None,
+            "cpu_seconds": round(self.cpu_seconds, 3),
+            "cpu_utilization": round(self.cpu_seconds / self.wall_seconds, 3) if self.wall_seconds else None,
+            "cpu_ms_per_request": round(cpu_per_request * 1000, 3),
+            "estimated_workers": (
+                math.ceil(offered_rps * cpu_per_request / target_utilization) if offered_rps else None
+            ),
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "latency_ms": {kind: sketch.summary() for kind, sketch in sorted(self.latency.items())},
+            "loop_lag_ms": self.loop_lag.summary(),
+        }
+
+
+class ReplayHarness:
+    """
+    재생 대상 애플리케이션에 in-process ASGI 전송으로 요청을 보내는 재생기
+
+    단계마다 build()로 애플리케이션과 realm을 새로 만들어 세션 캐시, 스키마 캐시, 접근 기록 등이
+    이전 단계에서 데워진 상태로 측정되지 않도록 합니다. 각 단계는 replay_default_realm() 안에서
+    실행되므로 realms 없이 등록된 미들웨어도 전역 config를 건드리지 않습니다.
+    """
+
+    def __init__(self, build: Callable[[], Tuple[Any, SwagGuardRealm]], lag_interval: float = 0.01):
+        """
+        Args:
+            build: (ASGI 애플리케이션, 재생용 realm)을 새로 만드는 함수 (예: build_replay_app)
+                애플리케이션에는 realm의 미들웨어와 로그인 라우터가 설정되어 있어야 합니다.
+            lag_interval: 이벤트 루프 지연 측정 간격 (초)
+        """
+        self.httpx = _load_httpx()
+        self.build = build
+        self.lag_interval = lag_interval
+        self.app: Any = None
+        self.realm: Optional[SwagGuardRealm] = None
+        self.cookie_name = "swaguard_auth"
+        self._password_hash: Optional[str] = None
+        self._cookies: Dict[str, str] = {}
+        # 재생을 위해 만든 사용자 -> 만들기 전의 세션 세대 번호 (단계가 끝나면 되돌림)
+        self._created_users: Dict[str, Optional[int]] = {}
+
+    def _start_stage(self, events: Iterable[TraceEvent]) -> None:
+        """새 애플리케이션과 realm을 만들고 재생용 사용자를 준비합니다."""
+        self.app, self.realm = self.build()
+        self.cookie_name = self.realm.get("cookie_name", "swaguard_auth")
+        self._cookies.clear()
+        self.prepare_users(events)
+
+    def prepare_users(self, events: Iterable[TraceEvent]) -> None:
+        """트레이스에 등장하는 사용자를 realm에 만듭니다. (bcrypt 해시는 한 번만 계산)"""
+        if self._password_hash is None:
+            self._password_hash = hash_password(REPLAY_PASSWORD)
+        settings = self.realm.settings
+        users = settings.get_users()
+        for event in events:
+            if event.user and event.user not in users:
+                self._created_users[event.user] = settings.get("user_generations", {}).get(event.user)
+                settings.add_user(event.user, self._password_hash)
+
+    def remove_users(self) -> None:
+        """prepare_users()로 만든 사용자를 realm에서 제거하고 세션 세대 번호를 되돌립니다."""
+        settings = self.realm.settings
+        for user, generation in self._created_users.items():
+            settings.remove_user(user)
+            generations = settings.config.setdefault("user_generations", {})
+            if generation is None:
+                generations.pop(user, None)
+            else:
+                generations[user] = generation
+        self._created_users.clear()
+
+    def _cookie_for(self, user: str) -> str:
+        # 트레이스 이전에 로그인한 세션은 realm 키로 직접 발급한 쿠키로 대신합니다.
+        cookie = self._cookies.get(user)
+        if cookie is None:
+            cookie = self.realm.create_auth_cookie(user)[0]
+            self._cookies[user] = cookie
+        return cookie
+
+    def _build_request(self, event: TraceEvent) -> Any:
+        url = "http://replay" + event.path
+        if event.kind == "login":
+            password = REPLAY_PASSWORD if event.valid else REPLAY_PASSWORD + "-wrong"
+            return self.httpx.Request("POST", url, data={"username": event.user, "password": password})
+        headers = {"accept": "text/html"}
+        if event.user:
+            headers["cookie"] = f"{self.cookie_name}={self._cookie_for(event.user)}"
+        return self.httpx.Request("GET", url, headers=headers)
+
+    def _classify(self, event: TraceEvent) -> str:
+        if event.kind == "login":
+            return "login"
+        if not event.user:
+            return "unauthenticated"
+        if event.path == getattr(self.app, "openapi_url", "/openapi.json"):
+            return "schema"
+        if self.realm.is_path_protected(event.path):
+            return "docs"
+        return "other"
+
+    async def _send(self, transport: Any, event: TraceEvent, result: StageResult) -> None:
+        request = self._build_request(event)
+        started = time.perf_counter()
+        status = None
+        try:
+            response = await transport.handle_async_request(request)
+            await response.aread()
+            status = response.status_code
+            if event.kind == "login" and status == 303:
+                for header in response.headers.get_list("set-cookie"):
+                    name, _, rest = header.partition("=")
+                    if name == self.cookie_name:
+                        self._cookies[event.user] = rest.split(";", 1)[0]
+        except Exception:
+            status = None
+        result.record(self._classify(event), status, (time.perf_counter() - started) * 1000)
+
+    async def _monitor_loop_lag(self, sketch: LatencySketch) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.lag_interval
+            await asyncio.sleep(self.lag_interval)
+            sketch.add(max(0.0, (loop.time() - expected) * 1000))
+
+    async def run_stage(self, events: List[TraceEvent], speed: float) -> StageResult:
+        """
+        요청 목록을 배속에 맞춰 재생합니다.
+
+        Args:
+            events: load_trace()로 읽은 요청 목록
+            speed: 배속 (2이면 기록된 시간의 절반 동안 같은 요청을 보냄)
+
+        Returns:
+            StageResult 객체
+
+        Raises:
+            ValueError: speed가 0 이하인 경우
+        """
+        if speed <= 0:
+            raise ValueError(f"speed must be positive: {speed}")
+        with replay_default_realm():
+            self._start_stage(events)
+            try:
+                return await self._replay(events, speed)
+            finally:
+                # 단계가 끝나면 접근 기록을 저장소에 기록하고, 재생용 사용자를 제거하여 realm을 원래대로 되돌림
+                await get_activity_tracker(self.realm.settings).stop()
+                self.remove_users()
+
+    async def _replay(self, events: List[TraceEvent], speed: float) -> StageResult:
+        result = StageResult(speed)
+        transport = self.httpx.ASGITransport(app=self.app)
+        monitor = asyncio.ensure_future(self._monitor_loop_lag(result.loop_lag))
+        loop = asyncio.get_running_loop()
+        tasks = []
+        cpu_started = time.process_time()
+        started = loop.time()
+        for event in events:
+            scheduled = started + event.offset / speed
+            delay = scheduled - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif -delay * 1000 >= LATE_THRESHOLD_MS:
+                result.late += 1
+            tasks.append(asyncio.ensure_future(self._send(transport, event, result)))
+        await asyncio.gather(*tasks)
+        result.wall_seconds = loop.time() - started
+        result.cpu_seconds = time.process_time() - cpu_started
+        result.offered_seconds = events[-1].offset / speed if events else 0.0
+        monitor.cancel()
+        try:
+            await monitor
+        except asyncio.CancelledError:
+            pass
+        return result
+
+    async def run(self, events: List[TraceEvent], speeds: Iterable[float]) -> List[StageResult]:
+        """배속 단계별로 요청 목록을 재생합니다. 단계마다 새 애플리케이션과 realm을 사용합니다."""
+        return [await self.run_stage(events, speed) for speed in speeds]
+
+
+def format_report(stages: List[Dict[str, Any]]) -> str:
+    """재생 결과를 사람이 읽기 쉬운 문자열로 만듭니다."""
+    lines = []
+    for stage in stages:
+        lines += [
+            f"Stage x{stage['speed']:g}: {stage['requests']} requests in {stage['wall_seconds']:.2f}s "
+            f"({stage['throughput_rps']} rps, offered {stage['offered_rps']} rps, "
+            f"errors {stage['errors']}, late {stage['late_requests']})",
+            f"  CPU: {stage['cpu_seconds']:.2f}s ({stage['cpu_utilization']:.0%} of one core), "
+            f"{stage['cpu_ms_per_request']:.2f} ms/request, estimated workers: {stage['estimated_workers']}",
+            f"  Event loop lag (ms): p50={stage['loop_lag_ms']['p50'] or 0:.2f} "
+            f"p99={stage['loop_lag_ms']['p99'] or 0:.2f} max={stage['loop_lag_ms']['max'] or 0:.2f}",
+            f"  {'kind':<16} {'count':>8} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}",
+        ]
+        for kind, latency in stage["latency_ms"].items():
+            lines.append(
+                f"  {kind:<16} {latency['count']:>8} {latency['p50']:>9.2f} {latency['p90']:>9.2f} "
+                f"{latency['p99']:>9.2f} {latency['max']:>9.2f}"
+            )
+        lines.append("")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m swaguard.replay", description="SwagGuard 접근 로그 재생")
+    parser.add_argument("paths", nargs="+", help="접근 로그 파일 (감사 로그 형식: JSON Lines, .gz, SQLite)")
+    parser.add_argument("--speed", type=float, action="append", help="배속 (반복 지정 시 단계별로 재생, 기본값: 1)")
+    parser.add_argument("--app", help="SwagGuard를 붙여 재생할 애플리케이션 팩토리 (예: myproject.main:create_app)")
+    parser.add_argument("--routes", type=int, default=100, help="--app이 없을 때 생성할 API 수")
+    parser.add_argument("--limit", type=int, help="재생할 최대 요청 수")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+    speeds = args.speed or [1.0]
+    if any(speed <= 0 for speed in speeds):
+        parser.error("--speed must be greater than 0")
+
+    factory = None
+    if args.app:
+        sys.path.insert(0, os.getcwd())
+        try:
+            factory = load_app_factory(args.app)
+        except ConfigurationError as e:
+            parser.error(str(e))
+
+    def build() -> Tuple[Any, SwagGuardRealm]:
+        return build_replay_app(factory() if factory else None, routes=args.routes)
+
+    # 로그인 경로는 realm 설정에 따르므로 한 번 만들어 확인합니다.
+    try:
+        with replay_default_realm():
+            _, realm = build()
+    except ConfigurationError as e:
+        parser.error(str(e))
+    events = load_trace(args.paths, realm.get("login_path", "/swaguard/login"), limit=args.limit)
+    if not events:
+        print("No replayable records found.", file=sys.stderr)
+        return 1
+
+    harness = ReplayHarness(build)
+    results = asyncio.run(harness.run(events, speeds))
+    stages = [result.to_dict() for result in results]
+    if args.json:
+        print(json.dumps(stages, ensure_ascii=False, indent=2))
+    else:
+        print(format_report(stages))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,11 @@
 from typing import Optional
 from fastapi import APIRouter, Request, Response, Form, HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 from pydantic import BaseModel
 
-from ..config import config
-from ..core.auth import authenticate_user, create_auth_cookie
+from ..core.audit import audit_event
+from ..core.realm import SwagGuardRealm, default_realm
+from ..utils.cookies import extract_cookie
 
 
 class LoginForm(BaseModel):
@@ -12,16 +13,20 @@ class LoginForm(BaseModel):
     password: str
 
 
-def create_login_router() -> APIRouter:
+def create_login_router(realm: Optional[SwagGuardRealm] = None) -> APIRouter:
     """
     로그인 및 로그아웃 라우트를 포함하는 FastAPI 라우터를 생성합니다.
     
+    Args:
+        realm: 로그인을 처리할 realm (기본값: 전역 config를 사용하는 기본 realm)
+        
     Returns:
         FastAPI APIRouter 객체
     """
+    realm = realm or default_realm()
     router = APIRouter()
     
-    @router.get(config.get("login_path", "/swaguard/login"), response_class=HTMLResponse, include_in_schema=False)
+    @router.get(realm.get("login_path", "/swaguard/login"), response_class=HTMLResponse, include_in_schema=False)
     async def login_page(request: Request, next: Optional[str] = None):
         """로그인 페이지를 제공합니다."""
         login_html = f"""
@@ -118,8 +123,9 @@ def create_login_router() -> APIRouter:
         """
         return login_html
     
-    @router.post(config.get("login_path", "/swaguard/login"), include_in_schema=False)
+    @router.post(realm.get("login_path", "/swaguard/login"), include_in_schema=False)
     async def login(
+        request: Request,
         response: Response,
         username: str = Form(...),
         password: str = Form(...),
@@ -127,20 +133,24 @@ def create_login_router() -> APIRouter:
     ):
         """로그인 요청을 처리합니다."""
         # 사용자 인증
-        if not authenticate_user(username, password):
+        ip = request.client.host if request.client else None
+        if not await realm.authenticate_user_async(username, password):
+            audit_event("login_failure", realm=realm.name, user=username, ip=ip)
             # 인증 실패 시 오류 메시지와 함께 로그인 페이지로 리다이렉트
-            login_path = config.get("login_path", "/swaguard/login")
+            login_path = realm.get("login_path", "/swaguard/login")
             error_message = "Invalid username or password"
             redirect_url = f"{login_path}?error={error_message}"
             if next and next != "/docs":
                 redirect_url += f"&next={next}"
             return RedirectResponse(redirect_url, status_code=303)
         
+        audit_event("login_success", realm=realm.name, user=username, ip=ip)
+        
         # 인증 성공 시 쿠키 생성
-        cookie_value, cookie_options = create_auth_cookie(username)
+        cookie_value, cookie_options = realm.create_auth_cookie(username)
         
         # 쿠키 설정
-        cookie_name = config.get("cookie_name", "swaguard_auth")
+        cookie_name = realm.get("cookie_name", "swaguard_auth")
         response = RedirectResponse(next, status_code=303)
         response.set_cookie(
             key=cookie_name,
@@ -154,11 +164,15 @@ def create_login_router() -> APIRouter:
         
         return response
     
-    @router.get(config.get("logout_path", "/swaguard/logout"))
-    async def logout():
+    @router.get(realm.get("logout_path", "/swaguard/logout"))
+    async def logout(request: Request):
         """로그아웃 요청을 처리합니다."""
+        cookie_name = realm.get("cookie_name", "swaguard_auth")
+        username = realm.verify_auth_cookie(extract_cookie(request.scope["headers"], cookie_name.encode("latin-1")))
+        ip = request.client.host if request.client else None
+        audit_event("logout", realm=realm.name, user=username, ip=ip)
+        
         # 쿠키 삭제
-        cookie_name = config.get("cookie_name", "swaguard_auth")
         json_response = JSONResponse(
             content={"message": "Logged out successfully. Please refresh the page."},
             status_code=200
@@ -166,10 +180,19 @@ def create_login_router() -> APIRouter:
         json_response.delete_cookie(
             key=cookie_name,
             path="/",
-            secure=config.get("cookie_secure", True),
-            httponly=config.get("cookie_httponly", True)
+            secure=realm.get("cookie_secure", True),
+            httponly=realm.get("cookie_httponly", True)
         )
         
         return json_response
     
+    if realm.get("token_format", "signed") == "jwt":
+        @router.get(realm.get("jwks_path", "/swaguard/.well-known/jwks.json"), include_in_schema=False)
+        async def jwks():
+            """엣지 게이트웨이가 토큰을 검증할 수 있도록 공개 키 집합을 제공합니다."""
+            return JSONResponse(
+                content=realm.get_jwks(),
+                headers={"Cache-Control": "public, max-age=300"}
+            )
+    
     return router
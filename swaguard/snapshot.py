@@ -0,0 +1,47 @@
+"""
+빌드 시점에 OpenAPI 스키마 스냅샷을 생성하는 명령행 도구
+
+사용법:
+    python -m swaguard.snapshot myproject.main:app openapi.snapshot.json
+
+생성한 파일을 SWAGUARD_OPENAPI_SNAPSHOT(openapi_snapshot_path) 설정으로 지정하면
+워커는 스키마를 생성하지 않고 메모리 매핑된 스냅샷을 그대로 제공합니다.
+"""
+import argparse
+import importlib
+import os
+import sys
+from typing import Any, List, Optional
+
+from .core.schema import write_schema_snapshot
+
+
+def load_app(target: str) -> Any:
+    """
+    "모듈:속성" 형식의 문자열에서 애플리케이션 객체를 가져옵니다.
+
+    Args:
+        target: 예) "myproject.main:app"
+
+    Returns:
+        애플리케이션 객체
+    """
+    module_name, _, attribute = target.partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, attribute or "app")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m swaguard.snapshot", description="OpenAPI 스키마 스냅샷 생성")
+    parser.add_argument("app", help="애플리케이션 경로 (예: myproject.main:app)")
+    parser.add_argument("output", help="저장할 스냅샷 파일 경로")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.getcwd())
+    write_schema_snapshot(load_app(args.app), args.output)
+    print(f"OpenAPI schema snapshot written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
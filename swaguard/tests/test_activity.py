@@ -0,0 +1,77 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from swaguard import SwagGuardMiddleware, SwagGuardRealm, create_login_router
+from swaguard.config import SwagGuardSettings
+from swaguard.core.activity import MIN_FLUSH_INTERVAL, ActivityTracker
+
+
+def test_tracker_coalesces_and_flushes():
+    settings = SwagGuardSettings()
+    tracker = ActivityTracker(settings, flush_interval=60)
+    for second in range(100):
+        tracker.touch("alice", "s1", now=1000.0 + second)
+    tracker.touch("alice", "s2", now=1200.0)
+    tracker.touch("bob", "s3", now=500.0)
+
+    # 저장소에 기록되기 전에도 조회 가능
+    assert settings.get_user_activity("alice") == {}
+    assert tracker.get_last_seen("alice") == 1200.0
+
+    assert tracker.flush() == 3
+    assert settings.get_user_activity("alice")["s1"] == {"first_seen": 1000.0, "last_seen": 1099.0, "hits": 100}
+
+    tracker.touch("alice", "s1", now=1300.0)
+    tracker.flush()
+    assert settings.get_user_activity("alice")["s1"]["hits"] == 101
+    assert tracker.active_users(within_seconds=200, now=1400.0) == {"alice": 1300.0}
+
+    # 제거된 사용자의 기록되지 않은 활동은 다음 기록 때 되살아나지 않음
+    settings.add_user("alice", "hash")
+    tracker.touch("alice", "s4", now=1500.0)
+    settings.remove_user("alice")
+    tracker.flush()
+    assert "alice" not in settings.get("user_activity")
+    assert tracker.get_last_seen("alice") is None
+
+    settings.add_user("carol", "hash")
+    settings.remove_user("carol")
+    assert "carol" not in settings.get("user_activity")
+
+
+def test_flush_interval_has_minimum():
+    settings = SwagGuardSettings({"activity_flush_seconds": 0})
+    assert ActivityTracker(settings).flush_interval == MIN_FLUSH_INTERVAL
+    assert ActivityTracker(settings, flush_interval=0).flush_interval == MIN_FLUSH_INTERVAL
+    assert ActivityTracker(settings, flush_interval=5).flush_interval == 5
+
+
+def test_tracker_keeps_recent_sessions():
+    settings = SwagGuardSettings({"activity_max_sessions": 3})
+    tracker = ActivityTracker(settings)
+    for index in range(10):
+        tracker.touch("alice", f"s{index}", now=float(index))
+    tracker.flush()
+    assert sorted(settings.get_user_activity("alice")) == ["s7", "s8", "s9"]
+
+
+def test_middleware_records_activity_write_behind():
+    realm = SwagGuardRealm("activity", cookie_secure=False, activity_flush_seconds=3600)
+    realm.create_user("admin", "adminpass")
+    app = FastAPI()
+    app.include_router(create_login_router(realm))
+    app.add_middleware(SwagGuardMiddleware, realms=[realm])
+
+    with TestClient(app) as client:
+        client.post("/swaguard/login", data={"username": "admin", "password": "adminpass"}, follow_redirects=False)
+        for _ in range(5):
+            assert client.get("/openapi.json").status_code == 200
+
+        # 요청 처리 중에는 저장소에 기록하지 않음
+        assert realm.settings.get_user_activity("admin") == {}
+        assert realm.get_last_seen("admin") is not None
+        assert list(realm.active_users()) == ["admin"]
+
+    # 종료(lifespan shutdown) 시 남은 기록을 저장
+    (session,) = realm.settings.get_user_activity("admin").values()
+    assert session["hits"] == 5
@@ -0,0 +1,164 @@
+import gzip
+import json
+import logging
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from swaguard import SwagGuardMiddleware, SwagGuardRealm, create_login_router
+from swaguard.analyze import RecordFilter, analyze, main, parse_time
+from swaguard.utils.sketches import HeavyHitters, LatencySketch
+
+
+def _records(count, start_ts):
+    for index in range(count):
+        yield {
+            "ts": start_ts + index,
+            "event": "login_failure" if index % 4 == 0 else "access",
+            "realm": "partner" if index % 2 else "public",
+            "user": f"user{index % 3}",
+            "ip": "10.0.0.9" if index % 4 == 0 else f"10.0.1.{index % 50}",
+            "path": "/docs/partner" if index % 2 else "/docs",
+            "status": 200,
+            "latency_ms": 1.0 + index % 100,
+        }
+
+
+def test_latency_sketch_accuracy_and_merge():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(2, 1) for _ in range(20000)]
+    left, right = LatencySketch(), LatencySketch()
+    for index, value in enumerate(values):
+        (left if index % 2 else right).add(value)
+    left.merge(right)
+
+    values.sort()
+    for q in (0.5, 0.9, 0.99):
+        exact = values[int(q * (len(values) - 1))]
+        assert abs(left.quantile(q) - exact) <= exact * 0.02
+    assert len(left.buckets) < 1000
+
+
+def test_heavy_hitters_bounded_and_mergeable():
+    left, right = HeavyHitters(capacity=10), HeavyHitters(capacity=10)
+    for index in range(5000):
+        sketch = left if index % 2 else right
+        sketch.add("hot" if index % 3 == 0 else f"cold-{index}")
+    left.merge(right)
+
+    assert len(left.counts) <= 10
+    item, count = left.top(1)[0]
+    assert item == "hot"
+    assert 1667 - 5000 / 11 <= count <= 1667
+
+
+def test_analyze_json_gzip_and_sqlite(tmp_path):
+    start = parse_time("2026-07-01")
+    records = list(_records(400, start))
+
+    plain = tmp_path / "audit.log"
+    plain.write_text("\n".join(json.dumps(r) for r in records[:200]) + "\nnot json\n")
+    rotated = tmp_path / "audit.log.1.gz"
+    with gzip.open(rotated, "wt") as f:
+        f.write("\n".join(json.dumps(r) for r in records[200:300]))
+    database = tmp_path / "audit.db"
+    with sqlite3.connect(database) as connection:
+        connection.execute(
+            "CREATE TABLE audit_log (ts REAL, event TEXT, realm TEXT, user TEXT, ip TEXT,"
+            " path TEXT, status INTEGER, latency_ms REAL)"
+        )
+        connection.executemany(
+            "INSERT INTO audit_log VALUES (:ts, :event, :realm, :user, :ip, :path, :status, :latency_ms)",
+            records[300:],
+        )
+    paths = [str(plain), str(rotated), str(database)]
+
+    summary = analyze(paths, jobs=2)
+    assert summary.records == 400
+    assert summary.malformed == 1
+    assert summary.events == {"access": 300, "login_failure": 100}
+    assert summary.ips.top(1) == [("10.0.0.9", 100)]
+
+    # 파트너 문서 접근만, 기간 제한
+    partner = RecordFilter(since=start + 100, events=["access"], path_prefix="/docs/partner")
+    assert analyze(paths, partner, jobs=1).records == 150
+
+
+def test_wrongly_typed_records_counted_as_malformed(tmp_path):
+    start = parse_time("2026-07-01")
+    records = list(_records(10, start))
+    records[0]["ts"] = "2026-07-01T00:00:00"
+    records[1]["user"] = 5
+    records[2]["path"] = ["/docs"]
+    records[3]["status"] = "200"
+    records[4]["latency_ms"] = "slow"
+    records[5]["latency_ms"] = None
+
+    first, second = tmp_path / "audit.log", tmp_path / "audit.log.1"
+    first.write_text("\n".join(json.dumps(r) for r in records[:5]))
+    second.write_text("\n".join(json.dumps(r) for r in records[5:]))
+
+    # 잘못된 레코드가 있어도 실행(프로세스 풀 포함)이 중단되지 않고 malformed로 집계됨
+    record_filter = RecordFilter(since=start, path_prefix="/docs", user="user1")
+    summary = analyze([str(first), str(second)], record_filter, jobs=2)
+    assert summary.malformed == 5
+    assert summary.records == 1
+
+    summary = analyze([str(first), str(second)], jobs=1)
+    assert summary.malformed == 5
+    assert summary.records == 5
+    assert summary.latency.count == 4
+
+
+def test_cli_json_output(tmp_path, capsys):
+    path = tmp_path / "audit.log"
+    path.write_text("\n".join(json.dumps(r) for r in _records(100, parse_time("2026-07-01"))))
+
+    assert main([str(path), "--event", "login_failure", "--top", "1", "--json", "--jobs", "1"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["records"] == 25
+    assert report["top_ips"] == [["10.0.0.9", 25]]
+    assert report["latency_ms"]["count"] == 25
+
+
+def test_cli_stdout_is_json_without_users(tmp_path):
+    # 사용자가 없는 환경에서 실행해도 기본 사용자 안내가 표준 출력에 섞이지 않아야 함
+    path = tmp_path / "audit.log"
+    path.write_text("\n".join(json.dumps(r) for r in _records(10, parse_time("2026-07-01"))))
+    env = {k: v for k, v in os.environ.items() if not k.startswith("SWAGUARD_")}
+    env["PYTHONPATH"] = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    result = subprocess.run(
+        [sys.executable, "-m", "swaguard.analyze", str(path), "--json", "--jobs", "1"],
+        cwd=tmp_path, env=env, capture_output=True, text=True, check=True,
+    )
+    assert json.loads(result.stdout)["records"] == 10
+    assert "Default credentials" not in result.stdout + result.stderr
+
+
+def test_middleware_and_login_emit_audit_events(caplog):
+    realm = SwagGuardRealm("audit", cookie_secure=False)
+    realm.create_user("admin", "adminpass")
+    app = FastAPI()
+    app.include_router(create_login_router(realm))
+    app.add_middleware(SwagGuardMiddleware, realms=[realm])
+    client = TestClient(app)
+
+    with caplog.at_level(logging.INFO, logger="swaguard.audit"):
+        client.post("/swaguard/login", data={"username": "admin", "password": "nope"}, follow_redirects=False)
+        client.post("/swaguard/login", data={"username": "admin", "password": "adminpass"}, follow_redirects=False)
+        client.get("/openapi.json")
+        client.get("/swaguard/logout")
+
+    events = [json.loads(record.getMessage()) for record in caplog.records if record.name == "swaguard.audit"]
+    assert [event["event"] for event in events] == ["login_failure", "login_success", "access", "logout"]
+    assert events[3]["user"] == "admin"
+    assert events[2]["user"] == "admin"
+    assert events[2]["status"] == 200
+    assert events[2]["realm"] == "audit"
+    assert events[2]["latency_ms"] >= 0
@@ -1,9 +1,12 @@
+import asyncio
+import base64
 import pytest
 import time
 from unittest.mock import patch, MagicMock
 
-from swaguard.core.auth import authenticate_user, create_auth_cookie, verify_auth_cookie
-from swaguard.core.security import hash_password
+from swaguard.core.auth import authenticate_user, authenticate_basic, authenticate_basic_async, create_auth_cookie, verify_auth_cookie
+from swaguard.core.credentials import get_credential_cache
+from swaguard.core.security import hash_password, verify_password
 from swaguard.config import config
 
 
@@ -93,3 +96,51 @@ def test_expired_cookie():
     
     # 만료된 쿠키 검증
     assert verify_auth_cookie(expired_cookie) is None
+
+
+def _basic_header(username, password):
+    token = base64.b64encode(f"{username}:{password}".encode("utf-8")).decode("ascii")
+    return f"Basic {token}"
+
+
+def test_authenticate_basic_uses_cache(setup_test_user):
+    username, password = setup_test_user
+    cache = get_credential_cache()
+    cache.invalidate()
+    
+    # 첫 요청은 bcrypt 검증, 이후 요청은 캐시 적중
+    with patch("swaguard.core.auth.verify_password", wraps=verify_password) as checker:
+        assert authenticate_basic(_basic_header(username, password)) == username
+        assert authenticate_basic(_basic_header(username, password)) == username
+        assert checker.call_count == 1
+    
+    # 잘못된 비밀번호는 캐시에서 통과되지 않아야 함
+    assert authenticate_basic(_basic_header(username, "wrongpassword")) is None
+    assert authenticate_basic("Bearer something") is None
+    assert authenticate_basic("Basic not-base64!") is None
+    assert cache.stats()["hits"] >= 1
+
+
+def test_basic_cache_invalidated_on_user_change(setup_test_user):
+    username, password = setup_test_user
+    assert authenticate_basic(_basic_header(username, password)) == username
+    
+    # 비밀번호 변경 시 이전 자격 증명은 더 이상 통과되지 않아야 함
+    config.add_user(username, hash_password("newpassword"))
+    assert authenticate_basic(_basic_header(username, password)) is None
+    assert authenticate_basic(_basic_header(username, "newpassword")) == username
+    
+    # 사용자 제거 시에도 캐시가 무효화되어야 함
+    config.remove_user(username)
+    assert authenticate_basic(_basic_header(username, "newpassword")) is None
+
+
+def test_authenticate_basic_async(setup_test_user):
+    username, password = setup_test_user
+    get_credential_cache().invalidate()
+
+    # 비동기 버전은 설정된 인증 백엔드로 확인하며 같은 자격 증명 캐시를 사용함
+    assert asyncio.run(authenticate_basic_async(_basic_header(username, password))) == username
+    assert authenticate_basic(_basic_header(username, password)) == username
+    assert asyncio.run(authenticate_basic_async(_basic_header(username, "wrongpassword"))) is None
+    assert asyncio.run(authenticate_basic_async("Basic not-base64!")) is None
@@ -0,0 +1,78 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from swaguard import SwagGuardMiddleware, SwagGuardRealm
+from swaguard.config import SwagGuardSettings
+from swaguard.core.authz import RoleTable, get_role_table
+
+
+def test_role_table_decisions():
+    table = RoleTable({
+        "internal": {"allow": ["/"]},
+        "partner": {"allow": ["/docs", "/openapi.json"], "deny": ["/docs/internal"]},
+    })
+
+    assert table.is_allowed(["internal"], "/docs/internal/x") is True
+    assert table.is_allowed(["partner"], "/docs") is True
+    assert table.is_allowed(["partner"], "/docs/internal/x") is False
+    assert table.is_allowed(["partner"], "/redoc") is False
+    # 역할 중 하나라도 거부하면 거부
+    assert table.is_allowed(["partner", "internal"], "/docs/internal") is False
+    assert table.is_allowed([], "/docs") is False
+    assert table.is_allowed(["unknown"], "/docs") is False
+
+
+def test_role_table_compiled_once_per_version():
+    settings = SwagGuardSettings()
+    assert get_role_table(settings) is None
+
+    settings.set_role_rules("partner", allow=["/docs"])
+    table = get_role_table(settings)
+    assert table is get_role_table(settings)
+
+    settings.set_role_rules("internal", allow=["/"])
+    assert get_role_table(settings) is not table
+
+
+def test_middleware_forbids_by_role():
+    realm = SwagGuardRealm("roles", cookie_secure=False)
+    realm.settings.set_role_rules("internal", allow=["/"])
+    realm.settings.set_role_rules("partner", allow=["/docs"])
+    realm.create_user("acme", "acmepass", roles=["partner"])
+
+    app = FastAPI()
+    app.add_middleware(SwagGuardMiddleware, realms=[realm])
+    client = TestClient(app)
+
+    cookie_value, _ = realm.create_auth_cookie("acme")
+    client.cookies.set("swaguard_auth", cookie_value)
+    assert client.get("/docs").status_code == 200
+    assert client.get("/openapi.json").status_code == 403
+
+
+def test_role_change_revokes_existing_sessions():
+    realm = SwagGuardRealm("demoted", cookie_secure=False)
+    realm.settings.set_role_rules("internal", allow=["/"])
+    realm.settings.set_role_rules("partner", allow=["/docs"])
+    realm.create_user("acme", "acmepass", roles=["internal"])
+
+    app = FastAPI()
+    app.add_middleware(SwagGuardMiddleware, realms=[realm])
+    client = TestClient(app)
+
+    cookie_value, _ = realm.create_auth_cookie("acme")
+    client.cookies.set("swaguard_auth", cookie_value)
+    assert client.get("/openapi.json").status_code == 200
+
+    # 강등되면 이전 역할이 담긴 쿠키는 더 이상 받아들이지 않음
+    realm.settings.set_user_roles("acme", ["partner"])
+    assert client.get("/openapi.json").status_code == 401
+
+    cookie_value, _ = realm.create_auth_cookie("acme")
+    client.cookies.set("swaguard_auth", cookie_value)
+    assert client.get("/openapi.json").status_code == 403
+    assert client.get("/docs").status_code == 200
+
+    # 같은 역할을 다시 설정하면 세션을 유지
+    realm.settings.set_user_roles("acme", ["partner"])
+    assert client.get("/docs").status_code == 200
@@ -0,0 +1,35 @@
+from swaguard.utils.cookies import extract_cookie
+
+
+def _headers(*cookie_values):
+    return [(b"host", b"testserver")] + [(b"cookie", value) for value in cookie_values]
+
+
+def test_extract_cookie_basic():
+    headers = _headers(b"a=1; swaguard_auth=abc.def; b=2")
+    assert extract_cookie(headers, b"swaguard_auth") == "abc.def"
+    assert extract_cookie(headers, b"a") == "1"
+    assert extract_cookie(headers, b"b") == "2"
+    assert extract_cookie(headers, b"missing") is None
+    assert extract_cookie([], b"a") is None
+
+
+def test_extract_cookie_boundaries():
+    # 이름이 다른 쿠키 이름의 접미사이거나 다른 쿠키 값 안에 있으면 무시
+    headers = _headers(b"xswaguard_auth=bad; other=swaguard_auth=bad;swaguard_auth=good")
+    assert extract_cookie(headers, b"swaguard_auth") == "good"
+
+    # 공백, 탭, 빈 값
+    assert extract_cookie(_headers(b"a=1;\t swaguard_auth =x;  swaguard_auth=  y  "), b"swaguard_auth") == "y"
+    assert extract_cookie(_headers(b"swaguard_auth="), b"swaguard_auth") == ""
+
+
+def test_extract_cookie_quoted_and_multiple_headers():
+    headers = _headers(b"a=1", b'swaguard_auth="eyJzdWIiOiAiYSJ9.abc="')
+    assert extract_cookie(headers, b"swaguard_auth") == "eyJzdWIiOiAiYSJ9.abc="
+
+    # 이스케이프가 포함된 따옴표 값은 http.cookies와 같은 규칙으로 해제
+    assert extract_cookie(_headers(b'a="x\\"y"'), b"a") == 'x"y'
+
+    # 같은 이름이 여러 번 나오면 처음 값 사용
+    assert extract_cookie(_headers(b"a=first", b"a=second"), b"a") == "first"
@@ -0,0 +1,154 @@
+import asyncio
+
+import pytest
+
+from swaguard import SwagGuardRealm
+from swaguard.backends.memory import MemoryBackend
+from swaguard.core.generations import GenerationSync, get_generation_sync
+from swaguard.core.resilience import ResilientBackend
+from swaguard.exceptions.AuthExceptions import BackendUnavailableError, StateBackendError
+
+
+def test_generations_shared_between_workers():
+    # 같은 realm을 실행하는 두 워커: 설정(사용자 저장소)은 따로, 공유 상태 백엔드는 하나
+    backend = MemoryBackend()
+    first = SwagGuardRealm("shared", secret_key="shared-key")
+    second = SwagGuardRealm("shared", secret_key="shared-key")
+    first_sync = GenerationSync(first.settings, backend)
+    second_sync = GenerationSync(second.settings, backend)
+
+    async def sync_all():
+        await first_sync.sync()
+        await second_sync.sync()
+
+    cookie, _ = second.create_auth_cookie("alice")
+    first.revoke_sessions("alice")
+    # 동기화 전에는 다른 워커에 아직 반영되지 않음
+    assert second.verify_auth_cookie(cookie) == "alice"
+
+    asyncio.run(sync_all())
+    assert second.verify_auth_cookie(cookie) is None
+    assert first.verify_auth_cookie(cookie) is None
+
+    # 새 세대로 발급된 쿠키는 양쪽에서 유효
+    fresh, _ = first.create_auth_cookie("alice")
+    assert second.verify_auth_cookie(fresh) == "alice"
+
+    # 두 워커에서 동시에 무효화해도 증가분이 유실되지 않고 같은 세대로 수렴
+    first.revoke_sessions("alice")
+    second.revoke_sessions("alice")
+    asyncio.run(sync_all())
+    asyncio.run(sync_all())
+    assert first.settings.get_user_generation("alice") == second.settings.get_user_generation("alice") == 3
+    assert second.verify_auth_cookie(fresh) is None
+
+    # 다른 워커가 더 새로운 세대로 발급한 쿠키는 동기화 전에도 받아들임
+    second.revoke_sessions("bob")
+    newer, _ = second.create_auth_cookie("bob")
+    assert first.verify_auth_cookie(newer) == "bob"
+
+
+def test_persisted_generations_not_added_on_startup():
+    # 저장된 세대 번호(3)로 시작하는 두 워커: 시작 값은 증가분이 아니므로 더해지지 않아야 함
+    backend = MemoryBackend()
+
+    def start_worker():
+        realm = SwagGuardRealm("persisted", secret_key="persisted-key")
+        realm.settings.config["user_generations"] = {"alice": 3, "bob": 1}
+        return realm, GenerationSync(realm.settings, backend)
+
+    async def sync_all(syncs):
+        for sync in syncs:
+            await sync.sync()
+
+    first, first_sync = start_worker()
+    second, second_sync = start_worker()
+    cookie, _ = first.create_auth_cookie("alice")
+    for _ in range(3):
+        asyncio.run(sync_all([first_sync, second_sync]))
+    remote = asyncio.run(backend.hget_all(first_sync.key))
+    assert remote == {"alice": b"3", "bob": b"1"}
+    assert first.settings.get_user_generation("alice") == second.settings.get_user_generation("alice") == 3
+    assert second.verify_auth_cookie(cookie) == "alice"
+
+    # 재시작한 워커도 같은 값을 유지
+    restarted, restarted_sync = start_worker()
+    for _ in range(2):
+        asyncio.run(sync_all([restarted_sync, first_sync]))
+    assert asyncio.run(backend.hget_all(first_sync.key)) == remote
+    assert restarted.settings.get_user_generation("alice") == 3
+    assert restarted.verify_auth_cookie(cookie) == "alice"
+
+    # 시작 이후에 올린 세대 번호는 증가분으로 전파됨
+    restarted.revoke_sessions("alice")
+    asyncio.run(sync_all([restarted_sync, first_sync, second_sync]))
+    assert second.settings.get_user_generation("alice") == 4
+    assert second.verify_auth_cookie(cookie) is None
+
+
+def test_generation_sync_retries_after_outage():
+    class FlakyBackend(MemoryBackend):
+        down = False
+
+        async def hincr(self, key, field, amount=1):
+            if self.down:
+                raise StateBackendError("connection refused")
+            return await super().hincr(key, field, amount)
+
+    backend = FlakyBackend()
+    first = SwagGuardRealm("flaky", secret_key="flaky-key")
+    second = SwagGuardRealm("flaky", secret_key="flaky-key")
+    first_sync = GenerationSync(first.settings, ResilientBackend(backend, first.settings))
+    second_sync = GenerationSync(second.settings, backend)
+    cookie, _ = second.create_auth_cookie("alice")
+
+    # 장애 중의 무효화는 로컬 대체 응답으로 사라지지 않고 복구 후에 전파됨
+    backend.down = True
+    first.revoke_sessions("alice")
+    with pytest.raises(StateBackendError):
+        asyncio.run(first_sync.sync())
+    backend.down = False
+    asyncio.run(first_sync.sync())
+    asyncio.run(second_sync.sync())
+    assert second.verify_auth_cookie(cookie) is None
+
+
+def test_generation_sync_goes_through_breaker():
+    class CountingBackend(MemoryBackend):
+        down = False
+        calls = 0
+
+        async def hget_all(self, key):
+            self.calls += 1
+            if self.down:
+                raise StateBackendError("connection refused")
+            return await super().hget_all(key)
+
+    backend = CountingBackend()
+    realm = SwagGuardRealm("breaker", secret_key="breaker-key")
+    realm.settings.config.update({"breaker_failure_threshold": 1, "breaker_reset_seconds": 60})
+    resilient = ResilientBackend(backend, realm.settings)
+    sync = GenerationSync(realm.settings, resilient)
+
+    backend.down = True
+    realm.revoke_sessions("alice")
+    with pytest.raises(StateBackendError):
+        asyncio.run(sync.sync())
+    # 회로가 열린 동안에는 백엔드를 호출하지 않고 로컬 세대 번호를 유지
+    calls = backend.calls
+    with pytest.raises(BackendUnavailableError):
+        asyncio.run(sync.sync())
+    assert backend.calls == calls
+    assert resilient.breaker.state == "open"
+    assert realm.settings.get_user_generation("alice") == 1
+    asyncio.run(sync.stop())
+    assert realm.settings.get_user_generation("alice") == 1
+
+
+def test_generation_sync_requires_state_backend():
+    assert get_generation_sync(SwagGuardRealm("local").settings) is None
+
+    realm = SwagGuardRealm("remote", state_backend_url="redis://127.0.0.1:1/0")
+    sync = get_generation_sync(realm.settings)
+    assert sync is get_generation_sync(realm.settings)
+    assert sync.key == "swaguard:generations:remote"
@@ -0,0 +1,108 @@
+import json
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from swaguard import SwagGuardRealm, create_login_router
+from swaguard.core.jwt import b64url_decode, b64url_encode
+
+
+def _write_private_key(tmp_path, private_key):
+    from cryptography.hazmat.primitives import serialization
+
+    path = tmp_path / "jwt_key.pem"
+    path.write_bytes(private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ))
+    return str(path)
+
+
+def test_hs256_cookie_roundtrip():
+    realm = SwagGuardRealm("jwt-hs", token_format="jwt")
+    realm.create_user("ops", "opspass", roles=["internal"])
+    token, _ = realm.create_auth_cookie("ops")
+
+    header = json.loads(b64url_decode(token.split(".")[0]))
+    assert header == {"alg": "HS256", "typ": "JWT", "kid": "swaguard-1"}
+
+    claims = realm.decode_auth_cookie(token)
+    assert claims["sub"] == "ops"
+    assert claims["roles"] == ["internal"]
+    assert claims["iss"] == "swaguard"
+
+    # alg를 none으로 바꾼 토큰은 거부
+    forged_header = b64url_encode(json.dumps({"alg": "none", "kid": "swaguard-1"}).encode())
+    forged = forged_header + "." + token.split(".")[1] + "."
+    assert realm.decode_auth_cookie(forged) is None
+
+    # 다른 realm의 키로 서명된 토큰은 거부
+    other = SwagGuardRealm("jwt-other", token_format="jwt")
+    assert other.decode_auth_cookie(token) is None
+
+
+@pytest.mark.parametrize("token", ["W10.e30.AAAA", "IjEi.e30.AAAA", "!!!.e30.AAAA", "bm90IGpzb24.e30.AAAA"])
+def test_malformed_header_rejected(token):
+    # 객체가 아닌 헤더(배열, 문자열)나 base64/JSON이 아닌 헤더는 예외 없이 거부
+    realm = SwagGuardRealm("jwt-malformed", token_format="jwt")
+    assert realm.verify_auth_cookie(token) is None
+
+
+@pytest.mark.parametrize("algorithm", ["EdDSA", "ES256"])
+def test_asymmetric_cookie_and_jwks(tmp_path, algorithm):
+    pytest.importorskip("cryptography")
+    from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+    if algorithm == "EdDSA":
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        private_key = ec.generate_private_key(ec.SECP256R1())
+
+    realm = SwagGuardRealm(
+        f"jwt-{algorithm}",
+        token_format="jwt",
+        jwt_algorithm=algorithm,
+        jwt_kid="edge-1",
+        jwt_private_key_path=_write_private_key(tmp_path, private_key),
+    )
+    realm.create_user("ops", "opspass")
+    token, _ = realm.create_auth_cookie("ops")
+    assert realm.verify_auth_cookie(token) == "ops"
+
+    tampered = token[:-4] + ("AAAA" if not token.endswith("AAAA") else "BBBB")
+    assert realm.verify_auth_cookie(tampered) is None
+
+    app = FastAPI()
+    app.include_router(create_login_router(realm))
+    (jwk,) = TestClient(app).get("/swaguard/.well-known/jwks.json").json()["keys"]
+    assert jwk["kid"] == "edge-1"
+    assert jwk["alg"] == algorithm
+    assert "d" not in jwk
+
+
+def test_rotated_key_file_reloaded(tmp_path):
+    pytest.importorskip("cryptography")
+    import os
+    from cryptography.hazmat.primitives.asymmetric import ed25519
+
+    path = _write_private_key(tmp_path, ed25519.Ed25519PrivateKey.generate())
+    realm = SwagGuardRealm(
+        "jwt-rotate", token_format="jwt", jwt_algorithm="EdDSA", jwt_private_key_path=path,
+        jwt_key_check_seconds=0.2,
+    )
+    realm.create_user("ops", "opspass")
+    old_token, _ = realm.create_auth_cookie("ops")
+    assert realm.verify_auth_cookie(old_token) == "ops"
+
+    # 같은 경로의 키 파일을 교체하면 확인 간격이 지난 뒤 새 키로 서명하고 이전 키의 토큰은 거부됨
+    stat = os.stat(path)
+    _write_private_key(tmp_path, ed25519.Ed25519PrivateKey.generate())
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert realm.verify_auth_cookie(old_token) == "ops"
+    time.sleep(0.25)
+    assert realm.verify_auth_cookie(old_token) is None
+    new_token, _ = realm.create_auth_cookie("ops")
+    assert realm.verify_auth_cookie(new_token) == "ops"
@@ -0,0 +1,219 @@
+import asyncio
+
+import pytest
+
+from swaguard.backends.ldap import (
+    TAG_BIND_REQUEST, TAG_BIND_RESPONSE, TAG_ENUMERATED, TAG_INTEGER, TAG_OCTET_STRING, TAG_SEQUENCE,
+    LDAPAuthBackend, ber_decode_all, ber_encode, ber_integer, escape_dn_value, get_ldap_backend, read_message,
+)
+from swaguard.config import SwagGuardSettings
+from swaguard.core.auth import authenticate_user_async
+from swaguard.core.resilience import ResilientAuthBackend
+from swaguard.exceptions.AuthExceptions import AuthBackendError
+
+
+class FakeLDAPServer:
+    """테스트용 in-process LDAP 서버 (단순 바인드만 지원)"""
+
+    def __init__(self, directory, delay=0.0, raw_reply=None):
+        self.directory = directory
+        self.delay = delay
+        # 설정하면 바인드 응답 대신 이 바이트열을 그대로 보냄 (잘못된 형식의 응답 시험용)
+        self.raw_reply = raw_reply
+        self.binds = 0
+        self.connections = 0
+        self.server = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return f"ldap://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                _, body = await read_message(reader)
+                (_, message_id), (tag, request) = ber_decode_all(body)[:2]
+                if tag != TAG_BIND_REQUEST:
+                    break
+                self.binds += 1
+                await asyncio.sleep(self.delay)
+                if self.raw_reply is not None:
+                    writer.write(self.raw_reply)
+                    await writer.drain()
+                    continue
+                _, (_, dn), (_, password) = ber_decode_all(request)
+                # 디렉터리 값이 정수이면 그 결과 코드로 응답 (잠긴 계정 등)
+                entry = self.directory.get(dn.decode())
+                if isinstance(entry, int):
+                    code = entry
+                else:
+                    code = 0 if entry == password.decode() else 49
+                response = ber_encode(TAG_BIND_RESPONSE, (
+                    ber_integer(TAG_ENUMERATED, code)
+                    + ber_encode(TAG_OCTET_STRING, b"")
+                    + ber_encode(TAG_OCTET_STRING, b"")
+                ))
+                writer.write(ber_encode(TAG_SEQUENCE, ber_encode(TAG_INTEGER, message_id) + response))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        writer.close()
+
+
+DIRECTORY = {
+    "uid=alice,ou=people,dc=example,dc=com": "wonderland",
+    "uid=locked,ou=people,dc=example,dc=com": 53,  # unwillingToPerform (잠긴 계정)
+    "uid=broken,ou=people,dc=example,dc=com": 80,  # other (서버 오류)
+}
+
+
+def test_escape_dn_value():
+    assert escape_dn_value("alice") == "alice"
+    assert escape_dn_value("a,ou=admins") == "a\\,ou\\=admins"
+    assert escape_dn_value(" #x ") == "\\ #x\\ "
+
+
+def test_ldap_backend_pool_and_cache():
+    async def scenario():
+        server = FakeLDAPServer(DIRECTORY)
+        backend = LDAPAuthBackend(
+            await server.start(), "uid={username},ou=people,dc=example,dc=com", pool_size=2
+        )
+        try:
+            assert await backend.authenticate("alice", "wrong") is False
+            assert await backend.authenticate("alice", "") is False
+            assert await backend.authenticate("bob", "wonderland") is False
+
+            # 동시 로그인이 몰려도 풀 크기 이상의 연결을 열지 않고, 같은 자격 증명은 바인드 한 번으로 처리
+            binds = server.binds
+            results = await asyncio.gather(
+                *[backend.authenticate("alice", "wonderland") for _ in range(10)],
+                *[backend.authenticate("alice", f"wrong-{index}") for index in range(5)],
+            )
+            assert results == [True] * 10 + [False] * 5
+            assert server.connections <= 2
+            assert server.binds == binds + 6
+
+            # 성공한 결과는 캐시됨
+            assert await backend.authenticate("alice", "wonderland") is True
+            assert server.binds == binds + 6
+        finally:
+            await backend.close()
+            await server.stop()
+
+    asyncio.run(scenario())
+
+
+def test_ldap_backend_timeout():
+    async def scenario():
+        server = FakeLDAPServer(DIRECTORY, delay=0.5)
+        backend = LDAPAuthBackend(await server.start(), "uid={username},ou=people,dc=example,dc=com", timeout=0.1)
+        try:
+            with pytest.raises(AuthBackendError):
+                await backend.authenticate("alice", "wonderland")
+        finally:
+            await backend.close()
+            await server.stop()
+
+    asyncio.run(scenario())
+
+
+def test_authenticate_user_with_ldap_backend():
+    async def scenario():
+        server = FakeLDAPServer(DIRECTORY)
+        settings = SwagGuardSettings({"auth_backend": "ldap", "ldap_url": await server.start()})
+        try:
+            assert await authenticate_user_async("alice", "wonderland", settings=settings) is True
+            assert await authenticate_user_async("alice", "nope", settings=settings) is False
+        finally:
+            await server.stop()
+
+    asyncio.run(scenario())
+
+
+def test_account_rejections_do_not_trip_breaker():
+    async def scenario():
+        server = FakeLDAPServer(DIRECTORY)
+        settings = SwagGuardSettings({"breaker_failure_threshold": 2, "backend_policies": {"authenticate": "fail_closed"}})
+        backend = ResilientAuthBackend(
+            LDAPAuthBackend(await server.start(), "uid={username},ou=people,dc=example,dc=com"), settings
+        )
+        try:
+            # 계정별 거부 응답은 인증 실패일 뿐 서버 장애가 아님
+            for _ in range(5):
+                assert await backend.authenticate("locked", "secret") is False
+            assert backend.breaker.state == "closed"
+            assert await backend.authenticate("alice", "wonderland") is True
+
+            # 그 밖의 결과 코드는 백엔드 오류로 세어 차단기를 엶
+            for _ in range(2):
+                assert await backend.authenticate("broken", "secret") is False
+            assert backend.breaker.state == "open"
+        finally:
+            await backend.close()
+            await server.stop()
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("raw_reply", [
+    bytes((TAG_SEQUENCE, 3, TAG_INTEGER, 5, 1)),  # 길이가 잘린 메시지 ID
+    ber_encode(TAG_SEQUENCE, ber_encode(TAG_INTEGER, b"\x01") + ber_encode(TAG_BIND_RESPONSE, b"")),  # 빈 바인드 응답
+])
+def test_malformed_bind_response_applies_policy(raw_reply):
+    async def scenario():
+        server = FakeLDAPServer(DIRECTORY, raw_reply=raw_reply)
+        url = await server.start()
+        directory = LDAPAuthBackend(url, "uid={username},ou=people,dc=example,dc=com")
+        try:
+            with pytest.raises(AuthBackendError):
+                await directory.authenticate("alice", "wonderland")
+
+            # 이전에 성공한 기록이 없으므로 last_known_good 정책에서도 거부됨
+            backend = ResilientAuthBackend(directory, SwagGuardSettings())
+            assert await backend.authenticate("alice", "wonderland") is False
+            assert backend.breaker.metrics()["failures"] == 1
+        finally:
+            await directory.close()
+            await server.stop()
+
+    asyncio.run(scenario())
+
+
+def test_ldap_backend_rebuilt_on_config_change():
+    async def scenario():
+        first, second = FakeLDAPServer(DIRECTORY), FakeLDAPServer({"cn=alice,dc=corp": "looking-glass"})
+        settings = SwagGuardSettings({"auth_backend": "ldap", "ldap_url": await first.start()})
+        try:
+            backend = get_ldap_backend(settings)
+            assert get_ldap_backend(settings) is backend
+            # LDAP과 관계없는 설정 변경(사용자 추가 등)에는 백엔드와 캐시를 유지
+            listeners = len(settings._user_listeners)
+            for index in range(5):
+                settings.add_user(f"local-{index}", "hash")
+            assert get_ldap_backend(settings) is backend
+            assert len(settings._user_listeners) == listeners
+            assert await authenticate_user_async("alice", "wonderland", settings=settings) is True
+            assert backend.backend._idle
+
+            # 설정을 바꾸면 새 서버와 DN 템플릿을 사용하고 이전 풀의 연결은 닫힘
+            settings.set("ldap_url", await second.start())
+            settings.set("ldap_user_dn_template", "cn={username},dc=corp")
+            assert await authenticate_user_async("alice", "looking-glass", settings=settings) is True
+            assert get_ldap_backend(settings) is not backend
+            # 교체된 백엔드의 사용자 변경 콜백은 등록 해제됨
+            assert len(settings._user_listeners) == listeners
+            await asyncio.sleep(0)
+            assert not backend.backend._idle
+            assert second.binds == 1
+        finally:
+            await get_ldap_backend(settings).close()
+            await first.stop()
+            await second.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,124 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from swaguard import SwagGuardMiddleware, SwagGuardRealm, RealmMatcher, create_login_router
+from swaguard.config import SwagGuardSettings
+from swaguard.exceptions.AuthExceptions import ConfigurationError
+
+
+@pytest.fixture
+def realms():
+    public = SwagGuardRealm("public", protected_paths=["/docs", "/openapi.json"])
+    partner = SwagGuardRealm(
+        "partner",
+        cookie_name="partner_auth",
+        cookie_secure=False,
+        login_path="/partner/login",
+        logout_path="/partner/logout",
+        protected_paths=["/docs/partner", "/partner/openapi.json"],
+    )
+    partner.create_user("acme", "acmepass")
+    return public, partner
+
+
+def test_realm_matcher_longest_prefix(realms):
+    public, partner = realms
+    matcher = RealmMatcher([public, partner])
+
+    assert matcher.match("/docs") is public
+    assert matcher.match("/docs/partner/index.html") is partner
+    assert matcher.match("/partner/openapi.json") is partner
+    assert matcher.match("/api/items") is None
+
+    # 설정 변경 시 매처가 다시 컴파일되어야 함
+    partner.settings.add_protected_path("/partner/redoc")
+    assert matcher.match("/partner/redoc") is partner
+
+
+def test_realm_matcher_rejects_duplicate_paths(realms):
+    public, _ = realms
+    other = SwagGuardRealm("other", cookie_name="other_auth", protected_paths=["/docs"])
+    with pytest.raises(ConfigurationError):
+        RealmMatcher([public, other])
+
+
+def test_realm_matcher_rejects_duplicate_cookie_names(realms):
+    public, _ = realms
+    # 기본 쿠키 이름을 그대로 쓰면 두 realm이 서로의 쿠키를 덮어씀
+    other = SwagGuardRealm("other", protected_paths=["/other/docs"])
+    with pytest.raises(ConfigurationError):
+        RealmMatcher([public, other])
+
+
+def test_realm_secret_key_is_configurable(monkeypatch):
+    # 설정에 지정한 키는 프로세스가 달라도 같으므로 다른 워커가 발급한 쿠키를 검증할 수 있음
+    issuer = SwagGuardRealm("partner", settings=SwagGuardSettings({"secret_key": "partner-key"}))
+    worker = SwagGuardRealm("partner", settings=SwagGuardSettings({"secret_key": "partner-key"}))
+    assert issuer.secret_key == "partner-key"
+    cookie_value, _ = issuer.create_auth_cookie("acme")
+    assert worker.verify_auth_cookie(cookie_value) == "acme"
+
+    monkeypatch.setenv("SWAGUARD_REALM_PARTNER_API_SECRET_KEY", "env-key")
+    assert SwagGuardRealm("partner-api").secret_key == "env-key"
+
+    # 지정하지 않으면 전역 키에서 realm 이름별로 파생됨
+    assert SwagGuardRealm("a").secret_key == SwagGuardRealm("a").secret_key
+    assert SwagGuardRealm("a").secret_key != SwagGuardRealm("b").secret_key
+
+
+def test_realms_are_isolated(realms):
+    public, partner = realms
+
+    # 사용자 저장소와 서명 키가 realm별로 분리되어야 함
+    assert partner.authenticate_user("acme", "acmepass") is True
+    assert public.authenticate_user("acme", "acmepass") is False
+
+    cookie_value, _ = partner.create_auth_cookie("acme")
+    assert partner.verify_auth_cookie(cookie_value) == "acme"
+    assert public.verify_auth_cookie(cookie_value) is None
+
+
+def test_user_generation_revokes_sessions(realms):
+    _, partner = realms
+    first, _ = partner.create_auth_cookie("acme")
+    other, _ = partner.create_auth_cookie("acme")
+    assert partner.verify_auth_cookie(first) == "acme"
+
+    # 비밀번호 변경: 캐시에 있던 쿠키를 포함해 이전 세션이 모두 무효화되고 새 쿠키는 유효함
+    partner.create_user("acme", "newpass")
+    assert partner.verify_auth_cookie(first) is None
+    assert partner.verify_auth_cookie(other) is None
+    rotated, _ = partner.create_auth_cookie("acme")
+    assert partner.verify_auth_cookie(rotated) == "acme"
+
+    partner.revoke_sessions("acme")
+    assert partner.verify_auth_cookie(rotated) is None
+
+    # 제거 후 같은 이름으로 다시 추가해도 이전 쿠키는 살아나지 않음
+    current, _ = partner.create_auth_cookie("acme")
+    partner.remove_user("acme")
+    assert partner.verify_auth_cookie(current) is None
+    partner.create_user("acme", "acmepass")
+    assert partner.verify_auth_cookie(current) is None
+    assert partner.settings.get_user_generation("acme") == 3
+
+
+def test_middleware_dispatches_to_realm(realms):
+    public, partner = realms
+    app = FastAPI(docs_url=None, openapi_url="/partner/openapi.json")
+    app.add_middleware(SwagGuardMiddleware, realms=[public, partner])
+    app.include_router(create_login_router(partner))
+
+    client = TestClient(app)
+    assert client.get("/partner/openapi.json").status_code == 401
+
+    response = client.post(
+        "/partner/login",
+        data={"username": "acme", "password": "acmepass", "next": "/partner/openapi.json"},
+        follow_redirects=False,
+    )
+    assert response.status_code == 303
+    assert "partner_auth" in response.cookies
+
+    assert client.get("/partner/openapi.json").status_code == 200
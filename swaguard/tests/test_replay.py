@@ -0,0 +1,179 @@
+import asyncio
+import json
+
+import pytest
+
+from swaguard import SwagGuardMiddleware, SwagGuardRealm, create_login_router
+from swaguard.exceptions.AuthExceptions import ConfigurationError
+from swaguard.replay import ReplayHarness, build_replay_app, load_trace, main
+
+pytest.importorskip("httpx")
+
+
+def _write_trace(path, start=1_780_000_000.0):
+    lines = [
+        {"ts": start, "event": "login_failure", "user": "alice"},
+        {"ts": start + 0.01, "event": "login_success", "user": "alice"},
+        {"ts": start + 0.02, "event": "access", "user": "alice", "path": "/docs", "status": 200},
+        {"ts": start + 0.03, "event": "access", "user": "alice", "path": "/openapi.json", "status": 200},
+        {"ts": start + 0.04, "event": "access", "user": "bob", "path": "/docs", "status": 200},
+        {"ts": start + 0.05, "path": "/docs", "cookie": False},
+        {"ts": start + 0.06, "path": "/api/resource1/7", "cookie": True},
+    ]
+    path.write_text("\n".join(json.dumps(line) for line in lines) + "\n")
+
+
+def test_load_trace_maps_records_to_requests(tmp_path):
+    trace = tmp_path / "access.log"
+    _write_trace(trace)
+    events = load_trace([str(trace)])
+
+    assert [event.kind for event in events] == ["login"] * 2 + ["access"] * 5
+    assert [event.valid for event in events[:2]] == [False, True]
+    assert events[0].offset == 0 and events[-1].offset == pytest.approx(0.06)
+    assert events[5].user is None
+    assert events[6].user == "replay-user"
+    assert len(load_trace([str(trace)], limit=3)) == 3
+
+
+def test_replay_stages_report_latency_and_cpu(tmp_path):
+    trace = tmp_path / "access.log"
+    _write_trace(trace)
+    realms = []
+
+    def build():
+        app, realm = build_replay_app(routes=5)
+        realms.append(realm)
+        return app, realm
+
+    harness = ReplayHarness(build)
+    results = asyncio.run(harness.run(load_trace([str(trace)]), [1.0, 10.0]))
+    first, second = (result.to_dict() for result in results)
+
+    # 단계마다 새 애플리케이션과 realm(캐시)을 사용
+    assert len(realms) == 2 and realms[0].settings is not realms[1].settings
+
+    assert first["requests"] == second["requests"] == 7
+    assert first["errors"] == 0
+    # 로그인 실패/성공은 모두 303, 쿠키 있는 접근은 200, 쿠키 없는 문서 접근은 로그인으로 리디렉션
+    assert first["statuses"] == {"200": 4, "303": 2, "307": 1}
+    assert set(first["latency_ms"]) == {"all", "login", "docs", "schema", "unauthenticated", "other"}
+    assert first["latency_ms"]["all"]["count"] == 7
+    assert first["cpu_ms_per_request"] > 0
+    assert second["offered_rps"] == pytest.approx(first["offered_rps"] * 10, rel=0.01)
+
+
+def test_replay_reuses_existing_guard(tmp_path):
+    from fastapi import FastAPI
+
+    trace = tmp_path / "access.log"
+    _write_trace(trace)
+    realm = SwagGuardRealm("app", cookie_secure=False)
+
+    def build():
+        app = FastAPI()
+        app.include_router(create_login_router(realm))
+        app.add_middleware(SwagGuardMiddleware, realms=[realm])
+        return build_replay_app(app)
+
+    app, replay_realm = build()
+    # 미들웨어를 중복으로 붙이지 않고 애플리케이션의 realm으로 재생
+    assert replay_realm is realm
+    assert [middleware.cls for middleware in app.user_middleware] == [SwagGuardMiddleware]
+
+    result = asyncio.run(ReplayHarness(build).run(load_trace([str(trace)]), [10.0]))[0].to_dict()
+    assert result["errors"] == 0
+    assert result["statuses"] == {"200": 3, "303": 2, "307": 1, "404": 1}
+
+    guarded = FastAPI()
+    guarded.add_middleware(SwagGuardMiddleware, realms=[realm, SwagGuardRealm("other", cookie_name="other_auth")])
+    with pytest.raises(ConfigurationError):
+        build_replay_app(guarded)
+
+
+def test_main_json_output(tmp_path, capsys):
+    trace = tmp_path / "access.log"
+    _write_trace(trace)
+
+    assert main([str(trace), "--routes", "3", "--speed", "50", "--json"]) == 0
+    stages = json.loads(capsys.readouterr().out)
+    assert len(stages) == 1 and stages[0]["speed"] == 50
+
+    for speed in ("0", "-2"):
+        with pytest.raises(SystemExit):
+            main([str(trace), "--speed", speed])
+
+    empty = tmp_path / "empty.log"
+    empty.write_text("")
+    assert main([str(empty)]) == 1
+
+
+def test_main_calls_app_factory_per_stage(tmp_path, monkeypatch, capsys):
+    trace = tmp_path / "access.log"
+    _write_trace(trace)
+    (tmp_path / "replay_target.py").write_text(
+        "from fastapi import FastAPI\n"
+        "from swaguard import SwagGuardMiddleware, create_login_router\n"
+        "IMPORTS = globals().get('IMPORTS', 0) + 1\n"
+        "apps = []\n"
+        "def create_app():\n"
+        "    app = FastAPI()\n"
+        "    app.include_router(create_login_router())\n"
+        "    app.add_middleware(SwagGuardMiddleware)\n"
+        "    apps.append(app)\n"
+        "    return app\n"
+        "app = create_app()\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    assert main([str(trace), "--app", "replay_target:create_app", "--speed", "10", "--speed", "20", "--json"]) == 0
+    stages = json.loads(capsys.readouterr().out)
+    assert [stage["statuses"] for stage in stages] == [{"200": 3, "303": 2, "307": 1, "404": 1}] * 2
+
+    import replay_target
+    # 모듈은 한 번만 import하고, 팩토리는 로그인 경로 확인용 한 번과 단계마다 호출되며 미들웨어 설정은 바뀌지 않음
+    assert replay_target.IMPORTS == 1
+    assert len(replay_target.apps) == 4
+    assert all(app.user_middleware[0].kwargs == {} for app in replay_target.apps)
+
+    # 팩토리 대신 애플리케이션 객체를 지정하면 오류
+    with pytest.raises(SystemExit):
+        main([str(trace), "--app", "replay_target:app"])
+
+
+def test_replay_leaves_no_users_behind(tmp_path):
+    from fastapi import FastAPI
+
+    from swaguard.config import config
+    from swaguard.core.realm import default_realm
+
+    trace = tmp_path / "access.log"
+    _write_trace(trace)
+    # 기본 realm의 초기 사용자 설정이 끝난 뒤의 전역 사용자 저장소와 비교
+    default_realm()
+    users = dict(config.get_users())
+    generations = dict(config.get("user_generations", {}))
+    realms = []
+
+    def build():
+        # 전역 config의 기본 realm으로 보호되는 애플리케이션
+        app = FastAPI()
+        app.include_router(create_login_router())
+        app.add_middleware(SwagGuardMiddleware)
+        app, realm = build_replay_app(app)
+        realms.append(realm)
+        return app, realm
+
+    result = asyncio.run(ReplayHarness(build).run(load_trace([str(trace)]), [10.0, 20.0]))[1].to_dict()
+    # 재생 전용 realm으로 로그인과 인증이 처리됨
+    assert result["statuses"] == {"200": 3, "303": 2, "307": 1, "404": 1}
+    assert realms[0].settings is not realms[1].settings
+    assert realms[0].settings is not config
+    assert default_realm().settings is config
+
+    # 전역 사용자 저장소와 재생 realm 모두에 재생용 사용자가 남지 않음
+    assert config.get_users() == users
+    assert config.get("user_generations", {}) == generations
+    for realm in realms:
+        assert not set(realm.settings.get_users()) & {"alice", "bob", "replay-user"}
+        assert not set(realm.settings.get("user_generations")) & {"alice", "bob", "replay-user"}
@@ -0,0 +1,172 @@
+import asyncio
+
+import pytest
+
+from swaguard.backends.memory import MemoryBackend
+from swaguard.config import SwagGuardSettings
+from swaguard.core.resilience import (
+    CircuitBreaker, ResilientAuthBackend, ResilientBackend, get_breaker_metrics, get_policies,
+)
+from swaguard.exceptions.AuthExceptions import AuthBackendError, BackendUnavailableError, StateBackendError
+
+
+class FlakyAuthBackend:
+    def __init__(self, users):
+        self.users = users
+        self.down = False
+        self.calls = 0
+
+    async def authenticate(self, username, password):
+        self.calls += 1
+        if self.down:
+            raise AuthBackendError("directory unavailable")
+        return self.users.get(username) == password
+
+    async def close(self):
+        pass
+
+
+class FlakyStateBackend(MemoryBackend):
+    def __init__(self):
+        super().__init__()
+        self.down = False
+
+    async def get(self, key):
+        if self.down:
+            raise StateBackendError("connection refused")
+        return await super().get(key)
+
+    async def incr(self, key, amount=1, ttl=None):
+        if self.down:
+            raise StateBackendError("connection refused")
+        return await super().incr(key, amount, ttl)
+
+
+def test_circuit_breaker_opens_and_recovers():
+    async def scenario():
+        breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=0.05, deadline=0.05)
+        calls = []
+
+        async def failing():
+            calls.append(1)
+            raise OSError("down")
+
+        async def slow():
+            await asyncio.sleep(1)
+
+        async def ok():
+            return "ok"
+
+        with pytest.raises(OSError):
+            await breaker.call(failing)
+        with pytest.raises(BackendUnavailableError):
+            await breaker.call(slow)
+        assert breaker.metrics()["state"] == "open"
+        assert breaker.metrics()["timeouts"] == 1
+
+        # 열린 동안에는 백엔드를 호출하지 않음
+        with pytest.raises(BackendUnavailableError):
+            await breaker.call(failing)
+        assert len(calls) == 1
+
+        # reset_timeout 이후 시험 호출 실패 시 다시 열림
+        await asyncio.sleep(0.06)
+        with pytest.raises(OSError):
+            await breaker.call(failing)
+        assert breaker.state == "open"
+
+        await asyncio.sleep(0.06)
+        assert await breaker.call(ok) == "ok"
+        metrics = breaker.metrics()
+        assert metrics["state"] == "closed"
+        assert metrics["trips"] == 2
+        assert metrics["rejected"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_auth_backend_serves_last_known_good():
+    async def scenario():
+        settings = SwagGuardSettings({"breaker_failure_threshold": 1, "breaker_reset_seconds": 60})
+        directory = FlakyAuthBackend({"alice": "wonderland"})
+        backend = ResilientAuthBackend(directory, settings)
+
+        assert await backend.authenticate("alice", "wonderland") is True
+        directory.down = True
+        assert await backend.authenticate("alice", "wonderland") is True
+        assert await backend.authenticate("alice", "guess") is False
+        assert await backend.authenticate("bob", "builder") is False
+        assert directory.calls == 2
+
+        metrics = get_breaker_metrics(settings)["auth_backend"]
+        assert metrics["state"] == "open"
+        assert metrics["trips"] == 1
+        assert metrics["fallbacks"] == 3
+
+        closed = ResilientAuthBackend(directory, SwagGuardSettings({"backend_policies": {"authenticate": "fail_closed"}}))
+        assert await closed.authenticate("alice", "wonderland") is False
+
+    asyncio.run(scenario())
+
+
+def test_rejected_password_not_served_from_last_known_good():
+    async def scenario():
+        settings = SwagGuardSettings({"breaker_failure_threshold": 1, "breaker_reset_seconds": 60})
+        directory = FlakyAuthBackend({"alice": "wonderland", "bob": "builder"})
+        backend = ResilientAuthBackend(directory, settings)
+        assert await backend.authenticate("alice", "wonderland") is True
+        assert await backend.authenticate("bob", "builder") is True
+
+        # 디렉터리에서 alice의 비밀번호가 바뀐 뒤 이전 비밀번호가 거부됨
+        directory.users["alice"] = "looking-glass"
+        assert await backend.authenticate("alice", "wonderland") is False
+        # 다른 비밀번호의 실패로는 bob의 기록이 지워지지 않음
+        assert await backend.authenticate("bob", "guess") is False
+
+        directory.down = True
+        assert await backend.authenticate("alice", "wonderland") is False
+        assert backend.breaker.state == "open"
+        assert await backend.authenticate("alice", "wonderland") is False
+        assert await backend.authenticate("bob", "builder") is True
+
+    asyncio.run(scenario())
+
+
+def test_auth_backend_rejects_fail_open():
+    async def scenario():
+        settings = SwagGuardSettings({"backend_policies": {"authenticate": "fail_open", "state_read": "fail_open"}})
+        assert get_policies(settings) == {
+            "authenticate": "fail_closed", "state_read": "fail_open", "state_write": "last_known_good",
+        }
+
+        # 장애 중에도 알 수 없는 비밀번호는 거부되어야 함
+        directory = FlakyAuthBackend({"alice": "wonderland"})
+        directory.down = True
+        backend = ResilientAuthBackend(directory, settings)
+        assert await backend.authenticate("alice", "guess") is False
+        assert await backend.authenticate("mallory", "anything") is False
+
+    asyncio.run(scenario())
+
+
+def test_state_backend_policies():
+    async def scenario():
+        inner = FlakyStateBackend()
+        backend = ResilientBackend(inner, SwagGuardSettings({"breaker_failure_threshold": 100}))
+        await backend.set("revoked:abc", "1")
+        assert await backend.get("revoked:abc") == b"1"
+        assert await backend.incr("hits") == 1
+
+        inner.down = True
+        assert await backend.get("revoked:abc") == b"1"
+        assert await backend.get("unknown") is None
+        assert await backend.incr("hits") == 2
+
+        strict = ResilientBackend(inner, SwagGuardSettings({"backend_policies": {"state_read": "fail_closed"}}))
+        with pytest.raises(StateBackendError):
+            await strict.get("revoked:abc")
+
+        lenient = ResilientBackend(inner, SwagGuardSettings({"backend_policies": {"state_read": "fail_open"}}))
+        assert await lenient.get("revoked:abc") is None
+
+    asyncio.run(scenario())
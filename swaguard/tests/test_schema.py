@@ -0,0 +1,257 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from swaguard import SwagGuardMiddleware, SwagGuardRealm
+from swaguard.core.schema import OpenAPISchemaCache, get_schema_views, write_schema_snapshot
+
+
+class PartnerOrder(BaseModel):
+    id: int
+
+
+class AdminReport(BaseModel):
+    total: int
+
+
+def create_app(realm):
+    app = FastAPI()
+    app.add_middleware(SwagGuardMiddleware, realms=[realm])
+
+    @app.get("/partner/orders", tags=["partner"], response_model=PartnerOrder)
+    async def partner_orders():
+        return PartnerOrder(id=1)
+
+    @app.get("/admin/report", tags=["admin"], response_model=AdminReport)
+    async def admin_report():
+        return AdminReport(total=1)
+
+    return app
+
+
+def test_schema_filtered_by_role():
+    realm = SwagGuardRealm("schema", cookie_secure=False)
+    realm.settings.set_role_rules("internal", allow=["/"])
+    realm.settings.set_role_rules("partner", allow=["/docs", "/openapi.json"], tags=["partner"])
+    realm.create_user("acme", "acmepass", roles=["partner"])
+    realm.create_user("ops", "opspass", roles=["internal"])
+
+    app = create_app(realm)
+    client = TestClient(app)
+
+    client.cookies.set("swaguard_auth", realm.create_auth_cookie("acme")[0])
+    partner_schema = client.get("/openapi.json").json()
+    assert list(partner_schema["paths"]) == ["/partner/orders"]
+    assert set(partner_schema["components"]["schemas"]) == {"PartnerOrder"}
+
+    client.cookies.set("swaguard_auth", realm.create_auth_cookie("ops")[0])
+    response = client.get("/openapi.json")
+    assert set(response.json()["paths"]) == {"/partner/orders", "/admin/report"}
+    assert client.get("/openapi.json", headers={"If-None-Match": response.headers["etag"]}).status_code == 304
+
+
+def test_schema_reset_picks_up_runtime_routes():
+    realm = SwagGuardRealm("schema-reset", cookie_secure=False)
+    realm.settings.set_role_rules("partner", allow=["/openapi.json"], tags=["partner"])
+    realm.create_user("acme", "acmepass", roles=["partner"])
+
+    app = create_app(realm)
+    original = app.openapi
+    client = TestClient(app)
+    client.cookies.set("swaguard_auth", realm.create_auth_cookie("acme")[0])
+    response = client.get("/openapi.json")
+    assert list(response.json()["paths"]) == ["/partner/orders"]
+    # 변형은 Authorization 헤더의 자격 증명에 따라서도 달라짐
+    assert "Authorization" in response.headers["vary"]
+    # 미리 생성이나 스냅샷을 사용하지 않으면 app.openapi를 바꾸지 않음
+    assert app.openapi == original
+
+    @app.get("/partner/invoices", tags=["partner"])
+    async def partner_invoices():
+        return {}
+
+    app.openapi_schema = None
+    assert set(client.get("/openapi.json").json()["paths"]) == {"/partner/orders", "/partner/invoices"}
+
+
+def test_mounted_schema_filtered_off_event_loop():
+    realm = SwagGuardRealm("mounted", cookie_secure=False, protected_paths=["/partner/openapi.json"])
+    realm.settings.set_role_rules("partner", allow=["/partner/openapi.json"], tags=["partner"])
+    realm.create_user("acme", "acmepass", roles=["partner"])
+
+    sub = create_app(SwagGuardRealm("inner", protected_paths=[]))
+    on_loop = []
+    original = sub.openapi
+
+    def tracked_openapi():
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return original()
+
+    sub.openapi = tracked_openapi
+    app = FastAPI()
+    app.add_middleware(SwagGuardMiddleware, realms=[realm])
+    app.mount("/partner", sub)
+
+    client = TestClient(app)
+    client.cookies.set("swaguard_auth", realm.create_auth_cookie("acme")[0])
+    schema = client.get("/partner/openapi.json").json()
+    # 바깥 앱이 아닌 마운트된 서브 앱의 스키마가 역할에 맞게 필터링됨
+    assert list(schema["paths"]) == ["/partner/orders"]
+    assert schema["servers"] == [{"url": "/partner"}]
+    assert client.get("/partner/openapi.json").json() == schema
+    # 스키마는 한 번만, 이벤트 루프가 아닌 스레드에서 생성됨
+    assert on_loop == [False]
+
+
+def test_schema_variants_cached_until_base_changes():
+    realm = SwagGuardRealm("schema-cache")
+    realm.settings.set_role_rules("partner", allow=["/docs"], tags=["partner"])
+    views = get_schema_views(realm.settings)
+
+    base = {"openapi": "3.1.0", "paths": {"/a": {"get": {"tags": ["partner"]}}}}
+    variant = views.get(base, ["partner"])
+    assert views.get(base, ["partner"]) is variant
+
+    changed = {"openapi": "3.1.0", "paths": {"/b": {"get": {"tags": ["partner"]}}}}
+    other = views.get(changed, ["partner"])
+    assert other is not variant
+    # 같은 설정을 공유하는 두 앱의 원본 스키마가 번갈아 와도 서로의 변형을 폐기하지 않음
+    assert views.get(base, ["partner"]) is variant
+    assert views.lookup(changed, ["partner"]) is other
+
+    # 변형을 생성하는 동안 설정이 바뀌면 오래된 변형을 저장하지 않음
+    original = views.settings.get
+
+    def racing_get(key, default=None):
+        value = original(key, default)
+        if key == "role_rules":
+            realm.settings.set_role_rules("partner", allow=["/docs"], tags=["internal"])
+        return value
+
+    fresh = {"openapi": "3.1.0", "paths": {"/c": {"get": {"tags": ["partner"]}}}}
+    views.settings.get = racing_get
+    try:
+        views.get(fresh, ["partner"])
+    finally:
+        del views.settings.get
+    assert views._bases[id(fresh)][1] == {}
+
+
+def test_schema_warmup_and_single_flight():
+    app = FastAPI()
+    calls = []
+    original = app.openapi
+
+    def slow_openapi():
+        calls.append(1)
+        return original()
+
+    app.openapi = slow_openapi
+    cache = OpenAPISchemaCache(app)
+
+    async def scenario():
+        results = await asyncio.gather(*[cache.warm() for _ in range(5)])
+        assert all(result is results[0] for result in results)
+
+    asyncio.run(scenario())
+    assert len(calls) == 1
+    assert app.openapi() is cache.openapi()
+
+
+def test_schema_cache_invalidated_on_reset():
+    app = FastAPI()
+    cache = OpenAPISchemaCache(app)
+    assert cache.openapi()["paths"] == {}
+
+    @app.get("/added")
+    async def added():
+        return {}
+
+    assert cache.openapi()["paths"] == {}
+    cache.invalidate()
+    assert "/added" in cache.openapi()["paths"]
+
+    # FastAPI와 같이 app.openapi_schema를 초기화해도 다시 생성됨
+    @app.get("/later")
+    async def later():
+        return {}
+
+    app.openapi_schema = None
+    assert not cache.ready
+    assert "/later" in asyncio.run(cache.warm())["paths"]
+    assert app.openapi() is app.openapi_schema
+
+
+def test_schema_warmup_retries_after_failure(caplog):
+    app = FastAPI()
+    calls = []
+    original = app.openapi
+
+    def flaky_openapi():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("schema build failed")
+        return original()
+
+    app.openapi = flaky_openapi
+    cache = OpenAPISchemaCache(app)
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await cache.warm()
+        # 실패한 작업을 다시 기다리지 않고 새로 생성함
+        assert (await cache.warm())["openapi"]
+
+    asyncio.run(scenario())
+    assert len(calls) == 2 and cache.ready
+
+    # 시작 시 미리 생성이 실패하면 예외를 기록하고, 다음 요청에서 다시 생성함
+    realm = SwagGuardRealm("warm-retry", cookie_secure=False)
+    realm.create_user("ops", "opspass")
+    app = FastAPI()
+    app.add_middleware(SwagGuardMiddleware, realms=[realm], warm_schema=True)
+    original = app.openapi
+    failures = []
+
+    def failing_once():
+        if not failures:
+            failures.append(1)
+            raise RuntimeError("schema build failed")
+        return original()
+
+    app.openapi = failing_once
+    with caplog.at_level("ERROR", logger="swaguard"), TestClient(app) as client:
+        deadline = time.monotonic() + 5
+        while not caplog.records and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert "warmup failed" in caplog.records[0].getMessage()
+
+        client.cookies.set("swaguard_auth", realm.create_auth_cookie("ops")[0])
+        assert client.get("/openapi.json").status_code == 200
+
+
+def test_schema_snapshot_served(tmp_path):
+    realm = SwagGuardRealm("snapshot", cookie_secure=False)
+    realm.create_user("ops", "opspass")
+
+    source = create_app(SwagGuardRealm("source"))
+    snapshot_path = str(tmp_path / "openapi.snapshot.json")
+    write_schema_snapshot(source, snapshot_path)
+
+    app = FastAPI()
+    app.add_middleware(SwagGuardMiddleware, realms=[realm], warm_schema=True, schema_snapshot=snapshot_path)
+
+    with TestClient(app) as client:
+        client.cookies.set("swaguard_auth", realm.create_auth_cookie("ops")[0])
+        response = client.get("/openapi.json")
+        assert response.status_code == 200
+        assert "/partner/orders" in response.json()["paths"]
+        assert client.get("/openapi.json", headers={"If-None-Match": response.headers["etag"]}).status_code == 304
@@ -0,0 +1,118 @@
+import multiprocessing
+import time
+
+import pytest
+
+from swaguard import SwagGuardRealm
+from swaguard.core.auth import _parse_verified_cookie
+from swaguard.core.shm import SLOT, SessionCache, SharedMemoryTier, get_session_cache, session_fingerprint
+from swaguard.exceptions.AuthExceptions import ConfigurationError
+
+pytest.importorskip("fcntl")
+
+
+def _child_incr(path, start, times):
+    tier = SharedMemoryTier(path, slots=64, counters=4)
+    start.wait()
+    for _ in range(times):
+        tier.incr("logins")
+
+
+def test_session_table_expiry_and_torn_slots(tmp_path):
+    tier = SharedMemoryTier(str(tmp_path / "shm"), slots=64)
+    fingerprint = session_fingerprint("secret", "cookie-1")
+    now = time.time()
+
+    assert tier.contains(fingerprint, now) is False
+    tier.add(fingerprint, now + 60, now)
+    assert tier.contains(fingerprint, now) is True
+    assert tier.contains(fingerprint, now + 61) is False
+    assert tier.contains(session_fingerprint("other-secret", "cookie-1"), now) is False
+
+    # 찢어진 슬롯은 미스로 처리되고 다시 기록할 수 있음
+    index = int.from_bytes(fingerprint[:8], "little") % tier.slots
+    offset = 64 + index * SLOT.size
+    tier._map[offset + 20:offset + 24] = b"\xff\xff\xff\xff"
+    assert tier.contains(fingerprint, now) is False
+    assert tier.stats()["torn"] == 1
+    tier.add(fingerprint, now + 60, now)
+    assert tier.contains(fingerprint, now) is True
+
+
+def test_counters_are_atomic_across_workers(tmp_path):
+    path = str(tmp_path / "shm")
+    parent = SharedMemoryTier(path, slots=64, counters=4)
+    context = multiprocessing.get_context("fork")
+
+    # 여러 워커가 동시에 증가시켜도 증가분이 유실되지 않음
+    start = context.Event()
+    processes = [context.Process(target=_child_incr, args=(path, start, 1000)) for _ in range(4)]
+    for process in processes:
+        process.start()
+    start.set()
+    for process in processes:
+        process.join()
+
+    assert parent.count("logins") == 4000
+    assert parent.incr("logins", 10) == 4010
+    assert parent.count("other") == 0
+
+    for name in ("a", "b", "c"):
+        parent.incr(name)
+    with pytest.raises(ConfigurationError):
+        parent.incr("d")
+
+
+def test_session_cache_shares_verified_cookies_across_workers(tmp_path):
+    realm = SwagGuardRealm("shm", session_cache_size=16, shared_cache_enabled=True,
+                           shared_cache_path=str(tmp_path / "shm"), shared_cache_slots=256)
+    realm.create_user("admin", "adminpass")
+    cookie, _ = realm.create_auth_cookie("admin")
+
+    assert realm.verify_auth_cookie(cookie) == "admin"
+    assert realm.verify_auth_cookie(cookie) == "admin"
+    assert get_session_cache(realm.settings).stats()["hits"] == 1
+
+    # 다른 워커: 같은 파일을 매핑한 별도의 계층과 빈 프로세스별 캐시
+    other = SessionCache(shared=SharedMemoryTier(str(tmp_path / "shm"), slots=256))
+    claims = other.get(realm.secret_key, cookie, _parse_verified_cookie)
+    assert claims["sub"] == "admin"
+    assert other.stats()["shared_hits"] == 1
+
+    # 위조된 쿠키는 공유 계층에서도 적중하지 않음
+    assert other.get(realm.secret_key, cookie + "x", _parse_verified_cookie) is None
+    assert realm.verify_auth_cookie(cookie[:-2] + "00") is None
+
+
+def test_session_cache_follows_settings_and_key_rotation(tmp_path):
+    pytest.importorskip("cryptography")
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ed25519
+
+    paths = []
+    for index in range(2):
+        path = tmp_path / f"key{index}.pem"
+        path.write_bytes(ed25519.Ed25519PrivateKey.generate().private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        ))
+        paths.append(str(path))
+
+    # 기본값은 캐시 사용 안 함
+    assert get_session_cache(SwagGuardRealm("default").settings) is None
+
+    realm = SwagGuardRealm("rotate", token_format="jwt", jwt_algorithm="EdDSA", jwt_private_key_path=paths[0],
+                           shared_cache_enabled=True, shared_cache_path=str(tmp_path / "shm"), shared_cache_slots=256)
+    old_cookie, _ = realm.create_auth_cookie("admin")
+    assert realm.verify_auth_cookie(old_cookie) == "admin"
+    cache = get_session_cache(realm.settings)
+
+    # 서명 키 교체: 이전 키로 서명된 쿠키는 캐시(공유 계층 포함)에 있어도 거부
+    realm.settings.set("jwt_private_key_path", paths[1])
+    assert get_session_cache(realm.settings) is not cache
+    assert realm.verify_auth_cookie(old_cookie) is None
+    new_cookie, _ = realm.create_auth_cookie("admin")
+    assert realm.verify_auth_cookie(new_cookie) == "admin"
+
+    # 설정 변경이 반영됨
+    realm.settings.set("shared_cache_enabled", False)
+    assert get_session_cache(realm.settings) is None
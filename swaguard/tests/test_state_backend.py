@@ -0,0 +1,201 @@
+import asyncio
+import time
+
+import pytest
+
+from swaguard.backends.base import StateBackend
+from swaguard.backends.memory import MemoryBackend
+from swaguard.backends.redis_backend import HMAX_SCRIPT, RedisBackend, read_reply
+from swaguard.exceptions.AuthExceptions import StateBackendError
+
+
+class FakeRedisServer:
+    """테스트용 in-process Redis 프로토콜 서버 (필요한 명령만 지원)"""
+
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+        self.connections = 0
+        self.transactions = 0
+        self.server = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return f"redis://127.0.0.1:{port}/1"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    def _alive(self, key):
+        expires_at = self.expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+    @staticmethod
+    def _encode(value):
+        if value is None:
+            return b"$-1\r\n"
+        if isinstance(value, int):
+            return b":%d\r\n" % value
+        if isinstance(value, list):
+            return b"*%d\r\n" % len(value) + b"".join(FakeRedisServer._encode(item) for item in value)
+        if isinstance(value, str):
+            return b"+" + value.encode() + b"\r\n"
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def _run(self, name, args):
+        if name in ("SELECT", "AUTH"):
+            return "OK"
+        if name == "GET":
+            return self.data.get(args[0]) if self._alive(args[0]) else None
+        if name == "MGET":
+            return [self.data.get(key) if self._alive(key) else None for key in args]
+        if name == "SET":
+            options = [arg.upper() for arg in args[2:]]
+            if b"NX" in options:
+                if self._alive(args[0]):
+                    return None
+                options.remove(b"NX")
+            self.data[args[0]] = args[1]
+            self.expires.pop(args[0], None)
+            if len(options) == 2 and options[0] == b"PX":
+                self.expires[args[0]] = time.monotonic() + int(options[1]) / 1000
+            return "OK"
+        if name == "MSET":
+            for index in range(0, len(args), 2):
+                self.data[args[index]] = args[index + 1]
+            return "OK"
+        if name == "DEL":
+            return sum(1 for key in args if self._alive(key) and self.data.pop(key, None) is not None)
+        if name == "INCRBY":
+            value = int(self.data.get(args[0], b"0") if self._alive(args[0]) else 0) + int(args[1])
+            self.data[args[0]] = str(value).encode()
+            return value
+        if name == "PTTL":
+            if not self._alive(args[0]):
+                return -2
+            expires_at = self.expires.get(args[0])
+            return -1 if expires_at is None else int((expires_at - time.monotonic()) * 1000)
+        if name == "HSET":
+            table = self.data.setdefault(args[0], {})
+            for index in range(1, len(args), 2):
+                table[args[index]] = args[index + 1]
+            return len(args) // 2
+        if name == "HGETALL":
+            table = self.data.get(args[0], {})
+            return [part for item in table.items() for part in item]
+        if name == "HINCRBY":
+            table = self.data.setdefault(args[0], {})
+            value = int(table.get(args[1], b"0")) + int(args[2])
+            table[args[1]] = str(value).encode()
+            return value
+        if name == "EVAL" and args[0].decode() == HMAX_SCRIPT:
+            table = self.data.setdefault(args[2], {})
+            value = max(int(table.get(args[3], b"0")), int(args[4]))
+            table[args[3]] = str(value).encode()
+            return value
+        return None
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        queued = None
+        try:
+            while True:
+                command = await read_reply(reader)
+                name = command[0].decode().upper()
+                # MULTI 이후 명령은 EXEC까지 모았다가 다른 연결의 명령 없이 한 번에 실행
+                if name == "MULTI":
+                    queued, reply = [], "OK"
+                elif name == "EXEC":
+                    self.transactions += 1
+                    reply = [self._run(item[0].decode().upper(), item[1:]) for item in queued]
+                    queued = None
+                elif queued is not None:
+                    queued.append(command)
+                    reply = "QUEUED"
+                else:
+                    reply = self._run(name, command[1:])
+                writer.write(self._encode(reply))
+                await writer.drain()
+        except (StateBackendError, asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+
+async def _exercise(backend):
+    await backend.set("a", "1")
+    await backend.set_many({"b": b"2", "c": 3})
+    assert await backend.get("a") == b"1"
+    assert await backend.get_many(["a", "b", "c", "missing"]) == [b"1", b"2", b"3", None]
+
+    assert await backend.incr("counter", 5, ttl=60) == 5
+    assert await backend.incr("counter", ttl=60) == 6
+
+    # 만료 시간은 처음 생성될 때만 설정되고 이후 증가로 연장되지 않음 (고정 윈도)
+    assert await backend.incr("window", ttl=0.15) == 1
+    await asyncio.sleep(0.1)
+    assert await backend.incr("window", ttl=0.15) == 2
+    await asyncio.sleep(0.1)
+    assert await backend.incr("window", ttl=0.15) == 1
+
+    await backend.set("short", "x", ttl=0.05)
+    await asyncio.sleep(0.1)
+    assert await backend.get("short") is None
+
+    await backend.hset_many("generations", {"alice": 1})
+    assert await backend.hincr("generations", "alice") == 2
+    assert await backend.hget_all("generations") == {"alice": b"2"}
+    assert await backend.hmax("generations", "alice", 1) == 2
+    assert await backend.hmax("generations", "alice", 4) == 4
+    assert await backend.hmax("generations", "bob", 3) == 3
+    assert await backend.hget_all("generations") == {"alice": b"4", "bob": b"3"}
+
+    assert await backend.delete("a", "missing") == 1
+    assert await backend.get("a") is None
+
+
+def test_incomplete_backend_fails_on_instantiation():
+    class GetOnly(StateBackend):
+        async def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnly()
+
+
+def test_memory_backend():
+    asyncio.run(_exercise(MemoryBackend()))
+
+
+def test_redis_backend_against_fake_server():
+    async def scenario():
+        server = FakeRedisServer()
+        backend = RedisBackend(await server.start(), max_connections=2)
+        try:
+            await _exercise(backend)
+            # 만료 시간이 있는 증가는 MULTI/EXEC 트랜잭션으로 실행됨
+            assert server.transactions == 5
+            # 동시 요청도 연결 풀 크기를 넘지 않아야 함
+            await asyncio.gather(*[backend.incr("parallel") for _ in range(20)])
+            assert await backend.get("parallel") == b"20"
+            assert server.connections <= 2
+        finally:
+            await backend.close()
+            await server.stop()
+
+    asyncio.run(scenario())
+
+
+def test_redis_backend_unavailable():
+    async def scenario():
+        server = FakeRedisServer()
+        url = await server.start()
+        await server.stop()
+        backend = RedisBackend(url, timeout=0.5)
+        with pytest.raises(StateBackendError):
+            await backend.get("a")
+
+    asyncio.run(scenario())
@@ -0,0 +1,50 @@
+import time
+
+import pytest
+
+from swaguard.config import SwagGuardSettings
+from swaguard.core.tokens import issue_service_token, revoke_service_token, verify_service_token
+from swaguard.exceptions.AuthExceptions import ConfigurationError
+
+
+@pytest.fixture
+def settings():
+    return SwagGuardSettings()
+
+
+def test_service_token_scope(settings):
+    token = issue_service_token("codegen", ["/openapi.json"], settings=settings)
+
+    # 설정에는 평문 토큰이 아닌 다이제스트만 저장되어야 함
+    (record,) = settings.get_service_tokens().values()
+    assert token not in str(record)
+
+    assert verify_service_token(token, "/openapi.json", settings=settings) == "codegen"
+    assert verify_service_token(token, "/docs", settings=settings) is None
+    assert verify_service_token(token + "x", "/openapi.json", settings=settings) is None
+    assert verify_service_token("swg_unknown_secret", "/openapi.json", settings=settings) is None
+
+    with pytest.raises(ConfigurationError):
+        issue_service_token("codegen", ["/api/items"], settings=settings)
+
+
+def test_service_token_revoke_and_last_used(settings):
+    token = issue_service_token("poller", settings=settings)
+    (record,) = settings.get_service_tokens().values()
+    assert record["last_used"] is None
+
+    assert verify_service_token(token, "/docs", settings=settings) == "poller"
+    first_seen = record["last_used"]
+    assert first_seen is not None
+
+    # 기록 간격이 지나지 않았으면 last_used를 다시 쓰지 않음
+    record["last_used"] = first_seen - 10
+    verify_service_token(token, "/docs", settings=settings)
+    assert record["last_used"] == first_seen - 10
+
+    record["last_used"] = int(time.time()) - 3600
+    verify_service_token(token, "/docs", settings=settings)
+    assert record["last_used"] >= first_seen
+
+    revoke_service_token(token, settings=settings)
+    assert verify_service_token(token, "/docs", settings=settings) is None
@@ -0,0 +1,62 @@
+from http.cookies import _unquote  # type: ignore[attr-defined]
+from typing import Iterable, Optional, Tuple
+
+
+_SEMICOLON = 0x3B
+_WHITESPACE = (0x20, 0x09)
+
+
+def _decode_cookie_value(raw: bytes) -> str:
+    """쿠키 값의 큰따옴표와 이스케이프를 해제합니다. (http.cookies와 동일한 규칙)"""
+    if len(raw) >= 2 and raw[0] == 0x22 and raw[-1] == 0x22:
+        if b"\\" in raw:
+            return _unquote(raw.decode("latin-1"))
+        raw = raw[1:-1]
+    return raw.decode("latin-1")
+
+
+def extract_cookie(headers: Iterable[Tuple[bytes, bytes]], name: bytes) -> Optional[str]:
+    """
+    ASGI 원본 헤더에서 지정한 이름의 쿠키 값만 찾아 반환합니다.
+
+    Cookie 헤더 전체를 디코딩하거나 분리하지 않고 바이트 단위로 쿠키 이름만 탐색하므로
+    다른 앱의 쿠키가 많이 붙은 큰 헤더에서도 비용이 거의 들지 않습니다.
+
+    - 여러 개의 Cookie 헤더를 순서대로 확인합니다.
+    - 이름은 헤더의 시작 또는 `;` 뒤(공백 허용)에 있을 때만 일치로 봅니다.
+      (`xswaguard_auth=`나 다른 쿠키 값 안의 `swaguard_auth=`는 무시)
+    - 값 앞뒤의 공백과 큰따옴표(DQUOTE)를 제거합니다.
+    - 같은 이름이 여러 번 있으면 처음 나온 값을 사용합니다. (RFC 6265에 따라
+      브라우저는 경로가 더 구체적인 쿠키를 먼저 보냅니다)
+
+    Args:
+        headers: ASGI scope["headers"] (소문자 이름, 바이트 값의 튜플 목록)
+        name: 찾을 쿠키 이름 (바이트)
+
+    Returns:
+        쿠키 값 문자열, 없으면 None
+    """
+    needle = name + b"="
+    for header_name, value in headers:
+        if header_name != b"cookie":
+            continue
+
+        start = 0
+        while True:
+            index = value.find(needle, start)
+            if index < 0:
+                break
+
+            # 이름 앞이 헤더 시작이거나 ';'(사이 공백 허용)인지 확인
+            before = index - 1
+            while before >= 0 and value[before] in _WHITESPACE:
+                before -= 1
+            if before < 0 or value[before] == _SEMICOLON:
+                begin = index + len(needle)
+                end = value.find(b";", begin)
+                if end < 0:
+                    end = len(value)
+                return _decode_cookie_value(value[begin:end].strip())
+
+            start = index + 1
+    return None
@@ -1,9 +1,11 @@
 import os
 import secrets
+import sys
 from typing import Dict, List, Any, Optional
 
 from ..config import config
 from ..core.security import hash_password
+from ..core.tokens import issue_service_token, revoke_service_token
 
 
 def generate_random_key(length: int = 32) -> str:
@@ -19,21 +21,50 @@ def generate_random_key(length: int = 32) -> str:
     return secrets.token_urlsafe(length)
 
 
-def create_user(username: str, password: str) -> None:
+def create_user(username: str, password: str, roles: Optional[List[str]] = None) -> None:
     """
     새 사용자를 생성하고 설정에 추가합니다.
     
     Args:
         username: 사용자 이름
         password: 비밀번호
+        roles: 사용자 역할 목록 (예: ["partner"])
     """
     # 비밀번호 해시
     password_hash = hash_password(password)
     
+    # 역할 설정
+    if roles is not None:
+        config.set_user_roles(username, roles)
+    
     # 사용자 추가
     config.add_user(username, password_hash)
 
 
+def create_service_token(name: str, paths: Optional[List[str]] = None) -> str:
+    """
+    내부 서비스용 API 토큰을 발급합니다.
+    
+    Args:
+        name: 토큰을 사용하는 서비스 이름
+        paths: 접근을 허용할 보호 경로 목록 (기본값: 전체 보호 경로)
+        
+    Returns:
+        발급된 토큰 문자열 (설정에는 다이제스트만 저장되므로 안전하게 보관해야 합니다)
+    """
+    return issue_service_token(name, paths)
+
+
+def delete_service_token(token_or_prefix: str) -> None:
+    """
+    서비스 토큰을 폐기합니다.
+    
+    Args:
+        token_or_prefix: 토큰 문자열 또는 공개 접두사
+    """
+    revoke_service_token(token_or_prefix)
+
+
 def load_users_from_env() -> None:
     """
     환경 변수에서 사용자 정보를 로드합니다.
@@ -62,6 +93,9 @@ def setup_initial_users() -> None:
     """
     초기 사용자 설정을 수행합니다.
     환경 변수, 설정 파일 또는 기본값에서 사용자를 로드합니다.
+
+    패키지를 import할 때가 아니라 기본 realm을 처음 사용할 때 호출되며,
+    기본 사용자 안내는 표준 출력을 쓰는 명령행 도구와 섞이지 않도록 표준 에러로 출력합니다.
     """
     # 환경 변수에서 사용자 로드
     load_users_from_env()
@@ -71,11 +105,11 @@ def setup_initial_users() -> None:
     # 사용자가 없으면 기본 사용자 설정
     users = config.get_users()
     if not users:
-        print("Warning: No users found. Creating default 'admin' user with a random password.")
+        print("Warning: No users found. Creating default 'admin' user with a random password.", file=sys.stderr)
         admin_password = generate_random_key(16)
         create_user("admin", admin_password)
-        print(f"Default credentials: admin / {admin_password}")
-        print("Please change this password as soon as possible.")
+        print(f"Default credentials: admin / {admin_password}", file=sys.stderr)
+        print("Please change this password as soon as possible.", file=sys.stderr)
 
 
 def get_protected_paths() -> List[str]:
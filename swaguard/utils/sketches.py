@@ -0,0 +1,135 @@
+import math
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+class HeavyHitters:
+    """
+    고정된 메모리로 가장 자주 등장하는 항목을 추적하는 Misra-Gries 요약
+
+    서로 다른 항목 수가 capacity 이하이면 정확한 개수를 유지합니다.
+    그보다 많으면 각 개수는 실제 값보다 작을 수 있으며, 오차는 전체 개수 / (capacity + 1) 이하입니다.
+    여러 요약을 merge()로 합칠 수 있어 파일별로 나누어 집계한 결과를 합산할 수 있습니다.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        """
+        Args:
+            capacity: 추적할 최대 항목 수
+        """
+        self.capacity = capacity
+        self.counts: Dict[Hashable, int] = {}
+        self.total = 0
+
+    def add(self, item: Hashable, count: int = 1) -> None:
+        self.total += count
+        counts = self.counts
+        if item in counts:
+            counts[item] += count
+            return
+        if len(counts) < self.capacity:
+            counts[item] = count
+            return
+        # 가득 차면 모든 개수를 줄여 자리를 만듭니다 (항목당 분할 상환 O(1)).
+        decrement = min(count, min(counts.values()))
+        for key in list(counts):
+            counts[key] -= decrement
+            if counts[key] <= 0:
+                del counts[key]
+        if count > decrement:
+            counts[item] = count - decrement
+
+    def merge(self, other: "HeavyHitters") -> None:
+        """다른 요약을 이 요약에 합칩니다."""
+        self.total += other.total
+        for item, count in other.counts.items():
+            self.counts[item] = self.counts.get(item, 0) + count
+        if len(self.counts) > self.capacity:
+            # capacity+1번째로 큰 개수만큼 모두 줄이면 Misra-Gries 오차 한계가 유지됩니다.
+            threshold = sorted(self.counts.values(), reverse=True)[self.capacity]
+            self.counts = {item: count - threshold for item, count in self.counts.items() if count > threshold}
+
+    def top(self, n: int = 10) -> List[Tuple[Hashable, int]]:
+        """개수가 많은 순서로 상위 n개 항목을 반환합니다."""
+        return sorted(self.counts.items(), key=lambda entry: entry[1], reverse=True)[:n]
+
+
+class LatencySketch:
+    """
+    로그 간격 버킷으로 분위수를 추정하는 스케치 (DDSketch 방식)
+
+    값 v는 ceil(log_gamma(v)) 버킷에 기록되며, 추정한 분위수의 상대 오차는 relative_accuracy 이하입니다.
+    버킷 수는 값의 범위에만 비례하므로(1µs~1000초 범위에서 1% 정확도 기준 약 1,500개)
+    기록한 값의 수와 관계없이 메모리가 일정합니다.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-3):
+        """
+        Args:
+            relative_accuracy: 분위수 추정의 상대 오차
+            min_value: 이 값 이하는 0 버킷에 기록
+        """
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.max: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        if self.max is None or value > self.max:
+            self.max = value
+        if value <= self.min_value:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def merge(self, other: "LatencySketch") -> None:
+        """같은 정확도로 만든 다른 스케치를 이 스케치에 합칩니다."""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        분위수를 추정합니다.
+
+        Args:
+            q: 0과 1 사이의 분위 (예: 0.99)
+
+        Returns:
+            추정값 (기록된 값이 없으면 None)
+        """
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                return min(2 * self.gamma ** index / (self.gamma + 1), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        """개수, 평균, 최댓값과 주요 분위수를 반환합니다."""
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }